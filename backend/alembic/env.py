@@ -0,0 +1,85 @@
+"""
+Alembic environment
+Migrations run against app.database's engine (DATABASE_URL, SQLite fallback)
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.database import Base, DATABASE_URL
+from app.models import enhanced_models  # noqa: F401  (registers the tables on Base)
+from app.services.geo_index import GEO_TABLES
+from app.services.search_index import DOCTOR_FTS_TABLE, DOCTOR_SEARCH_VECTOR
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Full-text and spatial indexes come from raw DDL in the migrations, not the
+# models (SQLite: FTS5/R*Tree tables, their shadow and key tables; PostgreSQL:
+# the generated tsvector column and the GIN/GiST indexes); autogenerate must
+# not offer to drop them
+UNMANAGED_TABLE_PREFIXES = (DOCTOR_FTS_TABLE, *(f"{table}_geo" for table in GEO_TABLES))
+UNMANAGED_INDEXES = {"idx_doctors_search_vector", *(f"idx_{table}_geog" for table in GEO_TABLES)}
+UNMANAGED_COLUMNS = {("doctors", DOCTOR_SEARCH_VECTOR)}
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    if type_ == "table":
+        return not name.startswith(UNMANAGED_TABLE_PREFIXES)
+    if type_ == "index":
+        return name not in UNMANAGED_INDEXES
+    if type_ == "column":
+        return (obj.table.name, name) not in UNMANAGED_COLUMNS
+    return True
+
+
+def _url() -> str:
+    return config.get_main_option("sqlalchemy.url") or DATABASE_URL
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout instead of running it (alembic upgrade --sql)"""
+    context.configure(
+        url=_url(),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=_url().startswith("sqlite"),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+
+    engine = create_engine(_url(), poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        _run(connection)
+    engine.dispose()
+
+
+def _run(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # SQLite cannot ALTER most things; batch mode rebuilds the table
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,313 @@
+"""Baseline schema (tables previously created by Base.metadata.create_all)
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 03:29:26.422509
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Same types the models pick per backend (app/models/enhanced_models.py)
+GUID = sa.String(length=36).with_variant(postgresql.UUID(as_uuid=False), "postgresql")
+JSONB = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=True),
+    sa.Column('firebase_uid', sa.String(length=128), nullable=True),
+    sa.Column('verified', sa.Boolean(), nullable=True),
+    sa.Column('verification_status', sa.Enum('PENDING', 'VERIFIED', 'REJECTED', 'IN_PROGRESS', name='verificationstatus'), nullable=True),
+    sa.Column('verification_provider', sa.String(length=50), nullable=True),
+    sa.Column('verification_data', JSONB, nullable=True),
+    sa.Column('id_number', sa.String(length=20), nullable=True),
+    sa.Column('id_document_url', sa.String(length=500), nullable=True),
+    sa.Column('profile_picture_url', sa.String(length=500), nullable=True),
+    sa.Column('date_of_birth', sa.DateTime(), nullable=True),
+    sa.Column('gender', sa.String(length=20), nullable=True),
+    sa.Column('preferred_language', sa.String(length=10), nullable=True),
+    sa.Column('city', sa.String(length=100), nullable=True),
+    sa.Column('province', sa.String(length=50), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('role', sa.Enum('PATIENT', 'DOCTOR', 'ADMIN', name='userrole'), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('last_login', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+        batch_op.create_index(batch_op.f('ix_users_firebase_uid'), ['firebase_uid'], unique=True)
+        batch_op.create_index(batch_op.f('ix_users_phone'), ['phone'], unique=True)
+        batch_op.create_index(batch_op.f('ix_users_role'), ['role'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_verified'), ['verified'], unique=False)
+
+    op.create_table('doctors',
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('user_id', GUID, nullable=False),
+    sa.Column('display_name', sa.String(length=255), nullable=False),
+    sa.Column('specialization', sa.String(length=100), nullable=False),
+    sa.Column('title', sa.String(length=50), nullable=True),
+    sa.Column('bio', sa.Text(), nullable=True),
+    sa.Column('hpcsa_number', sa.String(length=20), nullable=True),
+    sa.Column('hpcsa_verified', sa.Boolean(), nullable=True),
+    sa.Column('hpcsa_verification_data', JSONB, nullable=True),
+    sa.Column('license_document_url', sa.String(length=500), nullable=True),
+    sa.Column('id_document_url', sa.String(length=500), nullable=True),
+    sa.Column('verification_status', sa.Enum('PENDING', 'VERIFIED', 'REJECTED', 'IN_PROGRESS', name='verificationstatus'), nullable=True),
+    sa.Column('verified_at', sa.DateTime(), nullable=True),
+    sa.Column('verified_by', GUID, nullable=True),
+    sa.Column('practice_name', sa.String(length=255), nullable=True),
+    sa.Column('practice_number', sa.String(length=50), nullable=True),
+    sa.Column('practice_address', sa.Text(), nullable=True),
+    sa.Column('practice_city', sa.String(length=100), nullable=True),
+    sa.Column('practice_province', sa.String(length=50), nullable=True),
+    sa.Column('practice_postal_code', sa.String(length=10), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('website', sa.String(length=500), nullable=True),
+    sa.Column('accepts_medical_aid', sa.Boolean(), nullable=True),
+    sa.Column('telehealth_available', sa.Boolean(), nullable=True),
+    sa.Column('languages_spoken', JSONB, nullable=True),
+    sa.Column('gender', sa.String(length=20), nullable=True),
+    sa.Column('subscription_plan', sa.Enum('FREE', 'BASIC', 'PREMIUM', name='subscriptionplan'), nullable=True),
+    sa.Column('subscription_start_date', sa.DateTime(), nullable=True),
+    sa.Column('subscription_end_date', sa.DateTime(), nullable=True),
+    sa.Column('rating_avg', sa.Float(), nullable=True),
+    sa.Column('total_reviews', sa.Integer(), nullable=True),
+    sa.Column('profile_picture_url', sa.String(length=500), nullable=True),
+    sa.Column('gallery_images', JSONB, nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['verified_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    with op.batch_alter_table('doctors', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_doctors_accepts_medical_aid'), ['accepts_medical_aid'], unique=False)
+        batch_op.create_index(batch_op.f('ix_doctors_display_name'), ['display_name'], unique=False)
+        batch_op.create_index(batch_op.f('ix_doctors_gender'), ['gender'], unique=False)
+        batch_op.create_index(batch_op.f('ix_doctors_hpcsa_number'), ['hpcsa_number'], unique=True)
+        batch_op.create_index(batch_op.f('ix_doctors_practice_city'), ['practice_city'], unique=False)
+        batch_op.create_index(batch_op.f('ix_doctors_practice_province'), ['practice_province'], unique=False)
+        batch_op.create_index(batch_op.f('ix_doctors_rating_avg'), ['rating_avg'], unique=False)
+        batch_op.create_index(batch_op.f('ix_doctors_specialization'), ['specialization'], unique=False)
+        batch_op.create_index(batch_op.f('ix_doctors_subscription_plan'), ['subscription_plan'], unique=False)
+        batch_op.create_index(batch_op.f('ix_doctors_telehealth_available'), ['telehealth_available'], unique=False)
+        batch_op.create_index(batch_op.f('ix_doctors_verification_status'), ['verification_status'], unique=False)
+
+    op.create_table('user_verifications',
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('user_id', GUID, nullable=False),
+    sa.Column('provider', sa.String(length=50), nullable=True),
+    sa.Column('provider_response', JSONB, nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'VERIFIED', 'REJECTED', 'IN_PROGRESS', name='verificationstatus'), nullable=True),
+    sa.Column('verified_at', sa.DateTime(), nullable=True),
+    sa.Column('id_document_url', sa.String(length=500), nullable=True),
+    sa.Column('selfie_url', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_table('appointments',
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('patient_id', GUID, nullable=False),
+    sa.Column('doctor_id', GUID, nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=True),
+    sa.Column('duration_minutes', sa.Integer(), nullable=True),
+    sa.Column('status', sa.Enum('BOOKED', 'CONFIRMED', 'COMPLETED', 'CANCELLED', 'NO_SHOW', name='appointmentstatus'), nullable=True),
+    sa.Column('booking_reference', sa.String(length=50), nullable=True),
+    sa.Column('is_telehealth', sa.Boolean(), nullable=True),
+    sa.Column('telehealth_link', sa.String(length=500), nullable=True),
+    sa.Column('checkin_otp', sa.String(length=10), nullable=True),
+    sa.Column('checkin_qr_code', sa.Text(), nullable=True),
+    sa.Column('checked_in', sa.Boolean(), nullable=True),
+    sa.Column('checked_in_at', sa.DateTime(), nullable=True),
+    sa.Column('patient_notes', sa.Text(), nullable=True),
+    sa.Column('doctor_notes', sa.Text(), nullable=True),
+    sa.Column('google_calendar_event_id', sa.String(length=255), nullable=True),
+    sa.Column('calendar_synced', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['doctor_id'], ['doctors.id'], ),
+    sa.ForeignKeyConstraint(['patient_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_appointments_booking_reference'), ['booking_reference'], unique=True)
+        batch_op.create_index(batch_op.f('ix_appointments_doctor_id'), ['doctor_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_appointments_patient_id'), ['patient_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_appointments_start_time'), ['start_time'], unique=False)
+        batch_op.create_index(batch_op.f('ix_appointments_status'), ['status'], unique=False)
+
+    op.create_table('doctor_analytics',
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('doctor_id', GUID, nullable=False),
+    sa.Column('period_start', sa.DateTime(), nullable=False),
+    sa.Column('period_end', sa.DateTime(), nullable=False),
+    sa.Column('period_type', sa.String(length=20), nullable=True),
+    sa.Column('profile_views', sa.Integer(), nullable=True),
+    sa.Column('booking_requests', sa.Integer(), nullable=True),
+    sa.Column('completed_appointments', sa.Integer(), nullable=True),
+    sa.Column('cancelled_appointments', sa.Integer(), nullable=True),
+    sa.Column('new_reviews', sa.Integer(), nullable=True),
+    sa.Column('average_rating', sa.Float(), nullable=True),
+    sa.Column('total_revenue', sa.Float(), nullable=True),
+    sa.Column('patient_age_groups', JSONB, nullable=True),
+    sa.Column('patient_gender_distribution', JSONB, nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['doctor_id'], ['doctors.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('doctor_analytics', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_doctor_analytics_doctor_id'), ['doctor_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_doctor_analytics_period_start'), ['period_start'], unique=False)
+
+    op.create_table('doctor_availability',
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('doctor_id', GUID, nullable=False),
+    sa.Column('day_of_week', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.String(length=10), nullable=False),
+    sa.Column('end_time', sa.String(length=10), nullable=False),
+    sa.Column('is_recurring', sa.Boolean(), nullable=True),
+    sa.Column('specific_date', sa.DateTime(), nullable=True),
+    sa.Column('is_available', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['doctor_id'], ['doctors.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('doctor_availability', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_doctor_availability_doctor_id'), ['doctor_id'], unique=False)
+
+    op.create_table('subscriptions',
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('doctor_id', GUID, nullable=False),
+    sa.Column('plan', sa.Enum('FREE', 'BASIC', 'PREMIUM', name='subscriptionplan'), nullable=False),
+    sa.Column('billing_cycle', sa.String(length=20), nullable=True),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=True),
+    sa.Column('payment_provider', sa.String(length=20), nullable=True),
+    sa.Column('provider_subscription_id', sa.String(length=255), nullable=True),
+    sa.Column('provider_customer_id', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('start_date', sa.DateTime(), nullable=False),
+    sa.Column('end_date', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['doctor_id'], ['doctors.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('subscriptions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_subscriptions_doctor_id'), ['doctor_id'], unique=False)
+
+    op.create_table('reviews',
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('patient_id', GUID, nullable=False),
+    sa.Column('doctor_id', GUID, nullable=False),
+    sa.Column('appointment_id', GUID, nullable=False),
+    sa.Column('overall_rating', sa.Integer(), nullable=False),
+    sa.Column('communication_rating', sa.Integer(), nullable=True),
+    sa.Column('wait_time_rating', sa.Integer(), nullable=True),
+    sa.Column('diagnosis_accuracy_rating', sa.Integer(), nullable=True),
+    sa.Column('professionalism_rating', sa.Integer(), nullable=True),
+    sa.Column('comment', sa.Text(), nullable=True),
+    sa.Column('verified_visit', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('ai_moderated', sa.Boolean(), nullable=True),
+    sa.Column('ai_sentiment', sa.String(length=20), nullable=True),
+    sa.Column('ai_categories', JSONB, nullable=True),
+    sa.Column('is_flagged', sa.Boolean(), nullable=True),
+    sa.Column('flag_reason', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['appointment_id'], ['appointments.id'], ),
+    sa.ForeignKeyConstraint(['doctor_id'], ['doctors.id'], ),
+    sa.ForeignKeyConstraint(['patient_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_reviews_appointment_id'), ['appointment_id'], unique=True)
+        batch_op.create_index(batch_op.f('ix_reviews_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_reviews_doctor_id'), ['doctor_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_reviews_patient_id'), ['patient_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_reviews_verified_visit'), ['verified_visit'], unique=False)
+
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_reviews_verified_visit'))
+        batch_op.drop_index(batch_op.f('ix_reviews_patient_id'))
+        batch_op.drop_index(batch_op.f('ix_reviews_doctor_id'))
+        batch_op.drop_index(batch_op.f('ix_reviews_created_at'))
+        batch_op.drop_index(batch_op.f('ix_reviews_appointment_id'))
+
+    op.drop_table('reviews')
+    with op.batch_alter_table('subscriptions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_subscriptions_doctor_id'))
+
+    op.drop_table('subscriptions')
+    with op.batch_alter_table('doctor_availability', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_doctor_availability_doctor_id'))
+
+    op.drop_table('doctor_availability')
+    with op.batch_alter_table('doctor_analytics', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_doctor_analytics_period_start'))
+        batch_op.drop_index(batch_op.f('ix_doctor_analytics_doctor_id'))
+
+    op.drop_table('doctor_analytics')
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_appointments_status'))
+        batch_op.drop_index(batch_op.f('ix_appointments_start_time'))
+        batch_op.drop_index(batch_op.f('ix_appointments_patient_id'))
+        batch_op.drop_index(batch_op.f('ix_appointments_doctor_id'))
+        batch_op.drop_index(batch_op.f('ix_appointments_booking_reference'))
+
+    op.drop_table('appointments')
+    op.drop_table('user_verifications')
+    with op.batch_alter_table('doctors', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_doctors_verification_status'))
+        batch_op.drop_index(batch_op.f('ix_doctors_telehealth_available'))
+        batch_op.drop_index(batch_op.f('ix_doctors_subscription_plan'))
+        batch_op.drop_index(batch_op.f('ix_doctors_specialization'))
+        batch_op.drop_index(batch_op.f('ix_doctors_rating_avg'))
+        batch_op.drop_index(batch_op.f('ix_doctors_practice_province'))
+        batch_op.drop_index(batch_op.f('ix_doctors_practice_city'))
+        batch_op.drop_index(batch_op.f('ix_doctors_hpcsa_number'))
+        batch_op.drop_index(batch_op.f('ix_doctors_gender'))
+        batch_op.drop_index(batch_op.f('ix_doctors_display_name'))
+        batch_op.drop_index(batch_op.f('ix_doctors_accepts_medical_aid'))
+
+    op.drop_table('doctors')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_verified'))
+        batch_op.drop_index(batch_op.f('ix_users_role'))
+        batch_op.drop_index(batch_op.f('ix_users_phone'))
+        batch_op.drop_index(batch_op.f('ix_users_firebase_uid'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
+    # PostgreSQL keeps enum types after their tables are dropped
+    for enum_name in ("appointmentstatus", "subscriptionplan", "userrole", "verificationstatus"):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
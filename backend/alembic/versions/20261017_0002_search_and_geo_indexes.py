@@ -0,0 +1,55 @@
+"""Doctor full-text and spatial indexes (previously ensured at import time)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 04:02:11.118204
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.geo_index import GEO_TABLES, drop_geo_index_ddl, geo_index_ddl
+from app.services.search_index import doctor_search_index_ddl, drop_doctor_search_index_ddl
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def _has_postgis(bind) -> bool:
+    return bind.execute(sa.text("SELECT 1 FROM pg_extension WHERE extname = 'postgis'")).first() is not None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+
+    for statement in doctor_search_index_ddl(dialect):
+        op.execute(statement)
+
+    if dialect == "postgresql" and not _has_postgis(bind):
+        # Distance search falls back to haversine without the index
+        logger.warning("PostGIS not installed; skipping spatial indexes")
+        return
+    inspector = sa.inspect(bind)
+    for table_name in GEO_TABLES:
+        # hospitals is not in this metadata and may not exist
+        if inspector.has_table(table_name):
+            for statement in geo_index_ddl(dialect, table_name):
+                op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table_name in GEO_TABLES:
+        for statement in drop_geo_index_ddl(dialect, table_name):
+            op.execute(statement)
+    for statement in drop_doctor_search_index_ddl(dialect):
+        op.execute(statement)
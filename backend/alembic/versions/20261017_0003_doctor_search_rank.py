@@ -0,0 +1,48 @@
+"""Doctor search rank column and (verification_status, search_rank, id) index
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:12:40.531877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.enhanced_models import Doctor, doctor_search_rank_expression
+from app.services.geo_index import geo_index_ddl
+from app.services.search_index import doctor_search_index_ddl
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Databases stamped at 0001 after a create_all of the current models already have both
+    if 'search_rank' not in {column['name'] for column in inspector.get_columns('doctors')}:
+        with op.batch_alter_table('doctors', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('search_rank', sa.BigInteger(), server_default='0', nullable=False))
+
+    # Existing doctors; the ORM keeps it current from here on
+    op.execute(sa.update(Doctor.__table__).values(search_rank=doctor_search_rank_expression()))
+
+    if 'ix_doctors_verification_search_rank' not in {index['name'] for index in inspector.get_indexes('doctors')}:
+        with op.batch_alter_table('doctors', schema=None) as batch_op:
+            batch_op.create_index('ix_doctors_verification_search_rank', ['verification_status', 'search_rank', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('doctors', schema=None) as batch_op:
+        batch_op.drop_index('ix_doctors_verification_search_rank')
+        batch_op.drop_column('search_rank')
+
+    if op.get_bind().dialect.name == "sqlite":
+        # SQLite drops the column by rebuilding doctors, which also drops the
+        # triggers that keep the full-text and spatial indexes in sync
+        for statement in [*doctor_search_index_ddl("sqlite"), *geo_index_ddl("sqlite", "doctors")]:
+            op.execute(statement)
@@ -0,0 +1,42 @@
+"""SQLite search and spatial indexes keyed by their own INTEGER PRIMARY KEY instead of rowid
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 11:26:03.804512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.geo_index import GEO_TABLES, drop_geo_index_ddl, geo_index_ddl
+from app.services.search_index import doctor_search_index_ddl, drop_doctor_search_index_ddl
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rebuild_sqlite_indexes() -> None:
+    # Same trigger and table names as before, so dropping clears either layout
+    for statement in [*drop_doctor_search_index_ddl("sqlite"), *doctor_search_index_ddl("sqlite")]:
+        op.execute(statement)
+    inspector = sa.inspect(op.get_bind())
+    for table_name in GEO_TABLES:
+        if inspector.has_table(table_name):
+            for statement in [*drop_geo_index_ddl("sqlite", table_name), *geo_index_ddl("sqlite", table_name)]:
+                op.execute(statement)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        _rebuild_sqlite_indexes()
+
+
+def downgrade() -> None:
+    # The rowid-keyed layout could point at the wrong doctors after a VACUUM,
+    # so it is not restored; the search code only reads the keyed layouts
+    pass
@@ -0,0 +1,80 @@
+"""Doctor rating aggregates table, backfilled from the existing reviews
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 14:02:51.318460
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.models.enhanced_models import DoctorRatingAggregate, Review
+from app.services.rating_aggregate_service import RatingAggregateService
+
+# Same types the models pick per backend (app/models/enhanced_models.py)
+GUID = sa.String(length=36).with_variant(postgresql.UUID(as_uuid=False), "postgresql")
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _backfill() -> None:
+    # Doctors reviewed before aggregates existed (or since, without a row yet)
+    db = Session(bind=op.get_bind())
+    doctor_ids = db.scalars(
+        sa.select(Review.doctor_id).where(
+            Review.verified_visit == True,
+            Review.is_flagged == False,
+            Review.doctor_id.not_in(sa.select(DoctorRatingAggregate.doctor_id))
+        ).distinct()
+    ).all()
+    service = RatingAggregateService(db)
+    for doctor_id in doctor_ids:
+        service.rebuild(doctor_id)
+    db.close()
+
+
+def upgrade() -> None:
+    # Built by 0001 before this revision existed, or by the old create_all
+    if not sa.inspect(op.get_bind()).has_table('doctor_rating_aggregates'):
+        op.create_table('doctor_rating_aggregates',
+        sa.Column('doctor_id', GUID, nullable=False),
+        sa.Column('review_count', sa.Integer(), nullable=False),
+        sa.Column('overall_sum', sa.Integer(), nullable=False),
+        sa.Column('communication_sum', sa.Integer(), nullable=False),
+        sa.Column('communication_count', sa.Integer(), nullable=False),
+        sa.Column('wait_time_sum', sa.Integer(), nullable=False),
+        sa.Column('wait_time_count', sa.Integer(), nullable=False),
+        sa.Column('diagnosis_accuracy_sum', sa.Integer(), nullable=False),
+        sa.Column('diagnosis_accuracy_count', sa.Integer(), nullable=False),
+        sa.Column('professionalism_sum', sa.Integer(), nullable=False),
+        sa.Column('professionalism_count', sa.Integer(), nullable=False),
+        sa.Column('recent_sum', sa.Integer(), nullable=False),
+        sa.Column('recent_count', sa.Integer(), nullable=False),
+        sa.Column('mid_sum', sa.Integer(), nullable=False),
+        sa.Column('mid_count', sa.Integer(), nullable=False),
+        sa.Column('old_sum', sa.Integer(), nullable=False),
+        sa.Column('old_count', sa.Integer(), nullable=False),
+        sa.Column('buckets_as_of', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['doctor_id'], ['doctors.id'], ),
+        sa.PrimaryKeyConstraint('doctor_id')
+        )
+        with op.batch_alter_table('doctor_rating_aggregates', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_doctor_rating_aggregates_buckets_as_of'), ['buckets_as_of'], unique=False)
+
+    _backfill()
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('doctor_rating_aggregates', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_doctor_rating_aggregates_buckets_as_of'))
+
+    op.drop_table('doctor_rating_aggregates')
@@ -4,10 +4,13 @@ Sync appointments with Google Calendar
 """
 import os
 from typing import Dict, Optional
-from datetime import datetime, timedelta
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from datetime import datetime
+from app.utils.lazy_imports import lazy_import
+
+# Only loaded when calendar sync is enabled (not in mock mode)
+service_account = lazy_import("google.oauth2.service_account", "google-auth")
+discovery = lazy_import("googleapiclient.discovery", "google-api-python-client")
+googleapi_errors = lazy_import("googleapiclient.errors", "google-api-python-client")
 
 
 class GoogleCalendarAdapter:
@@ -29,7 +32,7 @@ class GoogleCalendarAdapter:
                 self.credentials_path,
                 scopes=['https://www.googleapis.com/auth/calendar']
             )
-            self.service = build('calendar', 'v3', credentials=credentials)
+            self.service = discovery.build('calendar', 'v3', credentials=credentials)
         except Exception as e:
             print(f"Google Calendar initialization error: {e}")
             self.service = None
@@ -66,7 +69,7 @@ class GoogleCalendarAdapter:
                     'timeZone': 'Africa/Johannesburg',
                 },
                 'end': {
-                    'dateTime": end_time.isoformat(),
+                    'dateTime': end_time.isoformat(),
                     'timeZone': 'Africa/Johannesburg',
                 },
                 'attendees': [
@@ -93,7 +96,7 @@ class GoogleCalendarAdapter:
                 "message": "Calendar event created"
             }
             
-        except HttpError as e:
+        except googleapi_errors.HttpError as e:
             return {
                 "success": False,
                 "error": str(e),
@@ -139,7 +142,7 @@ class GoogleCalendarAdapter:
                 "message": "Event updated"
             }
             
-        except HttpError as e:
+        except googleapi_errors.HttpError as e:
             return {
                 "success": False,
                 "error": str(e),
@@ -162,7 +165,7 @@ class GoogleCalendarAdapter:
             
             return {"success": True, "message": "Event deleted"}
             
-        except HttpError as e:
+        except googleapi_errors.HttpError as e:
             return {
                 "success": False,
                 "error": str(e),
@@ -172,6 +175,7 @@ class GoogleCalendarAdapter:
 
 # Factory function
 def get_google_calendar_adapter() -> GoogleCalendarAdapter:
-    """Factory function for dependency injection"""
-    return GoogleCalendarAdapter()
+    """Process-wide adapter (see app.container)"""
+    from app.container import get_container
+    return get_container().google_calendar_adapter
 
@@ -0,0 +1,99 @@
+"""
+OpenAI Adapter
+Asyncio-native chat completions with bounded concurrency and per-call timeouts
+"""
+import asyncio
+import os
+import weakref
+from typing import Dict, List, Optional
+
+from app.utils.lazy_imports import lazy_import
+from app.utils.metrics import track_outbound
+
+# The SDK (and its httpx/pydantic model tree) loads on the first real call
+openai = lazy_import("openai")
+
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "20"))
+
+
+class OpenAIUnavailableError(RuntimeError):
+    """Raised when no async OpenAI client can be used (no key, mock mode, old SDK)"""
+
+
+class AsyncOpenAIAdapter:
+    """
+    Shared async OpenAI client
+
+    - At most `max_concurrency` requests in flight per event loop; extra
+      callers wait for a slot instead of piling onto the API.
+    - Every call is bounded by `timeout` seconds (asyncio.TimeoutError).
+    - Cancelling the awaiting task (e.g. client disconnect) cancels the
+      HTTP request; CancelledError is never swallowed.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_concurrency: int = OPENAI_MAX_CONCURRENCY,
+        timeout: float = OPENAI_TIMEOUT_SECONDS
+    ):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.mock_mode = os.getenv("OPENAI_MOCK_MODE", "false").lower() == "true"
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._client = None
+        # asyncio primitives belong to one loop; keep a semaphore per loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @property
+    def available(self) -> bool:
+        return not self.mock_mode and bool(self.api_key) and openai.available and hasattr(openai, "AsyncOpenAI")
+
+    def _get_client(self):
+        if not self.available:
+            raise OpenAIUnavailableError("OpenAI async client not configured")
+        if self._client is None:
+            # Retries are left to the caller's fallback; the timeout is enforced per call below
+            self._client = openai.AsyncOpenAI(api_key=self.api_key, max_retries=0)
+        return self._client
+
+    async def aclose(self):
+        """Close the client's connection pool (app shutdown)"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def chat_completion(
+        self,
+        model: str,
+        messages: List[Dict],
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> str:
+        """Run one chat completion and return the message content"""
+        client = self._get_client()
+        async with self._semaphore():
+            with track_outbound("openai"):
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(model=model, messages=messages, **kwargs),
+                    timeout=timeout or self.timeout
+                )
+        return response.choices[0].message.content
+
+
+# Factory function
+def get_openai_adapter() -> AsyncOpenAIAdapter:
+    """Process-wide adapter so the connection pool and concurrency limit are shared (see app.container)"""
+    from app.container import get_container
+    return get_container().openai_adapter
@@ -3,7 +3,6 @@ PayFast Payment Adapter
 South African payment gateway integration
 """
 import os
-import requests
 import hashlib
 from typing import Dict, Optional
 from urllib.parse import urlencode
@@ -57,6 +57,7 @@ class PaymentAdapter:
 
 # Factory function
 def get_payment_adapter() -> PaymentAdapter:
-    """Factory function for dependency injection"""
-    return PaymentAdapter()
+    """Process-wide adapter (see app.container)"""
+    from app.container import get_container
+    return get_container().payment_adapter
 
@@ -4,9 +4,13 @@ Telehealth video consultation integration
 """
 import os
 from typing import Dict, Optional
-from twilio.rest import Client as TwilioClient
-from twilio.jwt.access_token import AccessToken
-from twilio.jwt.access_token.grants import VideoGrant
+from app.utils.lazy_imports import lazy_import
+from app.utils.metrics import track_outbound
+
+# Only loaded outside mock mode
+twilio_rest = lazy_import("twilio.rest", "twilio")
+access_token = lazy_import("twilio.jwt.access_token", "twilio")
+grants = lazy_import("twilio.jwt.access_token.grants", "twilio")
 
 
 class TwilioVideoAdapter:
@@ -20,10 +24,16 @@ class TwilioVideoAdapter:
         self.mock_mode = os.getenv("TWILIO_VIDEO_MOCK_MODE", "true").lower() == "true"
         
         if not self.mock_mode and self.account_sid and self.auth_token:
-            self.client = TwilioClient(self.account_sid, self.auth_token)
+            self.client = twilio_rest.Client(self.account_sid, self.auth_token)
         else:
             self.client = None
     
+    def close(self):
+        """Release the Twilio connection pool"""
+        session = getattr(getattr(self.client, "http_client", None), "session", None)
+        if session is not None:
+            session.close()
+    
     def create_room(
         self,
         appointment_id: str,
@@ -48,12 +58,13 @@ class TwilioVideoAdapter:
         try:
             room_name = f"appointment_{appointment_id}"
             
-            room = self.client.video.rooms.create(
-                unique_name=room_name,
-                type='go',  # Group room
-                record_participants_on_connect=False,
-                status_callback=f"{os.getenv('API_URL')}/api/appointments/{appointment_id}/video-callback"
-            )
+            with track_outbound("twilio"):
+                room = self.client.video.rooms.create(
+                    unique_name=room_name,
+                    type='go',  # Group room
+                    record_participants_on_connect=False,
+                    status_callback=f"{os.getenv('API_URL')}/api/appointments/{appointment_id}/video-callback"
+                )
             
             return {
                 "success": True,
@@ -91,7 +102,7 @@ class TwilioVideoAdapter:
         
         try:
             # Create access token
-            token = AccessToken(
+            token = access_token.AccessToken(
                 self.account_sid,
                 self.api_key,
                 self.api_secret,
@@ -99,7 +110,7 @@ class TwilioVideoAdapter:
             )
             
             # Grant video access
-            video_grant = VideoGrant(room=room_name)
+            video_grant = grants.VideoGrant(room=room_name)
             token.add_grant(video_grant)
             
             return {
@@ -126,7 +137,8 @@ class TwilioVideoAdapter:
             return {"success": False, "error": "Twilio client not initialized"}
         
         try:
-            room = self.client.video.rooms(room_sid).update(status='completed')
+            with track_outbound("twilio"):
+                room = self.client.video.rooms(room_sid).update(status='completed')
             
             return {
                 "success": True,
@@ -145,6 +157,7 @@ class TwilioVideoAdapter:
 
 # Factory function
 def get_twilio_video_adapter() -> TwilioVideoAdapter:
-    """Factory function for dependency injection"""
-    return TwilioVideoAdapter()
+    """Process-wide adapter (see app.container)"""
+    from app.container import get_container
+    return get_container().twilio_video_adapter
 
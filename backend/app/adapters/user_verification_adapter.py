@@ -3,10 +3,11 @@ User Verification Adapters
 Smile Identity and Trulioo integration for user verification
 """
 import os
-import requests
 from typing import Dict, Optional, Any
 from datetime import datetime
 from enum import Enum
+from app.utils.circuit_breaker import ProviderUnavailableError
+from app.utils.http_client import get_outbound_http, httpx
 
 
 class VerificationProvider(Enum):
@@ -31,6 +32,12 @@ class UserVerificationAdapter:
         # Trulioo config
         self.trulioo_api_key = os.getenv("TRULIOO_API_KEY")
         self.trulioo_api_url = os.getenv("TRULIOO_API_URL", "https://api.globaldatacompany.com/verifications/v1")
+        # Identity checks can take a while; keep the previous 30 s. One client
+        # per provider so an outage at one does not open the other's circuit
+        outbound = get_outbound_http()
+        timeout = float(os.getenv("USER_VERIFICATION_TIMEOUT", "30"))
+        self.smile_http = outbound.client("smile_identity", timeout=timeout)
+        self.trulioo_http = outbound.client("trulioo", timeout=timeout)
     
     def verify_user(
         self,
@@ -122,11 +129,10 @@ class UserVerificationAdapter:
             if selfie_url:
                 payload["selfie_url"] = selfie_url
             
-            response = requests.post(
+            response = self.smile_http.post(
                 f"{self.smile_api_url}/verify",
                 json=payload,
-                headers=headers,
-                timeout=30
+                headers=headers
             )
             
             response.raise_for_status()
@@ -142,7 +148,7 @@ class UserVerificationAdapter:
                 "message": data.get("message", "Verification completed")
             }
             
-        except requests.RequestException as e:
+        except (httpx.HTTPError, ProviderUnavailableError) as e:
             return {
                 "verified": False,
                 "status": "pending",
@@ -188,11 +194,10 @@ class UserVerificationAdapter:
                 }
             }
             
-            response = requests.post(
+            response = self.trulioo_http.post(
                 f"{self.trulioo_api_url}/verify",
                 json=payload,
-                headers=headers,
-                timeout=30
+                headers=headers
             )
             
             response.raise_for_status()
@@ -210,7 +215,7 @@ class UserVerificationAdapter:
                 "message": "Trulioo verification completed"
             }
             
-        except requests.RequestException as e:
+        except (httpx.HTTPError, ProviderUnavailableError) as e:
             return {
                 "verified": False,
                 "status": "pending",
@@ -222,6 +227,7 @@ class UserVerificationAdapter:
 
 # Factory function
 def get_user_verification_adapter() -> UserVerificationAdapter:
-    """Factory function for dependency injection"""
-    return UserVerificationAdapter()
+    """Process-wide adapter (see app.container)"""
+    from app.container import get_container
+    return get_container().user_verification_adapter
 
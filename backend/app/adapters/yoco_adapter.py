@@ -3,9 +3,10 @@ Yoco Payment Adapter
 South African payment gateway integration
 """
 import os
-import requests
 from typing import Dict
 from datetime import datetime
+from app.utils.circuit_breaker import ProviderUnavailableError
+from app.utils.http_client import get_outbound_http, httpx
 
 
 class YocoAdapter:
@@ -21,6 +22,7 @@ class YocoAdapter:
             self.base_url = "https://api.yoco.com/v1"
         else:
             self.base_url = "https://api.yoco.com/v1"
+        self.http = get_outbound_http().client("yoco", timeout=float(os.getenv("YOCO_TIMEOUT", "10")))
     
     def create_subscription(
         self,
@@ -56,11 +58,10 @@ class YocoAdapter:
                     "email": customer_email
                 }
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/charges",
                 json=payload,
-                headers=headers,
-                timeout=10
+                headers=headers
             )
             
             response.raise_for_status()
@@ -77,7 +78,7 @@ class YocoAdapter:
                 }
             }
             
-        except requests.RequestException as e:
+        except (httpx.HTTPError, ProviderUnavailableError) as e:
             return {
                 "success": False,
                 "error": str(e),
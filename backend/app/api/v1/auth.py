@@ -22,7 +22,7 @@ async def register(
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """User registration (optional for web, mandatory for mobile)"""
-    result = auth_service.register_user(
+    result = await auth_service.register_user_async(
         email=user_data.email,
         phone=user_data.phone,
         full_name=user_data.full_name,
@@ -30,6 +30,13 @@ async def register(
         role=user_data.role or "patient"
     )
     
+    if result.get("busy"):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=result.get("error"),
+            headers={"Retry-After": "1"}
+        )
+    
     if not result.get("success"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -47,11 +54,18 @@ async def login(
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """User login - requires ID verification"""
-    result = auth_service.login_user(
+    result = await auth_service.login_user_async(
         email=credentials.email,
         password=credentials.password
     )
     
+    if result.get("busy"):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=result.get("error"),
+            headers={"Retry-After": "1"}
+        )
+    
     if not result.get("success"):
         # If verification is required, return special response
         if result.get("requires_verification"):
@@ -2,42 +2,68 @@
 Hospital API Routes
 Search, claim, promotion, and profile management
 """
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
-from app.database import get_db
+from app.adapters.payment_adapter import PaymentAdapter, get_payment_adapter
+from app.database import get_db, get_read_db
 from app.services.hospital_service import HospitalService
+from app.services.profile_cache import cached_profile_response
+from app.utils.pagination import COUNT_MODE_PATTERN
 from app.middleware.auth import get_current_user, get_hospital_admin_user
+from app.middleware.rate_limit import general_rate_limit
 from app.models.enhanced_models import User
 
 router = APIRouter()
 
 
+def get_hospital_service(db: Session = Depends(get_db)) -> HospitalService:
+    """Per-request service (it wraps the request's session) over the shared payment adapter"""
+    return HospitalService(db, get_payment_adapter())
+
+
 @router.get("/search")
+@general_rate_limit
 async def search_hospitals(
     q: Optional[str] = Query(None, description="Search query"),
     city: Optional[str] = Query(None),
     type: Optional[str] = Query(None, description="Hospital type filter"),
     rating: Optional[float] = Query(None, ge=0, le=5),
     verified_only: bool = Query(True, description="Show only verified hospitals"),
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="Latitude for near-me search"),
+    lng: Optional[float] = Query(None, ge=-180, le=180, description="Longitude for near-me search"),
+    radius_km: float = Query(25, gt=0, le=1000, description="Search radius around lat/lng"),
+    sort: str = Query("relevance", pattern="^(relevance|distance)$", description="relevance or distance (needs lat/lng)"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page; empty string starts cursor mode"),
+    count: str = Query("exact", pattern=COUNT_MODE_PATTERN, description="exact, estimate or none (skip the total)"),
+    db: AsyncSession = Depends(get_read_db),
+    payment_adapter: PaymentAdapter = Depends(get_payment_adapter)
 ):
     """
     Search hospitals with filters
     - Only claimed & verified hospitals shown by default
     - Featured hospitals appear first
+    - lat/lng: hospitals within radius_km, sort=distance for nearest first
     """
-    hospital_service = HospitalService(db)
-    result = hospital_service.search_hospitals(
-        q=q,
-        city=city,
-        type_filter=type,
-        rating=rating,
-        verified_only=verified_only,
-        page=page,
-        limit=limit
+    result = await db.run_sync(
+        lambda session: HospitalService(session, payment_adapter).search_hospitals(
+            q=q,
+            city=city,
+            type_filter=type,
+            rating=rating,
+            verified_only=verified_only,
+            page=page,
+            limit=limit,
+            cursor=cursor,
+            count_mode=count,
+            lat=lat,
+            lng=lng,
+            radius_km=radius_km,
+            sort=sort
+        )
     )
     
     return result
@@ -46,26 +72,29 @@ async def search_hospitals(
 @router.get("/{hospital_id}")
 async def get_hospital(
     hospital_id: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    payment_adapter: PaymentAdapter = Depends(get_payment_adapter)
 ):
-    """Get hospital profile details"""
-    hospital_service = HospitalService(db)
-    result = hospital_service.get_hospital_profile(hospital_id)
-    
-    if not result.get("success"):
-        raise HTTPException(status_code=404, detail=result.get("error"))
-    
-    return result
+    """Get hospital profile details (cached, invalidated on writes; supports If-None-Match)"""
+    async def load():
+        result = await db.run_sync(
+            lambda session: HospitalService(session, payment_adapter).get_hospital_profile(hospital_id)
+        )
+        if not result.get("success"):
+            raise HTTPException(status_code=404, detail=result.get("error"))
+        return result
+
+    return await cached_profile_response(request, "hospital", hospital_id, load)
 
 
 @router.post("/{hospital_id}/claim/initiate")
 async def initiate_claim(
     hospital_id: str,
     email: str = Query(..., description="Email to receive claim link"),
-    db: Session = Depends(get_db)
+    hospital_service: HospitalService = Depends(get_hospital_service)
 ):
     """Initiate hospital claim process"""
-    hospital_service = HospitalService(db)
     result = hospital_service.initiate_claim(hospital_id, email)
     
     if not result.get("success"):
@@ -77,10 +106,9 @@ async def initiate_claim(
 @router.get("/claim/verify/{claim_token}")
 async def verify_claim_token(
     claim_token: str,
-    db: Session = Depends(get_db)
+    hospital_service: HospitalService = Depends(get_hospital_service)
 ):
     """Verify claim token from email link"""
-    hospital_service = HospitalService(db)
     result = hospital_service.verify_claim_token(claim_token)
     
     if not result.get("success"):
@@ -93,11 +121,10 @@ async def verify_claim_token(
 async def complete_claim(
     claim_id: str,
     documents: dict,
-    db: Session = Depends(get_db),
+    hospital_service: HospitalService = Depends(get_hospital_service),
     current_user: User = Depends(get_current_user)
 ):
     """Complete hospital claim with document upload"""
-    hospital_service = HospitalService(db)
     result = hospital_service.complete_claim(
         claim_id=claim_id,
         user_id=str(current_user.id),
@@ -115,11 +142,10 @@ async def purchase_promotion(
     hospital_id: str,
     promotion_tier: str = Query(..., description="standard or premium"),
     payment_provider: str = Query("payfast", description="payfast, yoco, or paystack"),
-    db: Session = Depends(get_db),
+    hospital_service: HospitalService = Depends(get_hospital_service),
     current_user: User = Depends(get_hospital_admin_user)
 ):
     """Purchase hospital promotion"""
-    hospital_service = HospitalService(db)
     result = hospital_service.purchase_promotion(
         hospital_id=hospital_id,
         promotion_tier=promotion_tier,
@@ -135,7 +161,7 @@ async def purchase_promotion(
 @router.post("/promotion/webhook")
 async def promotion_webhook(
     data: dict,
-    db: Session = Depends(get_db)
+    hospital_service: HospitalService = Depends(get_hospital_service)
 ):
     """Handle payment webhook for promotion activation"""
     # Verify webhook signature (implementation depends on provider)
@@ -150,7 +176,6 @@ async def promotion_webhook(
     
     amount = data.get("amount", 0)
     
-    hospital_service = HospitalService(db)
     result = hospital_service.activate_promotion(
         hospital_id=hospital_id,
         promotion_tier=promotion_tier,
@@ -0,0 +1,90 @@
+"""
+Application Container
+Long-lived adapters and services, built once per process and closed on shutdown
+
+The existing factories (get_ai_service, get_notification_service,
+get_payment_adapter, ...) return the container's instances, so they work
+unchanged as FastAPI dependencies and from services.
+"""
+import logging
+import threading
+from typing import Optional
+
+from app.adapters.google_calendar_adapter import GoogleCalendarAdapter
+from app.adapters.openai_adapter import AsyncOpenAIAdapter
+from app.adapters.payment_adapter import PaymentAdapter
+from app.adapters.twilio_video_adapter import TwilioVideoAdapter
+from app.adapters.user_verification_adapter import UserVerificationAdapter
+from app.services.ai_service import AIService
+from app.services.notification_service import NotificationService
+from app.utils.http_client import close_outbound_http
+
+logger = logging.getLogger(__name__)
+
+
+class Container:
+    """
+    Process-wide clients
+
+    Adapters read their env configuration and build their HTTP clients
+    (Twilio, SendGrid, OpenAI, the outbound httpx pool) once, and every request
+    reuses them. Services that wrap a request's DB session stay per request
+    but are handed these shared adapters.
+    """
+
+    def __init__(self):
+        self.openai_adapter = AsyncOpenAIAdapter()
+        self.ai_service = AIService(openai_adapter=self.openai_adapter)
+        self.notification_service = NotificationService()
+        self.payment_adapter = PaymentAdapter()
+        self.user_verification_adapter = UserVerificationAdapter()
+        self.twilio_video_adapter = TwilioVideoAdapter()
+        self.google_calendar_adapter = GoogleCalendarAdapter()
+
+    async def aclose(self):
+        """Close connection pools; errors are logged so shutdown always completes"""
+        closers = [
+            self.notification_service.close,
+            self.twilio_video_adapter.close,
+            close_outbound_http,  # pooled connections of the REST adapters
+        ]
+        for close in closers:
+            try:
+                close()
+            except Exception as e:
+                logger.warning("error closing %s: %s", getattr(close, "__qualname__", close), e)
+        try:
+            await self.openai_adapter.aclose()
+        except Exception as e:
+            logger.warning("error closing OpenAI client: %s", e)
+
+
+_container: Optional[Container] = None
+_container_lock = threading.Lock()
+
+
+def get_container() -> Container:
+    """The process container; built on first use outside the app (scripts, tests)"""
+    global _container
+    with _container_lock:
+        if _container is None:
+            _container = Container()
+        return _container
+
+
+def start_container() -> Container:
+    """Build the container at app startup so the first request does not pay for it"""
+    container = get_container()
+    logger.info("application container started")
+    return container
+
+
+async def shutdown_container():
+    """Close the container's clients; the next get_container() builds a fresh one"""
+    global _container
+    with _container_lock:
+        container, _container = _container, None
+    if container is not None:
+        await container.aclose()
+        logger.info("application container closed")
+
@@ -1,26 +1,40 @@
 """
 FastAPI Main Application
 """
+import asyncio
+import logging
+import os
+import time
+import uuid
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.exceptions import RequestValidationError, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from app.routes import auth, doctors, hospitals
+from app.routes import admin, auth, doctors, hospitals
 # Temporarily disabled
 # from app.routes import ai
-from app.database import engine, Base
-from app.models import enhanced_models
+from sqlalchemy import text
+from app.container import shutdown_container, start_container
+from app.database import SessionLocal, async_engine, replica_pool
+from app.middleware.metrics import MetricsMiddleware
+from app.services.rating_aggregate_service import run_rebucket_job
+from app.utils.http_client import get_outbound_http
+from app.utils.metrics import render_metrics
+from app.utils.replicas import record_write, run_replica_health_checks
+from app.utils.structured_logging import configure_logging, debug_requests_enabled, request_id_var, sample_success
 # Temporarily disabled until services/dependencies are implemented
-# from app.routes import appointments, admin, reviews, payments
+# from app.routes import appointments, reviews, payments
 
-# Create database tables on startup
-try:
-    Base.metadata.create_all(bind=engine)
-    print("[OK] Database tables created/verified")
-except Exception as e:
-    print(f"[WARNING] Database initialization warning: {e}")
+configure_logging()
+logger = logging.getLogger(__name__)
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+READY_TIMEOUT = float(os.getenv("READY_TIMEOUT", "2"))
+
+# Tables and indexes are created by `python -m app.migrate` (alembic), run
+# once per deploy; importing the app does no DDL
 
 app = FastAPI(
     title="RateTheDoctor API",
@@ -31,68 +45,93 @@ app = FastAPI(
 # Startup event to verify app is loading
 @app.on_event("startup")
 async def startup_event():
-    print("[OK] FastAPI app started successfully")
-    print("[OK] Exception handlers registered")
+    logger.info("FastAPI app started")
+    # Shared adapters and their HTTP clients, reused by every request
+    start_container()
+    # Periodically move doctor rating aggregates between review-age buckets
+    asyncio.create_task(run_rebucket_job(SessionLocal))
+    if replica_pool:
+        asyncio.create_task(run_replica_health_checks(replica_pool))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await shutdown_container()
 
 # Add middleware FIRST to catch all errors - MUST be before other middleware
 @app.middleware("http")
 async def catch_exceptions_middleware(request: Request, call_next):
-    import sys
-    # Force flush to ensure output appears immediately
-    sys.stdout.flush()
-    sys.stderr.flush()
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    started = time.perf_counter()
     
     try:
-        print(f"\n{'='*60}", flush=True)
-        print(f"[DEBUG] ===== NEW REQUEST =====", flush=True)
-        print(f"[DEBUG] Method: {request.method}", flush=True)
-        print(f"[DEBUG] Path: {request.url.path}", flush=True)
-        print(f"[DEBUG] Full URL: {request.url}", flush=True)
+        if debug_requests_enabled():
+            logger.debug("request started", extra={"method": request.method, "url": str(request.url)})
         
         response = await call_next(request)
         
-        print(f"[DEBUG] Response status: {response.status_code}", flush=True)
+        duration_ms = round((time.perf_counter() - started) * 1000, 2)
         content_type = response.headers.get('content-type', '')
-        print(f"[DEBUG] Response content-type: {content_type}", flush=True)
+        access = {
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "duration_ms": duration_ms,
+        }
+        if debug_requests_enabled():
+            logger.debug("request finished", extra={**access, "content_type": content_type})
+        if response.status_code >= 500:
+            logger.error("request failed", extra=access)
+        elif response.status_code >= 400:
+            logger.warning("request rejected", extra=access)
+        elif sample_success():
+            logger.info("request completed", extra=access)
+        
+        # Read-your-writes: this client's reads skip the replicas for a few seconds
+        if replica_pool and request.method in WRITE_METHODS and response.status_code < 400:
+            record_write(request, response)
         
         # Check if response is plain text error - convert to JSON
         if response.status_code >= 400 and 'text/plain' in content_type:
-            print(f"[ERROR] Plain text error detected! Status: {response.status_code}", flush=True)
+            logger.error("plain text error response converted to JSON", extra={"status": response.status_code})
             # Return JSON error instead of plain text
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=response.status_code,
                 content={"detail": "Internal server error", "message": "An error occurred on the server", "type": "ServerError"}
             )
         
+        response.headers["X-Request-ID"] = request_id
         return response
     except Exception as exc:
-        import traceback
-        error_trace = traceback.format_exc()
         error_msg = str(exc)
         error_type = type(exc).__name__
-        print(f"[ERROR] Middleware caught error: {error_type}: {error_msg}", flush=True)
-        print(error_trace, flush=True)
+        logger.exception("middleware caught error", extra={"method": request.method, "path": request.url.path})
         return JSONResponse(
             status_code=500,
-            content={"detail": error_msg, "type": error_type, "message": f"{error_type}: {error_msg}"}
+            content={"detail": error_msg, "type": error_type, "message": f"{error_type}: {error_msg}"},
+            headers={"X-Request-ID": request_id}
         )
+    finally:
+        request_id_var.reset(token)
 
 # Register exception handlers AFTER middleware
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle FastAPI HTTP exceptions"""
     detail = exc.detail
+    headers = getattr(exc, "headers", None)  # Retry-After, rate limit headers
     if isinstance(detail, dict):
-        return JSONResponse(status_code=exc.status_code, content=detail)
-    return JSONResponse(status_code=exc.status_code, content={"detail": str(detail), "message": str(detail)})
+        return JSONResponse(status_code=exc.status_code, content=detail, headers=headers)
+    return JSONResponse(status_code=exc.status_code, content={"detail": str(detail), "message": str(detail)}, headers=headers)
 
 @app.exception_handler(StarletteHTTPException)
 async def starlette_http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle Starlette HTTP exceptions"""
     detail = exc.detail
+    headers = getattr(exc, "headers", None)  # Retry-After, rate limit headers
     if isinstance(detail, dict):
-        return JSONResponse(status_code=exc.status_code, content=detail)
-    return JSONResponse(status_code=exc.status_code, content={"detail": str(detail), "message": str(detail)})
+        return JSONResponse(status_code=exc.status_code, content=detail, headers=headers)
+    return JSONResponse(status_code=exc.status_code, content={"detail": str(detail), "message": str(detail)}, headers=headers)
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -105,17 +144,13 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler to catch all errors"""
-    import traceback
-    import sys
-    error_trace = traceback.format_exc()
     error_msg = str(exc)
     error_type = type(exc).__name__
-    print(f"\n{'='*60}", flush=True)
-    print(f"[ERROR] Global error handler: {error_type}: {error_msg}", flush=True)
-    print(f"[ERROR] Request: {request.method} {request.url.path}", flush=True)
-    print(error_trace, flush=True)
-    sys.stdout.flush()
-    sys.stderr.flush()
+    logger.error(
+        "unhandled error",
+        exc_info=(type(exc), exc, exc.__traceback__),
+        extra={"method": request.method, "path": request.url.path}
+    )
     return JSONResponse(
         status_code=500,
         content={"detail": error_msg, "type": error_type, "message": f"{error_type}: {error_msg}"}
@@ -136,19 +171,18 @@ app.add_middleware(
     allowed_hosts=["ratethedoctor.co.za", "*.ratethedoctor.co.za", "localhost", "127.0.0.1"]
 )
 
-# Rate limiting disabled for now to fix FastAPI issues
+# Metrics last: outermost, so it times everything above
+app.add_middleware(MetricsMiddleware)
 
 # Include routers
-print("[DEBUG] Including routers...", flush=True)
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
-print("[DEBUG] Auth router included", flush=True)
 app.include_router(doctors.router, prefix="/api/doctors", tags=["Doctors"])
 app.include_router(hospitals.router, prefix="/api/hospitals", tags=["Hospitals"])
-print("[DEBUG] All routers included", flush=True)
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
+logger.debug("routers included")
 # Temporarily disabled until services/dependencies are implemented
 # app.include_router(appointments.router, prefix="/api/appointments", tags=["Appointments"])
 # app.include_router(reviews.router, prefix="/api/reviews", tags=["Reviews"])
-# app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
 # app.include_router(payments.router, prefix="/api/payments", tags=["Payments"])
 # Temporarily disabled due to dependency injection issues
 # app.include_router(ai.router, prefix="/api/ai", tags=["AI"])
@@ -161,24 +195,56 @@ async def root():
 async def health():
     return {"status": "healthy", "message": "Backend is running"}
 
+async def _ping_primary():
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 503 until the primary database accepts connections"""
+    checks = {}
+    try:
+        await asyncio.wait_for(_ping_primary(), READY_TIMEOUT)
+        checks["database"] = "ok"
+    except Exception as e:
+        logger.warning("readiness check failed: %s", e)
+        checks["database"] = type(e).__name__
+    if replica_pool:
+        # Reads fall back to the primary, so replicas are reported but not required
+        healthy = sum(1 for replica in replica_pool.replicas if replica.healthy)
+        checks["replicas"] = f"{healthy}/{len(replica_pool.replicas)} healthy"
+
+    if checks["database"] != "ok":
+        return JSONResponse(status_code=503, content={"status": "unavailable", "checks": checks})
+    return {"status": "ready", "checks": checks}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (all gunicorn workers when PROMETHEUS_MULTIPROC_DIR is set)"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/metrics/providers")
+async def provider_metrics():
+    """Outbound call metrics and circuit breaker state per third-party provider"""
+    return get_outbound_http().stats()
+
 @app.get("/api/test")
 async def test_get():
     """Simple test endpoint"""
-    print("[DEBUG] GET /api/test called")
     return {"status": "ok", "message": "Backend is accessible"}
 
 @app.post("/api/test")
 async def test_post(request: Request):
     """Test endpoint to verify routing works"""
-    print("[DEBUG] ===== TEST POST ENDPOINT CALLED =====")
     try:
         body = await request.json()
-        print(f"[DEBUG] Request body: {body}")
+        if debug_requests_enabled():
+            logger.debug("test endpoint body", extra={"body": body})
         return {"status": "ok", "received": body, "message": "Test endpoint works!"}
     except Exception as e:
-        print(f"[ERROR] Test endpoint error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("test endpoint error")
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
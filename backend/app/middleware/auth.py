@@ -2,84 +2,274 @@
 Authentication Middleware
 JWT token verification with hospital admin support
 """
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 from app.database import get_db
-from app.models.enhanced_models import User
+from app.models.enhanced_models import User, UserRole
+from app.utils.cache import TTLCache, get_redis_client
+
+logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
+# With Redis every lookup checks a per-user version that role/verification
+# changes INCR, so all processes see a change at once. Without it an
+# invalidation only reaches this process: others keep the old principal for
+# up to PRINCIPAL_CACHE_TTL, hence the short default. Entries never outlive
+# the token itself.
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60" if os.getenv("REDIS_URL") else "10"))
+PRINCIPAL_VERSION_PREFIX = "principal:ver:"
+
+# sha256(token) -> (cached_at, version, Principal)
+principal_cache = TTLCache(ttl=PRINCIPAL_CACHE_TTL, max_entries=10000)
+# user id -> monotonic time of the last role/verification change, oldest
+# first. Pruned by age only, so a marker outlives every principal it guards.
+_invalidated_at: Dict[str, float] = {}
+_invalidated_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Identity and authorization facts for a token; enough for role checks"""
+    id: str
+    email: str
+    role: UserRole
+    verified: bool
+    expires_at: float
+
+
+class CurrentUser:
+    """
+    Authenticated principal for one request
+
+    id, email, role and verified come from the cached principal. Any other
+    User attribute loads the full row on first access.
+    """
+
+    def __init__(self, principal: Principal, db: Session):
+        self.principal = principal
+        self._db = db
+        self._user: Optional[User] = None
+
+    @property
+    def id(self) -> str:
+        return self.principal.id
+
+    @property
+    def email(self) -> str:
+        return self.principal.email
+
+    @property
+    def role(self) -> UserRole:
+        return self.principal.role
+
+    @property
+    def verified(self) -> bool:
+        return self.principal.verified
+
+    @property
+    def user(self) -> User:
+        """Full User row (one query, on demand)"""
+        if self._user is None:
+            self._user = self._db.query(User).filter(User.id == self.principal.id).first()
+            if self._user is None:
+                invalidate_user_principals(self.principal.id)
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid or expired token",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+        return self._user
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def invalidate_user_principals(user_id) -> None:
+    """Drop cached principals for a user (role or verification changed)"""
+    user_id = str(user_id)
+    now = time.monotonic()
+    with _invalidated_lock:
+        _invalidated_at.pop(user_id, None)
+        _invalidated_at[user_id] = now
+        # Principals cached before the oldest markers have expired by now
+        oldest = next(iter(_invalidated_at))
+        while now - _invalidated_at[oldest] > PRINCIPAL_CACHE_TTL:
+            del _invalidated_at[oldest]
+            oldest = next(iter(_invalidated_at))
+
+    client = get_redis_client()
+    if client is None:
+        return
+    try:
+        client.incr(PRINCIPAL_VERSION_PREFIX + user_id)
+    except Exception as e:
+        logger.warning("principal version bump failed: %s", e)
+
+
+def _shared_version(client, user_id: str) -> Optional[int]:
+    """User's version in Redis, or None when it cannot be read (do not trust the cache then)"""
+    try:
+        return int(client.get(PRINCIPAL_VERSION_PREFIX + user_id) or 0)
+    except Exception as e:
+        logger.warning("principal version read failed: %s", e)
+        return None
+
+
+def _is_current(client, cached_at: float, version: Optional[int], principal: Principal) -> bool:
+    invalidated_at = _invalidated_at.get(principal.id)
+    if invalidated_at is not None and cached_at <= invalidated_at:
+        return False
+    if client is None:
+        return True
+    return version is not None and _shared_version(client, principal.id) == version
+
+
+def get_principal(token: str, db: Session) -> Optional[Principal]:
+    """Principal for a token, from cache or a single narrow users query"""
+    key = _token_key(token)
+    client = get_redis_client()
+    cached = principal_cache.get(key)
+    if cached is not None:
+        cached_at, version, principal = cached
+        if principal.expires_at > time.time() and _is_current(client, cached_at, version, principal):
+            return principal
+        principal_cache.delete(key)
+
+    from app.services.auth_service import decode_token
+
+    payload = decode_token(token)
+    if not payload or not payload.get("sub"):
+        return None
+
+    # Taken before the read so a change committed meanwhile still invalidates it
+    started_at = time.monotonic()
+    version = _shared_version(client, str(payload["sub"])) if client is not None else None
+    row = db.query(User.id, User.email, User.role, User.verified).filter(
+        User.id == payload["sub"]
+    ).first()
+    if row is None:
+        return None
+
+    expires_at = float(payload.get("exp", time.time() + PRINCIPAL_CACHE_TTL))
+    principal = Principal(
+        id=str(row.id),
+        email=row.email,
+        role=row.role,
+        verified=bool(row.verified),
+        expires_at=expires_at
+    )
+    ttl = min(PRINCIPAL_CACHE_TTL, expires_at - time.time())
+    if ttl > 0 and (client is None or version is not None):
+        principal_cache.set(key, (started_at, version, principal), ttl=ttl)
+    return principal
+
+
+def _on_authz_change(target, value, oldvalue, initiator):
+    if target.id is None:
+        return
+    invalidate_user_principals(target.id)
+    # Again after commit, in case a request re-cached the old row in between
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("principal_invalidations", set()).add(str(target.id))
+
+
+for _attribute in (User.role, User.verified, User.verification_status):
+    event.listen(_attribute, "set", _on_authz_change)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    for user_id in session.info.pop("principal_invalidations", ()):
+        invalidate_user_principals(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop("principal_invalidations", None)
+
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> CurrentUser:
     """Get current authenticated user"""
-    from app.services.auth_service import AuthService
-    
-    token = credentials.credentials
-    
-    auth_service = AuthService(db)
-    user = auth_service.get_user_from_token(token)
-    
-    if not user:
+    principal = get_principal(credentials.credentials, db)
+
+    if not principal:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    return user
+
+    return CurrentUser(principal, db)
 
 
 def get_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: CurrentUser = Depends(get_current_user)
+) -> CurrentUser:
     """Get current user and verify admin role"""
     if current_user.role.value != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
         )
-    
+
     return current_user
 
 
 def get_doctor_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: CurrentUser = Depends(get_current_user)
+) -> CurrentUser:
     """Get current user and verify doctor role"""
     if current_user.role.value != "doctor":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Doctor access required"
         )
-    
+
     return current_user
 
 
 def get_hospital_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: CurrentUser = Depends(get_current_user)
+) -> CurrentUser:
     """Get current user and verify hospital admin role"""
     if current_user.role.value not in ["hospital_admin", "admin"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Hospital admin access required"
         )
-    
+
     return current_user
 
 
 def get_verified_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: CurrentUser = Depends(get_current_user)
+) -> CurrentUser:
     """Get current user and verify they are verified"""
     if not current_user.verified:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User verification required"
         )
-    
+
     return current_user
@@ -0,0 +1,117 @@
+"""
+Metrics Middleware
+Per-route latency, status and DB time for every HTTP request (pure ASGI)
+"""
+import logging
+import time
+from typing import Dict, Tuple
+
+from app.utils.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    request_db_stats,
+)
+from app.utils.query_profiler import QueryProfile
+from app.utils.structured_logging import debug_requests_enabled
+
+logger = logging.getLogger(__name__)
+
+# Route label for requests no route matched (404s, rejected hosts); raw
+# paths would give every scanner probe its own time series
+UNMATCHED_ROUTE = "unmatched"
+# Anything else is counted as "OTHER", for the same reason
+METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+class MetricsMiddleware:
+    """
+    Records every HTTP request under its route template ("/api/doctors/{doctor_id}")
+
+    Add it last so it wraps the other middleware and times the whole
+    response. The route is known only after routing, from the endpoint
+    Starlette puts in the scope.
+
+    In debug mode (DEBUG_REQUEST_LOGGING) each response also carries a
+    Server-Timing header with the request's statement count, duplicate
+    statements and DB time, and duplicates are logged; that needs the
+    engines' query hooks (DB_QUERY_METRICS, on by default).
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: Dict[object, str] = {}
+        # Labelled series, looked up once per method/route/status
+        self._in_progress: Dict[str, object] = {}
+        self._series: Dict[Tuple[str, str], Tuple] = {}
+        self._counters: Dict[Tuple[str, str, int], object] = {}
+
+    def _route(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        route = self._routes.get(endpoint)
+        if route is None:
+            # Built on first sight of each endpoint; routes can be added after startup
+            for candidate in getattr(scope.get("app"), "routes", ()):
+                if getattr(candidate, "endpoint", None) is endpoint:
+                    route = candidate.path
+                    break
+            route = self._routes[endpoint] = route or UNMATCHED_ROUTE
+        return route
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in METHODS else "OTHER"
+        status = 500
+        debug = debug_requests_enabled()
+        stats = QueryProfile(track_statements=debug)
+        token = request_db_stats.set(stats)
+        in_progress = self._in_progress.get(method)
+        if in_progress is None:
+            in_progress = self._in_progress[method] = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if debug:
+                    message = {**message, "headers": [
+                        *message.get("headers", ()), (b"server-timing", stats.server_timing().encode())
+                    ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started
+            in_progress.dec()
+            request_db_stats.reset(token)
+            route = self._route(scope)
+            self._record(method, route, status, duration, stats)
+            if debug and stats.duplicates:
+                logger.debug("duplicate SQL statements", extra={"route": route, "queries": stats.report()})
+
+    def _record(self, method: str, route: str, status: int, duration: float, stats: QueryProfile):
+        counter = self._counters.get((method, route, status))
+        if counter is None:
+            counter = self._counters[(method, route, status)] = HTTP_REQUESTS.labels(method, route, str(status))
+        series = self._series.get((method, route))
+        if series is None:
+            series = self._series[(method, route)] = (
+                HTTP_REQUEST_DURATION.labels(method, route),
+                DB_QUERIES_PER_REQUEST.labels(route),
+                DB_TIME_PER_REQUEST.labels(route),
+            )
+        request_duration, queries, db_time = series
+        counter.inc()
+        request_duration.observe(duration)
+        queries.observe(stats.queries)
+        db_time.observe(stats.seconds)
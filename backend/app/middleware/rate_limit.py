@@ -1,53 +1,300 @@
 """
 Rate Limiting Middleware
-Simple rate limiting for development
+GCRA limits per client and route, kept in process or shared through Redis
 """
+import inspect
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
 from functools import wraps
-from typing import Callable
+from typing import Callable, Dict, Optional
 
-def auth_rate_limit(func: Callable) -> Callable:
+from fastapi import Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+from app.utils.cache import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Policy name -> "<requests>/<second|minute|hour|day>"; RATE_LIMIT_<NAME> overrides one
+RATE_LIMITS = {
+    name: os.getenv(f"RATE_LIMIT_{name.upper()}", default)
+    for name, default in {
+        "general": "100/minute",
+        "auth": "5/minute",
+        "ai": "10/minute",
+        "admin": "50/minute",
+        "webhook": "1000/hour",  # Webhooks can have higher limits
+    }.items()
+}
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# Reverse proxies in front of the app; the client address is taken that
+# many entries from the right of X-Forwarded-For (0: the socket peer)
+RATE_LIMIT_PROXY_HOPS = int(os.getenv("RATE_LIMIT_PROXY_HOPS", "0"))
+RATE_LIMIT_PREFIX = "ratelimit:"
+# In-process backend: clients tracked before idle ones are dropped
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class Rate:
+    """`limit` requests per `period` seconds, all of which may come at once"""
+    limit: int
+    period: float
+
+    @classmethod
+    def parse(cls, text: str) -> "Rate":
+        count, _, unit = text.partition("/")
+        unit = unit.strip().lower().rstrip("s")
+        if unit not in PERIODS or not count.strip().isdigit() or int(count) < 1:
+            raise ValueError(f"Invalid rate limit {text!r}; expected e.g. '100/minute'")
+        return cls(int(count), PERIODS[unit])
+
+    @property
+    def emission_interval(self) -> float:
+        return self.period / self.limit
+
+    def __str__(self) -> str:
+        unit = next(name for name, seconds in PERIODS.items() if seconds == self.period)
+        return f"{self.limit}/{unit}"
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # seconds until the next request would be allowed (0 when allowed)
+    reset_after: float  # seconds until the full limit is available again
+
+
+class MemoryBackend:
     """
-    Rate limit decorator for auth endpoints
-    For development, this is a no-op. In production, implement actual rate limiting.
+    GCRA state (theoretical arrival time per key) in a process-local dict
+
+    A key whose arrival time has passed is equivalent to an absent one, so
+    those are the ones dropped once more than `max_keys` clients are tracked.
     """
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        return await func(*args, **kwargs)
-    return wrapper
+    blocking = False
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._tat: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, rate: Rate) -> Decision:
+        now = self._clock()
+        interval = rate.emission_interval
+        with self._lock:
+            tat = max(self._tat.get(key, now), now)
+            new_tat = tat + interval
+            allow_at = new_tat - rate.period
+            if now < allow_at:
+                return Decision(False, rate.limit, 0, allow_at - now, tat - now)
+            self._tat[key] = new_tat
+            if len(self._tat) > self.max_keys:
+                self._prune(now)
+        return Decision(True, rate.limit, int((now - allow_at) / interval + 1e-9), 0.0, new_tat - now)
+
+    def _prune(self, now: float):
+        for key in [key for key, tat in self._tat.items() if tat <= now]:
+            del self._tat[key]
+        # Still full of active clients: drop the longest-tracked ones
+        excess = len(self._tat) - self.max_keys
+        for key in list(self._tat)[:max(0, excess)]:
+            del self._tat[key]
+
+    def clear(self):
+        with self._lock:
+            self._tat.clear()
 
 
-def general_rate_limit(func: Callable) -> Callable:
+# GCRA in one round trip. Times are microseconds from the Redis server
+# clock, so workers on different hosts agree on "now".
+# KEYS[1] = key, ARGV[1] = emission interval (us), ARGV[2] = period (us)
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000000 + tonumber(time[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+  return {0, 0, allow_at - now, tat - now}
+end
+-- %d: Lua's default number format would round microsecond timestamps
+redis.call('SET', KEYS[1], string.format('%d', new_tat), 'PX', math.ceil((new_tat - now) / 1000))
+return {1, math.floor((now - allow_at) / interval), 0, new_tat - now}
+"""
+
+
+class RedisBackend:
     """
-    Rate limit decorator for general endpoints
-    For development, this is a no-op. In production, implement actual rate limiting.
+    GCRA state in Redis, shared by every worker; updated atomically by a Lua script
+
+    Fails open: if Redis cannot be reached the request is allowed (and
+    logged at most once a minute) rather than taking the API down with it.
     """
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        return await func(*args, **kwargs)
-    return wrapper
+    blocking = True
+
+    def __init__(self, client):
+        self.client = client
+        self._script = client.register_script(GCRA_SCRIPT)
+        self._last_error_logged = 0.0
 
+    def hit(self, key: str, rate: Rate) -> Decision:
+        try:
+            allowed, remaining, retry_us, reset_us = self._script(
+                keys=[key], args=[int(rate.emission_interval * 1e6), int(rate.period * 1e6)]
+            )
+        except Exception as e:
+            if time.monotonic() - self._last_error_logged > 60:
+                self._last_error_logged = time.monotonic()
+                logger.warning("rate limit backend unavailable, allowing requests: %s", e)
+            return Decision(True, rate.limit, rate.limit, 0.0, 0.0)
+        return Decision(bool(allowed), rate.limit, int(remaining), retry_us / 1e6, reset_us / 1e6)
 
-def ai_rate_limit(func: Callable) -> Callable:
+
+class RateLimitExceeded(HTTPException):
+    def __init__(self, policy: str, rate: Rate, decision: Decision):
+        retry_after = max(1, int(decision.retry_after + 0.999))
+        super().__init__(
+            status_code=429,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "RATE_LIMIT_EXCEEDED",
+                    "message": f"Rate limit exceeded. Limit: {rate}",
+                    "details": {"limit": str(rate), "retry_after": retry_after}
+                }
+            },
+            headers={**_headers(decision), "Retry-After": str(retry_after)}
+        )
+        self.policy = policy
+
+
+def _headers(decision: Decision) -> Dict[str, str]:
+    return {
+        "X-RateLimit-Limit": str(decision.limit),
+        "X-RateLimit-Remaining": str(decision.remaining),
+        "X-RateLimit-Reset": str(int(decision.reset_after + 0.999)),
+    }
+
+
+def client_identity(request: Request, proxy_hops: int = RATE_LIMIT_PROXY_HOPS) -> str:
+    """Client address: the socket peer, or the one `proxy_hops` trusted proxies reported"""
+    if proxy_hops:
+        forwarded = [part.strip() for part in request.headers.get("x-forwarded-for", "").split(",") if part.strip()]
+        if len(forwarded) >= proxy_hops:
+            return forwarded[-proxy_hops]
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    """One limiter per process: named policies over a memory or Redis backend"""
+
+    def __init__(self, backend=None, policies: Optional[Dict[str, str]] = None, enabled: bool = RATE_LIMIT_ENABLED):
+        self.backend = backend or MemoryBackend()
+        self.rates = {name: Rate.parse(value) for name, value in (policies or RATE_LIMITS).items()}
+        self.enabled = enabled
+
+    def rate(self, policy: str) -> Rate:
+        """A named policy, or an ad hoc "<requests>/<unit>" string"""
+        rate = self.rates.get(policy)
+        if rate is None:
+            rate = self.rates[policy] = Rate.parse(policy)
+        return rate
+
+    def hit(self, policy: str, scope: str, identity: str) -> Decision:
+        return self.backend.hit(f"{RATE_LIMIT_PREFIX}{policy}:{scope}:{identity}", self.rate(policy))
+
+    async def check(self, policy: str, scope: str, request: Request, response: Response):
+        """Count the request; raises RateLimitExceeded (429) when over the limit"""
+        if not self.enabled:
+            return
+        identity = client_identity(request)
+        if self.backend.blocking:
+            decision = await run_in_threadpool(self.hit, policy, scope, identity)
+        else:
+            decision = self.hit(policy, scope, identity)
+        if not decision.allowed:
+            raise RateLimitExceeded(policy, self.rate(policy), decision)
+        response.headers.update(_headers(decision))
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Shared limiter: Redis-backed when REDIS_URL is set, in-process otherwise"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                client = get_redis_client()
+                _limiter = RateLimiter(RedisBackend(client) if client is not None else None)
+    return _limiter
+
+
+def rate_limit(policy: str) -> Callable:
     """
-    Rate limit decorator for AI endpoints
-    For development, this is a no-op. In production, implement actual rate limiting.
+    Decorator applying a RATE_LIMITS policy (or a "<requests>/<unit>"
+    string) to a route, per client
+
+    Goes under the router decorator. The check runs as the route's first
+    dependency, so a rejected request never opens a DB session or calls
+    the handler.
+
+    Usage:
+        @router.post("/login")
+        @rate_limit("auth")
+        async def login(...):
     """
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        return await func(*args, **kwargs)
-    return wrapper
+    if policy not in RATE_LIMITS:
+        Rate.parse(policy)  # fail at import time on a typo
+
+    def decorator(func: Callable) -> Callable:
+        scope = f"{func.__module__}.{func.__name__}"
+
+        async def check(request: Request, response: Response):
+            await get_rate_limiter().check(policy, scope, request, response)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, _rate_limit=None, **kwargs):
+                return await func(*args, **kwargs)
+        else:
+            @wraps(func)
+            def wrapper(*args, _rate_limit=None, **kwargs):
+                return func(*args, **kwargs)
 
+        # FastAPI calls endpoints with keyword arguments only; making every
+        # parameter keyword-only lets the check go first
+        signature = inspect.signature(func)
+        wrapper.__signature__ = signature.replace(parameters=[
+            inspect.Parameter("_rate_limit", inspect.Parameter.KEYWORD_ONLY, default=Depends(check)),
+            *(p.replace(kind=inspect.Parameter.KEYWORD_ONLY) for p in signature.parameters.values()),
+        ])
+        return wrapper
+    return decorator
 
-def get_rate_limiter():
-    """Get rate limiter instance (mock for development)"""
-    return None
 
+general_rate_limit = rate_limit("general")
+auth_rate_limit = rate_limit("auth")
+ai_rate_limit = rate_limit("ai")
+admin_rate_limit = rate_limit("admin")
+webhook_rate_limit = rate_limit("webhook")
 
-def rate_limit_exceeded_handler(request, exc):
-    """Handle rate limit exceeded (mock)"""
-    from fastapi.responses import JSONResponse
-    return JSONResponse(
-        status_code=429,
-        content={"error": "Rate limit exceeded"}
-    )
 
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    """Exception handler for apps without a generic HTTPException handler"""
+    return JSONResponse(status_code=exc.status_code, content=exc.detail, headers=exc.headers)
@@ -0,0 +1,74 @@
+"""
+Database Migrations
+Apply the alembic migrations: python -m app.migrate [revision]
+
+Run once per deploy, before starting the API workers; the app itself no
+longer creates tables or indexes on import.
+"""
+import logging
+import sys
+from pathlib import Path
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+# Schema that Base.metadata.create_all used to produce
+BASELINE_REVISION = "0001"
+
+
+def alembic_config() -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    # Leave logging to the caller (fileConfig would reset the app's loggers)
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def _is_unversioned_legacy(connection: Connection) -> bool:
+    # Created by the old import-time create_all: tables but no alembic_version
+    inspector = inspect(connection)
+    return inspector.has_table("users") and not inspector.has_table("alembic_version")
+
+
+def migrate(url: Optional[str] = None, revision: str = "head") -> Optional[str]:
+    """Upgrade the database to `revision`; returns the revision afterwards"""
+    if url is None:
+        from app.database import engine
+    else:
+        engine = create_engine(url)
+
+    config = alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        if _is_unversioned_legacy(connection):
+            logger.info("stamping existing schema as revision %s", BASELINE_REVISION)
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, revision)
+        revision = current_revision(connection)
+
+    if url is not None:
+        engine.dispose()
+    return revision
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+    args = sys.argv[1:] if argv is None else argv
+    revision = migrate(revision=args[0] if args else "head")
+    logger.info("database at revision %s", revision)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,8 @@
 Enhanced Database Models
 SQLAlchemy models for Rate The Doctor
 """
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, JSON, Text, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, BigInteger, Float, Boolean, DateTime, ForeignKey, JSON, Text, Enum as SQLEnum
+from sqlalchemy import Index, case, cast, event, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import datetime
@@ -164,6 +165,10 @@ class Doctor(Base):
     rating_avg = Column(Float, default=0.0, index=True)
     total_reviews = Column(Integer, default=0)
     
+    # Search order (plan, then rating, then review count) as one sortable
+    # number, kept in step by the flush hooks below
+    search_rank = Column(BigInteger, default=0, server_default="0", nullable=False)
+    
     # Profile
     profile_picture_url = Column(String(500))
     gallery_images = Column(JSONB)  # Array of image URLs
@@ -180,6 +185,52 @@ class Doctor(Base):
     analytics = relationship("DoctorAnalytics", back_populates="doctor")
     availability = relationship("DoctorAvailability", back_populates="doctor")
 
+    __table_args__ = (
+        # Verified doctors in search order: search reads it in order and stops at the page limit
+        Index("ix_doctors_verification_search_rank", "verification_status", "search_rank", "id"),
+    )
+
+
+# search_rank = plan tier * 10^14 + rating * 10^4 * 10^9 + review count
+SEARCH_RANK_PLAN_TIERS = {SubscriptionPlan.FREE: 0, SubscriptionPlan.BASIC: 1, SubscriptionPlan.PREMIUM: 2}
+SEARCH_RANK_TIER_SCALE = 10 ** 14
+SEARCH_RANK_RATING_SCALE = 10 ** 9
+SEARCH_RANK_RATING_PRECISION = 10 ** 4
+
+
+def _plan_tier(plan) -> int:
+    if not isinstance(plan, SubscriptionPlan):
+        # Some writers assign the value ("free") rather than the member
+        plan = SubscriptionPlan._value2member_map_.get(plan) or SubscriptionPlan.__members__.get(plan)
+    return SEARCH_RANK_PLAN_TIERS.get(plan, 0)
+
+
+def doctor_search_rank(plan, rating_avg: float, total_reviews: int) -> int:
+    """Search order as one number: higher plan first, then rating, then review count"""
+    rating = int(min(max(rating_avg or 0.0, 0.0), 5.0) * SEARCH_RANK_RATING_PRECISION + 0.5)
+    reviews = min(max(total_reviews or 0, 0), SEARCH_RANK_RATING_SCALE - 1)
+    return (
+        _plan_tier(plan) * SEARCH_RANK_TIER_SCALE
+        + rating * SEARCH_RANK_RATING_SCALE
+        + reviews
+    )
+
+
+def doctor_search_rank_expression():
+    """doctor_search_rank as SQL, for backfills and bulk updates that skip the ORM"""
+    tier = case(
+        *((Doctor.subscription_plan == plan, tier) for plan, tier in SEARCH_RANK_PLAN_TIERS.items()),
+        else_=0
+    )
+    rating = cast(func.round(func.coalesce(Doctor.rating_avg, 0.0) * SEARCH_RANK_RATING_PRECISION), BigInteger)
+    return tier * SEARCH_RANK_TIER_SCALE + rating * SEARCH_RANK_RATING_SCALE + func.coalesce(Doctor.total_reviews, 0)
+
+
+@event.listens_for(Doctor, "before_insert")
+@event.listens_for(Doctor, "before_update")
+def _refresh_search_rank(mapper, connection, doctor):
+    doctor.search_rank = doctor_search_rank(doctor.subscription_plan, doctor.rating_avg, doctor.total_reviews)
+
 
 class UserVerification(Base):
     """User verification records"""
@@ -390,3 +441,40 @@ class DoctorAnalytics(Base):
     # Relationships
     doctor = relationship("Doctor", back_populates="analytics")
 
+
+
+class DoctorRatingAggregate(Base):
+    """
+    Running rating totals per doctor (verified, unflagged reviews)
+    
+    Updated in the same transaction as each review, so averages never need
+    the full review list. Overall ratings are also bucketed by review age
+    (as of buckets_as_of) for the recency-weighted rating; a periodic job
+    moves reviews between buckets as they age.
+    """
+    __tablename__ = "doctor_rating_aggregates"
+
+    doctor_id = Column(UUID(as_uuid=False), ForeignKey("doctors.id"), primary_key=True)
+    review_count = Column(Integer, default=0, nullable=False)
+    
+    # Per-category sums and counts (categories are optional on a review)
+    overall_sum = Column(Integer, default=0, nullable=False)
+    communication_sum = Column(Integer, default=0, nullable=False)
+    communication_count = Column(Integer, default=0, nullable=False)
+    wait_time_sum = Column(Integer, default=0, nullable=False)
+    wait_time_count = Column(Integer, default=0, nullable=False)
+    diagnosis_accuracy_sum = Column(Integer, default=0, nullable=False)
+    diagnosis_accuracy_count = Column(Integer, default=0, nullable=False)
+    professionalism_sum = Column(Integer, default=0, nullable=False)
+    professionalism_count = Column(Integer, default=0, nullable=False)
+    
+    # Overall rating by review age: < 30 days, 30-90 days, > 90 days
+    recent_sum = Column(Integer, default=0, nullable=False)
+    recent_count = Column(Integer, default=0, nullable=False)
+    mid_sum = Column(Integer, default=0, nullable=False)
+    mid_count = Column(Integer, default=0, nullable=False)
+    old_sum = Column(Integer, default=0, nullable=False)
+    old_count = Column(Integer, default=0, nullable=False)
+    buckets_as_of = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
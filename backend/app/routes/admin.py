@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.middleware.auth import get_admin_user
 from app.models.enhanced_models import User
-from app.services.verification_service import VerificationService
+from app.services.review_validity_service import get_review_validity_service
 from app.middleware.rate_limit import admin_rate_limit
 
 router = APIRouter()
@@ -57,3 +57,33 @@ async def reject_verification(
     # Implementation would go here
     return {"success": True, "message": "Verification rejected"}
 
+
+
+@router.post("/reviews/{review_id}/flag")
+@admin_rate_limit
+async def flag_review(
+    review_id: str,
+    body: dict = None,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_admin_user)
+):
+    """Flag a review; it no longer counts towards the doctor's rating"""
+    reason = (body or {}).get("reason") or "Flagged by admin"
+    result = get_review_validity_service(db).flag_review(review_id, reason)
+    if not result.get("success"):
+        raise HTTPException(status_code=404, detail=result.get("error"))
+    return result
+
+
+@router.delete("/reviews/{review_id}")
+@admin_rate_limit
+async def delete_review(
+    review_id: str,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_admin_user)
+):
+    """Delete a review and remove it from the doctor's rating"""
+    result = get_review_validity_service(db).delete_review(review_id)
+    if not result.get("success"):
+        raise HTTPException(status_code=404, detail=result.get("error"))
+    return result
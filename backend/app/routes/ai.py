@@ -2,17 +2,12 @@
 AI Routes
 """
 from fastapi import APIRouter, Depends, HTTPException
-from app.services.ai_service import AIService
+from app.services.ai_service import AIService, get_ai_service
 from app.middleware.rate_limit import ai_rate_limit
 
 router = APIRouter()
 
 
-def get_ai_service() -> AIService:
-    """Dependency to get AI service instance"""
-    return AIService()
-
-
 @router.post("/symptom-checker")
 @ai_rate_limit
 async def symptom_checker(
@@ -20,7 +15,7 @@ async def symptom_checker(
     ai_service: AIService = Depends(get_ai_service)
 ):
     """AI-powered symptom checker"""
-    result = ai_service.suggest_specialty_from_symptoms(
+    result = await ai_service.suggest_specialty_from_symptoms_async(
         symptoms=symptoms_data.get("symptoms"),
         duration=symptoms_data.get("duration"),
         severity=symptoms_data.get("severity")
@@ -39,7 +34,7 @@ async def analyze_sentiment(
     ai_service: AIService = Depends(get_ai_service)
 ):
     """Analyze review sentiment"""
-    result = ai_service.classify_review(review_data.get("text", ""))
+    result = await ai_service.classify_review_async(review_data.get("text", ""))
     
     return {
         "success": True,
@@ -54,7 +49,7 @@ async def suggest_reply(
     ai_service: AIService = Depends(get_ai_service)
 ):
     """Suggest auto-reply for doctor"""
-    result = ai_service.suggest_auto_reply(
+    result = await ai_service.suggest_auto_reply_async(
         patient_inquiry=inquiry_data.get("inquiry"),
         doctor_specialization=inquiry_data.get("specialization")
     )
@@ -1,6 +1,7 @@
 """
 Authentication Routes
 """
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.responses import JSONResponse
@@ -8,13 +9,12 @@ from sqlalchemy.orm import Session
 from typing import Dict, Any, Optional
 from pydantic import BaseModel
 from app.database import get_db
+from app.middleware.rate_limit import auth_rate_limit
 from app.services.auth_service import AuthService
 
 router = APIRouter()
 security = HTTPBearer()
-
-# Log when router is created
-print("[DEBUG] Auth router created", flush=True)
+logger = logging.getLogger(__name__)
 
 
 class RegisterRequest(BaseModel):
@@ -41,24 +41,20 @@ class VerifyIDRequest(BaseModel):
 
 
 @router.post("/register", response_model=None)
+@auth_rate_limit
 async def register(
     user_data: RegisterRequest,
     db: Session = Depends(get_db)
 ):
     """User registration"""
-    import sys
     try:
-        print(f"[DEBUG] Registration request: email={user_data.email}, phone={user_data.phone}", flush=True)
-        
         # Quick validation
         if not user_data.email or not user_data.password:
             raise HTTPException(status_code=400, detail="Email and password are required")
         
-        print("[DEBUG] Creating AuthService...", flush=True)
         auth_service = AuthService(db)
-        print("[DEBUG] Calling register_user...", flush=True)
         
-        result = auth_service.register_user(
+        result = await auth_service.register_user_async(
             email=user_data.email,
             phone=user_data.phone,
             full_name=user_data.full_name,
@@ -66,30 +62,26 @@ async def register(
             role=user_data.role
         )
         
-        print(f"[DEBUG] Register result: success={result.get('success')}", flush=True)
-        
+        if result.get("busy"):
+            raise HTTPException(status_code=503, detail=result["error"], headers={"Retry-After": "1"})
         if not result.get("success"):
             error_msg = result.get("error", "Registration failed")
-            print(f"[ERROR] Registration failed: {error_msg}", flush=True)
+            logger.info("registration rejected", extra={"reason": error_msg})
             raise HTTPException(status_code=400, detail=error_msg)
         
-        print("[DEBUG] Registration successful!", flush=True)
         return result["data"]
-    except HTTPException as he:
-        print(f"[ERROR] HTTPException: {he.status_code} - {he.detail}", flush=True)
+    except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
         error_msg = str(e)
         error_type = type(e).__name__
-        print(f"[ERROR] Registration exception: {error_type}: {error_msg}", flush=True)
-        print(error_trace, flush=True)
+        logger.exception("registration error")
         # Return error as string for compatibility
         raise HTTPException(status_code=500, detail=f"{error_type}: {error_msg}")
 
 
 @router.post("/login", response_model=None)
+@auth_rate_limit
 async def login(
     credentials: LoginRequest,
     db: Session = Depends(get_db)
@@ -97,11 +89,13 @@ async def login(
     """User login - requires ID verification"""
     try:
         auth_service = AuthService(db)
-        result = auth_service.login_user(
+        result = await auth_service.login_user_async(
             email=credentials.email,
             password=credentials.password
         )
         
+        if result.get("busy"):
+            raise HTTPException(status_code=503, detail=result["error"], headers={"Retry-After": "1"})
         if not result.get("success"):
             # If verification is required, return special response
             if result.get("requires_verification"):
@@ -119,13 +113,12 @@ async def login(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        print(f"Login error: {e}")
-        print(traceback.format_exc())
+        logger.exception("login error")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
 @router.post("/verify-id", response_model=None)
+@auth_rate_limit
 async def verify_id(
     verification_data: VerifyIDRequest,
     db: Session = Depends(get_db)
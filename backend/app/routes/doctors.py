@@ -2,18 +2,47 @@
 Doctor Routes
 Search, listing, and promotion functionality
 """
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, select
 from typing import Optional
-from app.database import get_db
-from app.models.enhanced_models import Doctor, SubscriptionPlan
+from app.database import get_db, get_read_db
+from app.middleware.rate_limit import general_rate_limit
+from app.models.enhanced_models import SEARCH_RANK_TIER_SCALE, Doctor, SubscriptionPlan, VerificationStatus
+from app.services.geo_index import apply_geo_filter
+from app.services.profile_cache import cached_profile_response, invalidate_profile_after_commit
+from app.services.search_index import apply_doctor_text_search
+from app.utils.pagination import COUNT_MODE_PATTERN, InvalidCursorError, Keyset, count_results, paginate, total_pages
 from enum import Enum
 
 router = APIRouter()
 
+# Cursor sort key: Premium (promoted) first, then by rating, then by review count,
+# all folded into search_rank; verified search reads it in index order
+DOCTOR_KEYSET = Keyset(
+    [
+        (Doctor.search_rank, True),
+        (Doctor.id, True),
+    ],
+    key=lambda d: [d.search_rank, str(d.id)]
+)
+# Plan part of search_rank, so text relevance can rank within a plan
+DOCTOR_PLAN_TIER = Doctor.search_rank // SEARCH_RANK_TIER_SCALE
+
+
+def _geo_keysets(distance):
+    """Keysets for rows of (Doctor, distance_km)"""
+    by_plan = Keyset(DOCTOR_KEYSET.columns, key=lambda row: DOCTOR_KEYSET.key(row[0]))
+    by_distance = Keyset(
+        [(distance, False), (Doctor.id, False)],
+        key=lambda row: [row.distance_km, str(row[0].id)]
+    )
+    return by_plan, by_distance
+
 
 @router.get("/search")
+@general_rate_limit
 async def search_doctors(
     q: Optional[str] = Query(None, description="Search query"),
     specialization: Optional[str] = Query(None),
@@ -22,27 +51,82 @@ async def search_doctors(
     verified: Optional[bool] = Query(True),
     medicalAid: Optional[bool] = Query(None),
     telehealth: Optional[bool] = Query(None),
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="Latitude for near-me search"),
+    lng: Optional[float] = Query(None, ge=-180, le=180, description="Longitude for near-me search"),
+    radius_km: float = Query(25, gt=0, le=1000, description="Search radius around lat/lng"),
+    sort: str = Query("relevance", pattern="^(relevance|distance)$", description="relevance or distance (needs lat/lng)"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page; empty string starts cursor mode"),
+    count: str = Query("exact", pattern=COUNT_MODE_PATTERN, description="exact, estimate or none (skip the total)"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Search for doctors with filters
-    Promoted doctors (Premium plan) appear first
+    Promoted doctors (Premium plan) appear first, then by text relevance
+    In cursor mode results follow the stable sort key (plan, rating, reviews)
+    With lat/lng only doctors within radius_km are returned, with distanceKm;
+    sort=distance orders them nearest first
     """
+    return await db.run_sync(
+        _search_doctors,
+        q=q,
+        specialization=specialization,
+        location=location,
+        rating=rating,
+        verified=verified,
+        medicalAid=medicalAid,
+        telehealth=telehealth,
+        lat=lat,
+        lng=lng,
+        radius_km=radius_km,
+        sort=sort,
+        page=page,
+        limit=limit,
+        cursor=cursor,
+        count=count
+    )
+
+
+def _search_doctors(
+    db: Session,
+    q: Optional[str],
+    specialization: Optional[str],
+    location: Optional[str],
+    rating: Optional[float],
+    verified: Optional[bool],
+    medicalAid: Optional[bool],
+    telehealth: Optional[bool],
+    lat: Optional[float],
+    lng: Optional[float],
+    radius_km: float,
+    sort: str,
+    page: int,
+    limit: int,
+    cursor: Optional[str],
+    count: str
+) -> dict:
+    """Doctor search on a sync Session (run via AsyncSession.run_sync)"""
+    if (lat is None) != (lng is None):
+        return {
+            "success": False,
+            "error": "lat and lng must be given together"
+        }
+    if sort == "distance" and lat is None:
+        return {
+            "success": False,
+            "error": "sort=distance requires lat and lng"
+        }
+    
     query = db.query(Doctor)
+    relevance = None
+    keyset = DOCTOR_KEYSET
+    distance = None
     
     # Build filters
     if q:
-        search_term = f"%{q.lower()}%"
-        query = query.filter(
-            or_(
-                func.lower(Doctor.display_name).like(search_term),
-                func.lower(Doctor.specialization).like(search_term),
-                func.lower(Doctor.practice_city).like(search_term),
-                func.lower(Doctor.practice_name).like(search_term)
-            )
-        )
+        # Full-text index when available, LIKE scan otherwise
+        query, relevance = apply_doctor_text_search(query, db, q)
     
     if specialization:
         query = query.filter(Doctor.specialization.ilike(f"%{specialization}%"))
@@ -59,7 +143,7 @@ async def search_doctors(
         query = query.filter(Doctor.rating_avg >= rating)
     
     if verified:
-        query = query.filter(Doctor.verification_status == "verified")
+        query = query.filter(Doctor.verification_status == VerificationStatus.VERIFIED)
     
     if medicalAid:
         query = query.filter(Doctor.accepts_medical_aid == True)
@@ -67,20 +151,34 @@ async def search_doctors(
     if telehealth:
         query = query.filter(Doctor.telehealth_available == True)
     
-    # Get total count
-    total = query.count()
+    if lat is not None:
+        # Spatial index prefilter + exact distance; rows become (Doctor, distance_km)
+        query, distance = apply_geo_filter(query, db, Doctor, lat, lng, radius_km)
+        query = query.add_columns(distance.label("distance_km"))
+        by_plan, by_distance = _geo_keysets(distance)
+        keyset = by_distance if sort == "distance" else by_plan
     
-    # Sort: Premium (promoted) first, then by rating
-    # Premium = 3, Standard = 2, Free = 1 (based on enum values)
-    query = query.order_by(
-        Doctor.subscription_plan.desc(),  # Premium > Standard > Free
-        Doctor.rating_avg.desc(),
-        Doctor.total_reviews.desc()
-    )
+    # Get total count (exact, estimated or skipped)
+    total = count_results(query, count)
     
-    # Pagination
-    offset = (page - 1) * limit
-    doctors = query.offset(offset).limit(limit).all()
+    # Sort: Premium (promoted) first, then by relevance (text search), then by rating
+    # (sort=distance: nearest first)
+    order_by = None
+    if relevance is not None and sort != "distance":
+        order_by = [DOCTOR_PLAN_TIER.desc(), relevance, *keyset.order_by()]
+    
+    # Pagination (offset by page, or keyset after cursor)
+    try:
+        result_page = paginate(query, keyset, limit, page=page, cursor=cursor, order_by=order_by)
+    except InvalidCursorError:
+        return {
+            "success": False,
+            "error": "Invalid cursor"
+        }
+    if distance is not None:
+        rows = [(row[0], row.distance_km) for row in result_page.items]
+    else:
+        rows = [(d, None) for d in result_page.items]
     
     return {
         "success": True,
@@ -93,21 +191,24 @@ async def search_doctors(
                     "location": f"{d.practice_city}, {d.practice_province}",
                     "rating": float(d.rating_avg) if d.rating_avg else 0.0,
                     "totalReviews": d.total_reviews,
-                    "verified": d.verification_status == "verified",
+                    "verified": d.verification_status == VerificationStatus.VERIFIED,
                     "promoted": d.subscription_plan == SubscriptionPlan.PREMIUM,
                     "medicalAid": d.accepts_medical_aid,
                     "telehealth": d.telehealth_available,
                     "phone": d.phone,
                     "practiceName": d.practice_name,
+                    "distanceKm": round(distance_km, 2) if distance_km is not None else None,
                 }
-                for d in doctors
+                for d, distance_km in rows
             ],
             "pagination": {
                 "page": page,
                 "limit": limit,
                 "total": total,
-                "totalPages": (total + limit - 1) // limit
-            }
+                "totalPages": total_pages(total, limit),
+                "hasMore": result_page.has_more
+            },
+            "nextCursor": result_page.next_cursor
         }
     }
 
@@ -115,10 +216,19 @@ async def search_doctors(
 @router.get("/{doctor_id}")
 async def get_doctor(
     doctor_id: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get doctor details by ID"""
-    doctor = db.query(Doctor).filter(Doctor.id == doctor_id).first()
+    """
+    Get doctor details by ID
+    Served from the profile cache (invalidated on writes); supports If-None-Match
+    """
+    return await cached_profile_response(request, "doctor", doctor_id, lambda: _load_doctor(db, doctor_id))
+
+
+async def _load_doctor(db: AsyncSession, doctor_id: str) -> dict:
+    result = await db.execute(select(Doctor).where(Doctor.id == doctor_id))
+    doctor = result.scalars().first()
     
     if not doctor:
         return {
@@ -139,7 +249,7 @@ async def get_doctor(
             },
             "rating": float(doctor.rating_avg) if doctor.rating_avg else 0.0,
             "totalReviews": doctor.total_reviews,
-            "verified": doctor.verification_status == "verified",
+            "verified": doctor.verification_status == VerificationStatus.VERIFIED,
             "promoted": doctor.subscription_plan == SubscriptionPlan.PREMIUM,
             "medicalAid": doctor.accepts_medical_aid,
             "telehealth": doctor.telehealth_available,
@@ -178,6 +288,7 @@ async def promote_doctor(
     else:
         doctor.subscription_plan = SubscriptionPlan.FREE
     
+    invalidate_profile_after_commit(db, "doctor", doctor.id)
     db.commit()
     
     return {
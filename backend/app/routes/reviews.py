@@ -1,13 +1,17 @@
 """
 Review Routes
 """
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user
 from app.models import User
 from app.services.review_validity_service import ReviewValidityService, get_review_validity_service
 from app.services.ai_service import AIService, get_ai_service
+from app.services.review_service_enhanced import get_enhanced_review_service
+from app.utils.pagination import COUNT_MODE_PATTERN
 from app.middleware.rate_limit import general_rate_limit
 
 router = APIRouter()
@@ -41,22 +45,22 @@ async def create_review(
 @router.get("")
 @general_rate_limit
 async def get_reviews(
-    doctor_id: str = None,
-    verified_only: bool = False,
-    page: int = 1,
-    limit: int = 20,
-    db: Session = Depends(get_db)
+    doctor_id: str,
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    sort: str = Query("recent", pattern="^(recent|rating_high|rating_low)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; empty string starts cursor mode"),
+    count: str = Query("exact", pattern=COUNT_MODE_PATTERN, description="exact, estimate or none (skip the total)"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get reviews for doctor"""
-    from app.services.review_service import ReviewService, get_review_service
-    
-    review_service = get_review_service(db)
-    result = review_service.get_doctor_reviews(
-        doctor_id=doctor_id,
-        verified_only=verified_only,
-        page=page,
-        limit=limit
+    return await db.run_sync(
+        lambda session: get_enhanced_review_service(session).get_doctor_reviews(
+            doctor_id=doctor_id,
+            page=page,
+            limit=limit,
+            sort=sort,
+            cursor=cursor,
+            count_mode=count
+        )
     )
-    
-    return result
-
@@ -3,21 +3,91 @@ AI Service - OpenAI Integration
 Symptom checker, review classification, auto-reply suggestions
 """
 import os
+import copy
 import json
-import openai
+import hashlib
+import logging
 from typing import Dict, List, Optional
+from app.adapters.openai_adapter import AsyncOpenAIAdapter, get_openai_adapter, openai
 from app.config.prompts import PROMPTS
+from app.utils.cache import TTLCache, get_redis_client
+from app.utils.metrics import track_outbound
+
+logger = logging.getLogger(__name__)
+
+SYMPTOM_CHECKER_MODEL = "gpt-4"
+REVIEW_CLASSIFIER_MODEL = "gpt-3.5-turbo"
+AUTO_REPLY_MODEL = "gpt-3.5-turbo"
+
+AUTO_REPLY_FALLBACK = "Thank you for your inquiry. We will get back to you soon."
+
+# Review classifications keyed by content hash (in-process tier, then Redis)
+CLASSIFICATION_CACHE_TTL_SECONDS = int(os.getenv("AI_CLASSIFICATION_CACHE_TTL", "86400"))
+CLASSIFICATION_CACHE_MAX_ENTRIES = int(os.getenv("AI_CLASSIFICATION_CACHE_SIZE", "2048"))
+CLASSIFICATION_CACHE_PREFIX = "ai:review_classification:"
+
+classification_cache = TTLCache(CLASSIFICATION_CACHE_TTL_SECONDS, CLASSIFICATION_CACHE_MAX_ENTRIES)
+
+
+def _classification_key(comment: str) -> str:
+    """Content hash of a comment plus everything that changes the classifier's answer"""
+    normalized = " ".join(comment.split())
+    digest = hashlib.sha256(
+        f"{REVIEW_CLASSIFIER_MODEL}|{PROMPTS['review_classifier']}|{normalized}".encode("utf-8")
+    ).hexdigest()
+    return CLASSIFICATION_CACHE_PREFIX + digest
 
 
 class AIService:
-    """AI service for medical assistance and review analysis"""
+    """
+    AI service for medical assistance and review analysis
     
-    def __init__(self):
+    The *_async methods use the shared non-blocking OpenAI client and are the
+    ones to call from async request handlers; the sync methods are kept for
+    sync callers. Both fall back to the mock responses on any error.
+    """
+    
+    def __init__(self, openai_adapter: Optional[AsyncOpenAIAdapter] = None):
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.mock_mode = os.getenv("OPENAI_MOCK_MODE", "false").lower() == "true"
+        self.openai_adapter = openai_adapter or get_openai_adapter()
+    
+    # Symptom checker
+    
+    def _symptom_messages(self, symptoms: str, duration: Optional[str], severity: Optional[str]) -> List[Dict]:
+        prompt = PROMPTS["symptom_checker"].format(
+            symptoms=symptoms,
+            duration=duration or "Not specified",
+            severity=severity or "Not specified"
+        )
+        return [
+            {
+                "role": "system",
+                "content": "You are a medical triage assistant for South Africa. Always recommend consulting qualified medical professionals. This is informational only."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _symptom_result(self, content: str, symptoms: str) -> Dict:
+        # Parse JSON response
+        try:
+            result = json.loads(content)
+        except:
+            # Fallback parsing
+            result = self._parse_symptom_response(content)
+        
+        # Add disclaimer
+        result["disclaimer"] = "This is not medical advice. Please consult a qualified medical professional."
+        
+        # Check for red flags
+        if self._check_red_flags(symptoms):
+            result["immediate_action"] = "emergency"
+            result["urgent_message"] = "Please seek immediate medical attention or call emergency services."
         
-        if not self.mock_mode and self.api_key:
-            openai.api_key = self.api_key
+        return result
     
     def suggest_specialty_from_symptoms(
         self,
@@ -32,97 +102,190 @@ class AIService:
         - specialties: List of {name, confidence}
         - immediate_action: {home_care, emergency}
         """
-        prompt = PROMPTS["symptom_checker"].format(
-            symptoms=symptoms,
-            duration=duration or "Not specified",
-            severity=severity or "Not specified"
-        )
+        if self.mock_mode:
+            return self._mock_symptom_analysis(symptoms)
         
+        try:
+            with track_outbound("openai"):
+                response = openai.ChatCompletion.create(
+                    api_key=self.api_key,
+                    model=SYMPTOM_CHECKER_MODEL,
+                    messages=self._symptom_messages(symptoms, duration, severity),
+                    temperature=0.3,
+                    max_tokens=500
+                )
+            return self._symptom_result(response.choices[0].message.content, symptoms)
+            
+        except Exception as e:
+            # Fallback to mock on error
+            return self._mock_symptom_analysis(symptoms)
+    
+    async def suggest_specialty_from_symptoms_async(
+        self,
+        symptoms: str,
+        duration: Optional[str] = None,
+        severity: Optional[str] = None
+    ) -> Dict:
+        """Non-blocking suggest_specialty_from_symptoms"""
         if self.mock_mode:
             return self._mock_symptom_analysis(symptoms)
         
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a medical triage assistant for South Africa. Always recommend consulting qualified medical professionals. This is informational only."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+            content = await self.openai_adapter.chat_completion(
+                model=SYMPTOM_CHECKER_MODEL,
+                messages=self._symptom_messages(symptoms, duration, severity),
                 temperature=0.3,
                 max_tokens=500
             )
+            return self._symptom_result(content, symptoms)
             
-            content = response.choices[0].message.content
-            
-            # Parse JSON response
-            try:
-                result = json.loads(content)
-            except:
-                # Fallback parsing
-                result = self._parse_symptom_response(content)
-            
-            # Add disclaimer
-            result["disclaimer"] = "This is not medical advice. Please consult a qualified medical professional."
-            
-            # Check for red flags
-            if self._check_red_flags(symptoms):
-                result["immediate_action"] = "emergency"
-                result["urgent_message"] = "Please seek immediate medical attention or call emergency services."
-            
-            return result
-            
-        except Exception as e:
-            # Fallback to mock on error
+        except Exception:
+            # Fallback to mock on error or timeout (cancellation propagates)
+            logger.warning("Symptom analysis failed; using the mock result", exc_info=True)
             return self._mock_symptom_analysis(symptoms)
     
+    # Review classification
+    
+    def _review_messages(self, comment: str) -> List[Dict]:
+        prompt = PROMPTS["review_classifier"].format(comment=comment)
+        return [
+            {
+                "role": "system",
+                "content": "You are a review classification system. Analyze medical reviews for sentiment and categories."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _review_result(self, content: str) -> Dict:
+        try:
+            return json.loads(content)
+        except:
+            return self._parse_review_response(content)
+    
     def classify_review(self, comment: str) -> Dict:
         """
         Classify review sentiment and categories
         
+        Results are cached by content hash (in-process LRU, plus Redis when
+        REDIS_URL is set), so identical comments cost one model call.
+        
         Returns:
         - sentiment: positive, negative, neutral
         - categories: List of categories
         - sentiment_score: 0-1
         """
-        prompt = PROMPTS["review_classifier"].format(comment=comment)
+        key = _classification_key(comment)
+        cached = self._get_cached_classification(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        result = self._classify_review_uncached(comment)
+        return self._store_classification(key, comment, result)
+    
+    async def classify_review_async(self, comment: str) -> Dict:
+        """Non-blocking classify_review (shares its cache)"""
+        key = _classification_key(comment)
+        cached = self._get_cached_classification(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        result = await self._classify_review_uncached_async(comment)
+        return self._store_classification(key, comment, result)
+    
+    def _store_classification(self, key: str, comment: str, result: Optional[Dict]) -> Dict:
+        if result is None:
+            # Model call failed: serve the fallback without caching it
+            return self._mock_review_classification(comment)
         
+        self._set_cached_classification(key, result)
+        return copy.deepcopy(result)
+    
+    def _classify_review_uncached(self, comment: str) -> Optional[Dict]:
+        """One classification round-trip (None if the model call failed)"""
         if self.mock_mode:
             return self._mock_review_classification(comment)
         
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a review classification system. Analyze medical reviews for sentiment and categories."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+            with track_outbound("openai"):
+                response = openai.ChatCompletion.create(
+                    api_key=self.api_key,
+                    model=REVIEW_CLASSIFIER_MODEL,
+                    messages=self._review_messages(comment),
+                    temperature=0.1,
+                    max_tokens=200
+                )
+            return self._review_result(response.choices[0].message.content)
+            
+        except Exception as e:
+            return None
+    
+    async def _classify_review_uncached_async(self, comment: str) -> Optional[Dict]:
+        if self.mock_mode:
+            return self._mock_review_classification(comment)
+        
+        try:
+            content = await self.openai_adapter.chat_completion(
+                model=REVIEW_CLASSIFIER_MODEL,
+                messages=self._review_messages(comment),
                 temperature=0.1,
                 max_tokens=200
             )
+            return self._review_result(content)
             
-            content = response.choices[0].message.content
-            
-            try:
-                result = json.loads(content)
-            except:
-                result = self._parse_review_response(content)
-            
+        except Exception:
+            logger.warning("Review classification failed", exc_info=True)
+            return None
+    
+    def _get_cached_classification(self, key: str) -> Optional[Dict]:
+        result = classification_cache.get(key)
+        if result is not None:
             return result
-            
-        except Exception as e:
-            return self._mock_review_classification(comment)
+        
+        client = get_redis_client()
+        if client is None:
+            return None
+        try:
+            raw = client.get(key)
+        except Exception:
+            logger.warning("Classification cache read failed", exc_info=True)
+            return None
+        if raw is None:
+            return None
+        result = json.loads(raw)
+        classification_cache.set(key, result)
+        return result
+    
+    def _set_cached_classification(self, key: str, result: Dict):
+        classification_cache.set(key, copy.deepcopy(result))
+        
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            client.set(key, json.dumps(result), ex=CLASSIFICATION_CACHE_TTL_SECONDS)
+        except Exception:
+            logger.warning("Classification cache write failed", exc_info=True)
+    
+    # Auto-reply
+    
+    def _auto_reply_messages(self, patient_inquiry: str, doctor_specialization: str) -> List[Dict]:
+        prompt = PROMPTS["auto_reply"].format(
+            inquiry=patient_inquiry,
+            specialization=doctor_specialization
+        )
+        return [
+            {
+                "role": "system",
+                "content": "You are a professional medical assistant. Generate professional, helpful responses for patient inquiries."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
     
     def suggest_auto_reply(
         self,
@@ -134,35 +297,45 @@ class AIService:
         
         Returns suggested reply text
         """
-        prompt = PROMPTS["auto_reply"].format(
-            inquiry=patient_inquiry,
-            specialization=doctor_specialization
-        )
+        if self.mock_mode:
+            return AUTO_REPLY_FALLBACK
         
+        try:
+            with track_outbound("openai"):
+                response = openai.ChatCompletion.create(
+                    api_key=self.api_key,
+                    model=AUTO_REPLY_MODEL,
+                    messages=self._auto_reply_messages(patient_inquiry, doctor_specialization),
+                    temperature=0.7,
+                    max_tokens=200
+                )
+            
+            return response.choices[0].message.content.strip()
+            
+        except Exception as e:
+            return AUTO_REPLY_FALLBACK
+    
+    async def suggest_auto_reply_async(
+        self,
+        patient_inquiry: str,
+        doctor_specialization: str
+    ) -> str:
+        """Non-blocking suggest_auto_reply"""
         if self.mock_mode:
-            return "Thank you for your inquiry. We will get back to you soon."
+            return AUTO_REPLY_FALLBACK
         
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional medical assistant. Generate professional, helpful responses for patient inquiries."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+            content = await self.openai_adapter.chat_completion(
+                model=AUTO_REPLY_MODEL,
+                messages=self._auto_reply_messages(patient_inquiry, doctor_specialization),
                 temperature=0.7,
                 max_tokens=200
             )
+            return content.strip()
             
-            return response.choices[0].message.content.strip()
-            
-        except Exception as e:
-            return "Thank you for your inquiry. We will get back to you soon."
+        except Exception:
+            logger.warning("Auto-reply suggestion failed; using the fallback", exc_info=True)
+            return AUTO_REPLY_FALLBACK
     
     def _check_red_flags(self, symptoms: str) -> bool:
         """Check for emergency red flag symptoms"""
@@ -241,6 +414,7 @@ class AIService:
 
 # Factory function
 def get_ai_service() -> AIService:
-    """Factory function for dependency injection"""
-    return AIService()
+    """Process-wide service (see app.container)"""
+    from app.container import get_container
+    return get_container().ai_service
 
@@ -2,6 +2,7 @@
 Authentication Service
 JWT + Firebase Auth integration
 """
+import logging
 import os
 try:
     import jwt
@@ -12,53 +13,30 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict
 from sqlalchemy.orm import Session
 from app.models.enhanced_models import User, UserRole, VerificationStatus
+from app.utils.lazy_imports import lazy_import
 
-# Optional Firebase - only import if available
-try:
-    from firebase_admin import auth as firebase_auth
-    import firebase_admin
-    FIREBASE_AVAILABLE = True
-except ImportError:
-    FIREBASE_AVAILABLE = False
+# Optional Firebase - imported on the first Firebase login, if installed
+firebase_admin = lazy_import("firebase_admin", "firebase-admin")
+firebase_auth = lazy_import("firebase_admin.auth", "firebase-admin")
+FIREBASE_AVAILABLE = firebase_admin.available
 
-from passlib.context import CryptContext
-import bcrypt
+from app.utils.passwords import get_password_hasher, PasswordHasherBusyError
 
-# Use bcrypt directly to avoid passlib version issues
-def hash_password(password: str) -> str:
-    """Hash password using bcrypt"""
-    # Truncate password if too long (bcrypt limit is 72 bytes)
-    if len(password) > 72:
-        password = password[:72]
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+logger = logging.getLogger(__name__)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify password against hash"""
-    # Truncate password if too long
-    if len(plain_password) > 72:
-        plain_password = plain_password[:72]
-    try:
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
-    except Exception:
-        return False
+JWT_ALGORITHM = "HS256"
 
-# Use direct bcrypt instead of passlib to avoid version compatibility issues
-# Keep passlib as fallback only if bcrypt is not available
-try:
-    import bcrypt
-    # Test bcrypt works
-    test_hash = bcrypt.hashpw(b"test", bcrypt.gensalt())
-    USE_PASSLIB = False  # Use direct bcrypt
-    pwd_context = None
-except Exception as e:
-    print(f"Warning: bcrypt not available, trying passlib: {e}")
+
+def decode_token(token: str) -> Optional[Dict]:
+    """JWT payload, or None if the token is invalid or expired"""
     try:
-        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        USE_PASSLIB = True
-    except Exception:
-        USE_PASSLIB = False
-        pwd_context = None
+        return jwt.decode(
+            token,
+            os.getenv("JWT_SECRET", "your-secret-key"),
+            algorithms=[JWT_ALGORITHM]
+        )
+    except jwt.InvalidTokenError:
+        return None
 
 
 class AuthService:
@@ -67,20 +45,21 @@ class AuthService:
     def __init__(self, db: Session):
         self.db = db
         self.jwt_secret = os.getenv("JWT_SECRET", "your-secret-key")
-        self.jwt_algorithm = "HS256"
+        self.jwt_algorithm = JWT_ALGORITHM
         self.jwt_expiry = timedelta(hours=24)
         self.refresh_expiry = timedelta(days=30)
-        
-        # Initialize Firebase if not already initialized
-        if FIREBASE_AVAILABLE:
-            try:
-                firebase_admin.get_app()
-            except ValueError:
-                if os.getenv("FIREBASE_CREDENTIALS_PATH"):
-                    cred = firebase_admin.credentials.Certificate(
-                        os.getenv("FIREBASE_CREDENTIALS_PATH")
-                    )
-                    firebase_admin.initialize_app(cred)
+    
+    @staticmethod
+    def _init_firebase():
+        """Initialize the default Firebase app if not already initialized"""
+        try:
+            firebase_admin.get_app()
+        except ValueError:
+            if os.getenv("FIREBASE_CREDENTIALS_PATH"):
+                cred = firebase_admin.credentials.Certificate(
+                    os.getenv("FIREBASE_CREDENTIALS_PATH")
+                )
+                firebase_admin.initialize_app(cred)
     
     def register_user(
         self,
@@ -90,8 +69,38 @@ class AuthService:
         password: str,
         role: str = "patient"
     ) -> Dict:
-        """Register new user"""
-        # Check if user exists
+        """Register new user (blocking; prefer register_user_async from async routes)"""
+        error = self._check_user_available(email, phone)
+        if error:
+            return error
+
+        try:
+            password_hash = get_password_hasher().hash_sync(password)
+        except PasswordHasherBusyError:
+            return self._busy_error()
+        return self._create_user(email, phone, full_name, password_hash, role)
+
+    async def register_user_async(
+        self,
+        email: str,
+        phone: str,
+        full_name: str,
+        password: str,
+        role: str = "patient"
+    ) -> Dict:
+        """Register new user, hashing on the password thread pool"""
+        error = self._check_user_available(email, phone)
+        if error:
+            return error
+
+        try:
+            password_hash = await get_password_hasher().hash(password)
+        except PasswordHasherBusyError:
+            return self._busy_error()
+        return self._create_user(email, phone, full_name, password_hash, role)
+
+    def _check_user_available(self, email: str, phone: str) -> Optional[Dict]:
+        """Error dict if a user with this email or phone exists"""
         existing_user = self.db.query(User).filter(
             (User.email == email) | (User.phone == phone)
         ).first()
@@ -101,14 +110,17 @@ class AuthService:
                 "success": False,
                 "error": "User with this email or phone already exists"
             }
-        
-        # Hash password
-        if USE_PASSLIB:
-            password_hash = pwd_context.hash(password)
-        else:
-            password_hash = hash_password(password)
-        
-        # Create user
+        return None
+
+    def _create_user(
+        self,
+        email: str,
+        phone: str,
+        full_name: str,
+        password_hash: str,
+        role: str
+    ) -> Dict:
+        """Persist user and issue tokens"""
         try:
             user = User(
                 email=email,
@@ -124,12 +136,7 @@ class AuthService:
             self.db.refresh(user)
         except Exception as e:
             self.db.rollback()
-            import traceback
-            import sys
-            error_trace = traceback.format_exc()
-            print(f"[ERROR] Error creating user: {e}", flush=True)
-            print(error_trace, flush=True)
-            sys.stdout.flush()
+            logger.exception("Error creating user")
             return {
                 "success": False,
                 "error": f"Failed to create user: {str(e)}"
@@ -153,35 +160,70 @@ class AuthService:
         }
     
     def login_user(self, email: str, password: str) -> Dict:
-        """User login with email/password - requires ID verification"""
+        """User login with email/password (blocking; prefer login_user_async from async routes)"""
+        user, error = self._find_login_user(email)
+        if error:
+            return error
+
+        hasher = get_password_hasher()
+        try:
+            password_valid = hasher.verify_sync(password, user.password_hash)
+            new_hash = None
+            if password_valid and hasher.needs_rehash(user.password_hash):
+                new_hash = hasher.hash_sync(password)
+        except PasswordHasherBusyError:
+            return self._busy_error()
+        return self._complete_login(user, password_valid, new_hash)
+
+    async def login_user_async(self, email: str, password: str) -> Dict:
+        """User login, verifying (and upgrading) the hash on the password thread pool"""
+        user, error = self._find_login_user(email)
+        if error:
+            return error
+
+        hasher = get_password_hasher()
+        try:
+            password_valid = await hasher.verify(password, user.password_hash)
+            new_hash = None
+            if password_valid and hasher.needs_rehash(user.password_hash):
+                new_hash = await hasher.hash(password)
+        except PasswordHasherBusyError:
+            return self._busy_error()
+        return self._complete_login(user, password_valid, new_hash)
+
+    def _find_login_user(self, email: str):
+        """(user, None) or (None, error dict)"""
         user = self.db.query(User).filter(User.email == email).first()
         
         if not user:
-            return {
+            return None, {
                 "success": False,
                 "error": "Invalid email or password"
             }
         
         if not user.password_hash:
-            return {
+            return None, {
                 "success": False,
                 "error": "Password authentication not available. Please use Firebase login."
             }
-        
-        # Verify password
-        if USE_PASSLIB:
-            password_valid = pwd_context.verify(password, user.password_hash)
-        else:
-            password_valid = verify_password(password, user.password_hash)
-        
+        return user, None
+
+    def _complete_login(self, user: User, password_valid: bool, new_hash: Optional[str]) -> Dict:
+        """Login checks after password verification - requires ID verification"""
         if not password_valid:
             return {
                 "success": False,
                 "error": "Invalid email or password"
             }
+
+        # Transparently upgrade hashes made with an old work factor
+        if new_hash:
+            user.password_hash = new_hash
         
         # Check if user has verified ID (required for login)
         if not user.verified or not user.id_number:
+            if new_hash:
+                self.db.commit()
             return {
                 "success": False,
                 "requires_verification": True,
@@ -209,6 +251,13 @@ class AuthService:
                 **tokens
             }
         }
+
+    def _busy_error(self) -> Dict:
+        return {
+            "success": False,
+            "busy": True,
+            "error": "Authentication is busy. Please try again shortly."
+        }
     
     def verify_login_id(
         self,
@@ -217,7 +266,7 @@ class AuthService:
         id_document_url: Optional[str] = None
     ) -> Dict:
         """Verify user ID during login process"""
-        from app.adapters.user_verification_adapter import UserVerificationAdapter
+        from app.adapters.user_verification_adapter import get_user_verification_adapter
         from app.models.enhanced_models import UserVerification
         import uuid
         
@@ -237,8 +286,8 @@ class AuthService:
                 "error": "User not found"
             }
         
-        # Initialize verification adapter (cached for performance)
-        verification_adapter = UserVerificationAdapter()
+        # Shared adapter (pooled HTTP session)
+        verification_adapter = get_user_verification_adapter()
         
         # Perform verification (optimized - minimal data passed)
         verification_result = verification_adapter.verify_user(
@@ -317,6 +366,7 @@ class AuthService:
             }
         
         try:
+            self._init_firebase()
             # Verify Firebase token
             decoded_token = firebase_auth.verify_id_token(firebase_token)
             firebase_uid = decoded_token.get("uid")
@@ -0,0 +1,251 @@
+"""
+Geo Index Service
+Spatial index and "near me" filtering for doctors and hospitals
+(PostGIS geography/GIST on PostgreSQL, R*Tree on SQLite)
+"""
+import logging
+import math
+import sqlite3
+import weakref
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import and_, column, event, func, inspect, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query, Session
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.045
+
+# Tables with latitude/longitude columns that get a spatial index
+GEO_TABLES = ["doctors", "hospitals"]
+
+# Cache of {table: index present} per engine, so search does not inspect the schema per request
+_index_state: "weakref.WeakKeyDictionary[Engine, Dict[str, bool]]" = weakref.WeakKeyDictionary()
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> Optional[float]:
+    """Great-circle distance in km (None if any coordinate is missing)"""
+    if lat1 is None or lng1 is None or lat2 is None or lng2 is None:
+        return None
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+@event.listens_for(Engine, "connect")
+def _register_sqlite_functions(dbapi_connection, connection_record):
+    """Expose haversine_km() to SQLite so distance can be filtered and sorted in SQL"""
+    # aiosqlite connections arrive wrapped in SQLAlchemy's sync adapter
+    if isinstance(dbapi_connection, sqlite3.Connection) or (
+        type(dbapi_connection).__name__ == "AsyncAdapt_aiosqlite_connection"
+    ):
+        dbapi_connection.create_function("haversine_km", 4, haversine_km, deterministic=True)
+
+
+def _rtree_table(table_name: str) -> str:
+    return f"{table_name}_geo"
+
+
+def _rtree_keys_table(table_name: str) -> str:
+    return f"{table_name}_geo_keys"
+
+
+def _postgres_ddl(table_name: str) -> list:
+    # Expression index matching _postgis_point(); no extra column to keep in sync
+    return [
+        f"CREATE INDEX IF NOT EXISTS idx_{table_name}_geog ON {table_name} USING GIST "
+        f"((geography(ST_SetSRID(ST_MakePoint(longitude, latitude), 4326))))",
+    ]
+
+
+def _sqlite_ddl(table_name: str) -> list:
+    # The indexed tables have TEXT primary keys, so their rowids are implicit
+    # and VACUUM or a table rebuild may renumber them; R*Tree entries are keyed
+    # through their own INTEGER PRIMARY KEY table instead, which keeps its values
+    rtree = _rtree_table(table_name)
+    keys = _rtree_keys_table(table_name)
+    has_point = "new.latitude IS NOT NULL AND new.longitude IS NOT NULL"
+    insert_point = (
+        f"INSERT OR REPLACE INTO {rtree}(id, min_lat, max_lat, min_lng, max_lng) "
+        f"SELECT key, new.latitude, new.latitude, new.longitude, new.longitude FROM {keys} "
+        f"WHERE id = new.id AND {has_point}"
+    )
+    key_of = f"(SELECT key FROM {keys} WHERE id = {{}}.id)"
+    return [
+        f"CREATE TABLE IF NOT EXISTS {keys} (key INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE)",
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {rtree} USING rtree(id, min_lat, max_lat, min_lng, max_lng)",
+        f"CREATE TRIGGER IF NOT EXISTS {rtree}_ai AFTER INSERT ON {table_name} BEGIN "
+        f"INSERT OR IGNORE INTO {keys}(id) VALUES (new.id); {insert_point}; END",
+        f"CREATE TRIGGER IF NOT EXISTS {rtree}_ad AFTER DELETE ON {table_name} BEGIN "
+        f"DELETE FROM {rtree} WHERE id = {key_of.format('old')}; "
+        f"DELETE FROM {keys} WHERE id = old.id; END",
+        f"CREATE TRIGGER IF NOT EXISTS {rtree}_au AFTER UPDATE OF id, latitude, longitude ON {table_name} BEGIN "
+        f"UPDATE {keys} SET id = new.id WHERE id = old.id; "
+        f"DELETE FROM {rtree} WHERE id = {key_of.format('new')}; {insert_point}; END",
+        # (Re)index every row; also repairs the index after a table rebuild dropped the triggers
+        f"INSERT OR IGNORE INTO {keys}(id) SELECT id FROM {table_name}",
+        f"DELETE FROM {rtree}",
+        f"INSERT INTO {rtree}(id, min_lat, max_lat, min_lng, max_lng) "
+        f"SELECT {keys}.key, latitude, latitude, longitude, longitude "
+        f"FROM {table_name} JOIN {keys} ON {keys}.id = {table_name}.id "
+        f"WHERE latitude IS NOT NULL AND longitude IS NOT NULL",
+    ]
+
+
+def geo_index_ddl(dialect: str, table_name: str) -> list:
+    """Statements that create the spatial index for a table ([] if the dialect has none)"""
+    if dialect == "postgresql":
+        return _postgres_ddl(table_name)
+    if dialect == "sqlite":
+        return _sqlite_ddl(table_name)
+    return []
+
+
+def drop_geo_index_ddl(dialect: str, table_name: str) -> list:
+    """Statements that remove the spatial index for a table"""
+    if dialect == "postgresql":
+        return [f"DROP INDEX IF EXISTS idx_{table_name}_geog"]
+    if dialect == "sqlite":
+        rtree = _rtree_table(table_name)
+        return [
+            *(f"DROP TRIGGER IF EXISTS {rtree}_{suffix}" for suffix in ("ai", "ad", "au")),
+            f"DROP TABLE IF EXISTS {rtree}",
+            f"DROP TABLE IF EXISTS {_rtree_keys_table(table_name)}",
+        ]
+    return []
+
+
+def ensure_geo_indexes(engine: Engine) -> bool:
+    """
+    Create spatial indexes for every GEO_TABLES table that exists
+
+    PostgreSQL: GIST index on the PostGIS geography of (longitude, latitude)
+    SQLite: R*Tree table kept in sync by triggers
+    Returns True when all existing tables are indexed afterwards.
+    """
+    state = _index_state.setdefault(engine, {})
+    dialect = engine.dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        return False
+
+    inspector = inspect(engine)
+    ok = True
+    for table_name in GEO_TABLES:
+        if not inspector.has_table(table_name):
+            continue
+        statements = geo_index_ddl(dialect, table_name)
+        try:
+            with engine.begin() as conn:
+                for statement in statements:
+                    conn.execute(text(statement))
+            state[table_name] = True
+        except Exception as e:
+            logger.warning("spatial index for %s not created: %s", table_name, e)
+            state[table_name] = False
+            ok = False
+    return ok
+
+
+def has_geo_index(db: Session, table_name: str) -> bool:
+    """Check (once per engine and table) whether the spatial index exists"""
+    engine = db.get_bind().engine
+    state = _index_state.setdefault(engine, {})
+    if table_name in state:
+        return state[table_name]
+
+    try:
+        inspector = inspect(engine)
+        if engine.dialect.name == "postgresql":
+            present = any(
+                ix["name"] == f"idx_{table_name}_geog" for ix in inspector.get_indexes(table_name)
+            )
+        elif engine.dialect.name == "sqlite":
+            present = inspector.has_table(_rtree_table(table_name))
+        else:
+            present = False
+    except Exception:
+        present = False
+
+    state[table_name] = present
+    return present
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> Tuple[float, float, Optional[float], Optional[float]]:
+    """
+    (min_lat, max_lat, min_lng, max_lng) enclosing the search circle
+
+    Longitude bounds are None when the box would wrap the antimeridian or
+    reach a pole; callers then skip the longitude prefilter.
+    """
+    lat_delta = radius_km / KM_PER_DEGREE_LAT
+    min_lat, max_lat = lat - lat_delta, lat + lat_delta
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), None, None
+
+    lng_delta = radius_km / (KM_PER_DEGREE_LAT * math.cos(math.radians(lat)))
+    min_lng, max_lng = lng - lng_delta, lng + lng_delta
+    if min_lng < -180 or max_lng > 180:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, min_lng, max_lng
+
+
+def _postgis_point(model):
+    return func.geography(func.ST_SetSRID(func.ST_MakePoint(model.longitude, model.latitude), 4326))
+
+
+def _sql_haversine_km(model, lat: float, lng: float):
+    """Haversine in plain SQL (PostgreSQL without PostGIS)"""
+    dlat = func.radians(model.latitude - lat) / 2
+    dlng = func.radians(model.longitude - lng) / 2
+    a = (
+        func.power(func.sin(dlat), 2)
+        + func.cos(func.radians(lat)) * func.cos(func.radians(model.latitude)) * func.power(func.sin(dlng), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(a)))
+
+
+def apply_geo_filter(query: Query, db: Session, model, lat: float, lng: float, radius_km: float):
+    """
+    Restrict a query to rows of `model` within radius_km of (lat, lng)
+
+    Returns the filtered query and a distance-in-km expression (for output
+    and sorting). Rows without coordinates never match.
+    """
+    table_name = model.__tablename__
+    dialect = db.get_bind().dialect.name
+    indexed = has_geo_index(db, table_name)
+
+    if dialect == "postgresql" and indexed:
+        origin = func.geography(func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326))
+        point = _postgis_point(model)
+        query = query.filter(func.ST_DWithin(point, origin, radius_km * 1000))
+        return query, func.ST_Distance(point, origin) / 1000
+
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+
+    if dialect == "sqlite" and indexed:
+        # R*Tree bounding-box prefilter
+        rtree = table(_rtree_table(table_name), column("id"), column("min_lat"), column("max_lat"),
+                      column("min_lng"), column("max_lng"))
+        keys = table(_rtree_keys_table(table_name), column("key"), column("id"))
+        query = query.join(keys, keys.c.id == model.id).join(rtree, rtree.c.id == keys.c.key)
+        box = [rtree.c.max_lat >= min_lat, rtree.c.min_lat <= max_lat]
+        if min_lng is not None:
+            box += [rtree.c.max_lng >= min_lng, rtree.c.min_lng <= max_lng]
+    else:
+        # Plain column range prefilter
+        box = [model.latitude.between(min_lat, max_lat)]
+        if min_lng is not None:
+            box.append(model.longitude.between(min_lng, max_lng))
+
+    if dialect == "sqlite":
+        distance = func.haversine_km(model.latitude, model.longitude, lat, lng)
+    else:
+        distance = _sql_haversine_km(model, lat, lng)
+
+    query = query.filter(and_(*box), model.latitude.isnot(None), model.longitude.isnot(None), distance <= radius_km)
+    return query, distance
@@ -5,8 +5,11 @@ Manages hospital claims, verification, promotions, and search
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func
 from app.adapters.payment_adapter import PaymentAdapter, get_payment_adapter
+from app.services.geo_index import apply_geo_filter
+from app.services.profile_cache import invalidate_profile_after_commit
+from app.utils.pagination import InvalidCursorError, Keyset, count_results, paginate, total_pages
 
 # Import hospital models
 try:
@@ -19,6 +22,25 @@ except ImportError:
     HospitalPromotion = None
 
 
+# Cursor sort key: featured first, then by rating (nulls coalesced so keys compare)
+HOSPITAL_KEYSET = Keyset(
+    [
+        (func.coalesce(Hospital.is_featured, False), True),
+        (func.coalesce(Hospital.featured_until, datetime(1970, 1, 1)), True),
+        (func.coalesce(Hospital.rating_avg, 0.0), True),
+        (func.coalesce(Hospital.total_reviews, 0), True),
+        (Hospital.id, True),
+    ],
+    key=lambda h: [
+        bool(h.is_featured),
+        h.featured_until or datetime(1970, 1, 1),
+        h.rating_avg or 0.0,
+        h.total_reviews or 0,
+        str(h.id),
+    ]
+) if Hospital is not None else None
+
+
 class HospitalService:
     """Service for hospital operations"""
     
@@ -34,14 +56,30 @@ class HospitalService:
         rating: Optional[float] = None,
         verified_only: bool = True,
         page: int = 1,
-        limit: int = 20
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact",
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+        radius_km: float = 25,
+        sort: str = "relevance"
     ) -> Dict:
         """
         Search hospitals with filters
         Only claimed & verified hospitals appear by default
         Featured hospitals appear first
+        Pass cursor (nextCursor of the previous page, "" for the first) for keyset pagination
+        count_mode: exact, estimate or none (total is null, use hasMore)
+        lat/lng: only hospitals within radius_km, with distanceKm; sort="distance" for nearest first
         """
+        if (lat is None) != (lng is None):
+            return {"success": False, "error": "lat and lng must be given together"}
+        if sort == "distance" and lat is None:
+            return {"success": False, "error": "sort=distance requires lat and lng"}
+        
         query = self.db.query(Hospital)
+        keyset = HOSPITAL_KEYSET
+        distance = None
         
         # Default: only show claimed and verified
         if verified_only:
@@ -73,20 +111,31 @@ class HospitalService:
         if rating:
             query = query.filter(Hospital.rating_avg >= rating)
         
-        # Get total count
-        total = query.count()
-        
-        # Sort: Featured first, then by rating
-        query = query.order_by(
-            desc(Hospital.is_featured),
-            desc(Hospital.featured_until),
-            desc(Hospital.rating_avg),
-            desc(Hospital.total_reviews)
-        )
-        
-        # Pagination
-        offset = (page - 1) * limit
-        hospitals = query.offset(offset).limit(limit).all()
+        if lat is not None:
+            # Spatial index prefilter + exact distance; rows become (Hospital, distance_km)
+            query, distance = apply_geo_filter(query, self.db, Hospital, lat, lng, radius_km)
+            query = query.add_columns(distance.label("distance_km"))
+            if sort == "distance":
+                keyset = Keyset(
+                    [(distance, False), (Hospital.id, False)],
+                    key=lambda row: [row.distance_km, str(row[0].id)]
+                )
+            else:
+                keyset = Keyset(HOSPITAL_KEYSET.columns, key=lambda row: HOSPITAL_KEYSET.key(row[0]))
+        
+        # Get total count (exact, estimated or skipped)
+        total = count_results(query, count_mode)
+        
+        # Sort: Featured first, then by rating (HOSPITAL_KEYSET), or nearest first
+        # Pagination (offset by page, or keyset after cursor)
+        try:
+            result_page = paginate(query, keyset, limit, page=page, cursor=cursor)
+        except InvalidCursorError:
+            return {"success": False, "error": "Invalid cursor"}
+        if distance is not None:
+            rows = [(row[0], row.distance_km) for row in result_page.items]
+        else:
+            rows = [(h, None) for h in result_page.items]
         
         return {
             "success": True,
@@ -109,15 +158,18 @@ class HospitalService:
                         "emergencyServices": h.emergency_services,
                         "departments": h.departments or [],
                         "specialties": h.specialties or [],
+                        "distanceKm": round(distance_km, 2) if distance_km is not None else None,
                     }
-                    for h in hospitals
+                    for h, distance_km in rows
                 ],
                 "pagination": {
                     "page": page,
                     "limit": limit,
                     "total": total,
-                    "totalPages": (total + limit - 1) // limit
-                }
+                    "totalPages": total_pages(total, limit),
+                    "hasMore": result_page.has_more
+                },
+                "nextCursor": result_page.next_cursor
             }
         }
     
@@ -219,6 +271,7 @@ class HospitalService:
         hospital.claimed_at = datetime.utcnow()
         hospital.verification_status = "in_progress"  # Needs admin verification
         
+        invalidate_profile_after_commit(self.db, "hospital", hospital.id)
         self.db.commit()
         
         return {
@@ -304,6 +357,7 @@ class HospitalService:
         )
         
         self.db.add(promotion)
+        invalidate_profile_after_commit(self.db, "hospital", hospital.id)
         self.db.commit()
         
         # Trigger will update hospital.is_featured
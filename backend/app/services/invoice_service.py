@@ -4,10 +4,12 @@ Generate PDF invoices for subscriptions
 """
 from typing import Dict
 from datetime import datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import inch
 import os
+from app.utils.lazy_imports import lazy_import
+
+# reportlab loads on the first invoice, not at worker start
+pagesizes = lazy_import("reportlab.lib.pagesizes", "reportlab")
+pdfcanvas = lazy_import("reportlab.pdfgen.canvas", "reportlab")
 
 
 class InvoiceService:
@@ -28,7 +30,8 @@ class InvoiceService:
         filepath = os.path.join(self.invoice_dir, filename)
         
         # Create PDF
-        c = canvas.Canvas(filepath, pagesize=letter)
+        letter = pagesizes.letter
+        c = pdfcanvas.Canvas(filepath, pagesize=letter)
         width, height = letter
         
         # Header
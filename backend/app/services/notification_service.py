@@ -4,11 +4,15 @@ SMS (Twilio), Email (SendGrid), Push (FCM)
 """
 import os
 from typing import Dict, Optional
-from twilio.rest import Client as TwilioClient
-import sendgrid
-from sendgrid.helpers.mail import Mail
-from firebase_admin import messaging
-import firebase_admin
+from app.utils.lazy_imports import lazy_import
+from app.utils.metrics import track_outbound
+
+# SDKs load on first send, not at worker start
+twilio_rest = lazy_import("twilio.rest", "twilio")
+sendgrid = lazy_import("sendgrid")
+sendgrid_mail = lazy_import("sendgrid.helpers.mail", "sendgrid")
+firebase_admin = lazy_import("firebase_admin", "firebase-admin")
+firebase_messaging = lazy_import("firebase_admin.messaging", "firebase-admin")
 
 
 class NotificationService:
@@ -22,7 +26,7 @@ class NotificationService:
         self.twilio_client = None
         
         if self.twilio_sid and self.twilio_auth:
-            self.twilio_client = TwilioClient(self.twilio_sid, self.twilio_auth)
+            self.twilio_client = twilio_rest.Client(self.twilio_sid, self.twilio_auth)
         
         # SendGrid
         self.sendgrid_key = os.getenv("SENDGRID_API_KEY")
@@ -31,8 +35,15 @@ class NotificationService:
         
         if self.sendgrid_key:
             self.sendgrid_client = sendgrid.SendGridAPIClient(api_key=self.sendgrid_key)
-        
-        # Firebase (for push notifications)
+    
+    def close(self):
+        """Release the Twilio connection pool"""
+        session = getattr(getattr(self.twilio_client, "http_client", None), "session", None)
+        if session is not None:
+            session.close()
+    
+    def _firebase_messaging(self):
+        """Firebase messaging module, initializing the default app on first push"""
         try:
             firebase_admin.get_app()
         except ValueError:
@@ -41,6 +52,7 @@ class NotificationService:
                 os.getenv("FIREBASE_SERVICE_ACCOUNT_KEY")
             )
             firebase_admin.initialize_app(cred)
+        return firebase_messaging
     
     def send_booking_confirmation(
         self,
@@ -67,11 +79,12 @@ Ref: {appointment_details['booking_reference']}
                     if checkin_code.get('qr_code_data'):
                         message += "\nQR code sent via email."
                 
-                self.twilio_client.messages.create(
-                    body=message,
-                    from_=self.twilio_phone,
-                    to=phone
-                )
+                with track_outbound("twilio"):
+                    self.twilio_client.messages.create(
+                        body=message,
+                        from_=self.twilio_phone,
+                        to=phone
+                    )
                 results["sms"] = True
             except Exception as e:
                 print(f"SMS error: {e}")
@@ -85,14 +98,15 @@ Ref: {appointment_details['booking_reference']}
                     checkin_code
                 )
                 
-                message = Mail(
+                message = sendgrid_mail.Mail(
                     from_email=self.sendgrid_from,
                     to_emails=email,
                     subject=subject,
                     html_content=html_content
                 )
                 
-                self.sendgrid_client.send(message)
+                with track_outbound("sendgrid"):
+                    self.sendgrid_client.send(message)
                 results["email"] = True
             except Exception as e:
                 print(f"Email error: {e}")
@@ -107,11 +121,12 @@ Ref: {appointment_details['booking_reference']}
         if phone and self.twilio_client:
             try:
                 message = f"Your RateTheDoctor verification code: {otp_code}"
-                self.twilio_client.messages.create(
-                    body=message,
-                    from_=self.twilio_phone,
-                    to=phone
-                )
+                with track_outbound("twilio"):
+                    self.twilio_client.messages.create(
+                        body=message,
+                        from_=self.twilio_phone,
+                        to=phone
+                    )
                 results["sms"] = True
             except Exception as e:
                 print(f"SMS error: {e}")
@@ -119,13 +134,14 @@ Ref: {appointment_details['booking_reference']}
         # Email
         if email and self.sendgrid_client:
             try:
-                message = Mail(
+                message = sendgrid_mail.Mail(
                     from_email=self.sendgrid_from,
                     to_emails=email,
                     subject="RateTheDoctor Verification Code",
                     html_content=f"<p>Your verification code is: <strong>{otp_code}</strong></p>"
                 )
-                self.sendgrid_client.send(message)
+                with track_outbound("sendgrid"):
+                    self.sendgrid_client.send(message)
                 results["email"] = True
             except Exception as e:
                 print(f"Email error: {e}")
@@ -141,6 +157,7 @@ Ref: {appointment_details['booking_reference']}
     ) -> bool:
         """Send push notification via FCM"""
         try:
+            messaging = self._firebase_messaging()
             message = messaging.Message(
                 notification=messaging.Notification(
                     title=title,
@@ -189,6 +206,7 @@ Ref: {appointment_details['booking_reference']}
 
 # Factory function
 def get_notification_service() -> NotificationService:
-    """Factory function for dependency injection"""
-    return NotificationService()
+    """Process-wide service (see app.container)"""
+    from app.container import get_container
+    return get_container().notification_service
 
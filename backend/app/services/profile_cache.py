@@ -0,0 +1,245 @@
+"""
+Profile Cache
+Two-tier (in-process LRU, then Redis) cache of public doctor and hospital profiles, with ETags
+"""
+import hashlib
+import itertools
+import json
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.utils.cache import TTLCache, get_redis_client
+from app.utils.replicas import READ_YOUR_WRITES_SECONDS
+
+logger = logging.getLogger(__name__)
+
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "300"))
+PROFILE_CACHE_MAX_ENTRIES = int(os.getenv("PROFILE_CACHE_SIZE", "5000"))
+PROFILE_CACHE_PREFIX = "profile:"
+# Profiles are read from replicas; a fill right after a write may still see
+# the old row there, so fills in this window only live as long as the lag
+PROFILE_CACHE_SETTLE_SECONDS = READ_YOUR_WRITES_SECONDS if os.getenv("DATABASE_REPLICA_URLS") else 0.0
+
+
+@dataclass(frozen=True)
+class CachedProfile:
+    """Serialized response body and its ETag"""
+    body: bytes
+    etag: str
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _normalize_id(entity_id) -> str:
+    """Canonical UUID text, so /doctors/ABC... and /doctors/abc... share (and lose) one entry"""
+    try:
+        return str(uuid.UUID(str(entity_id)))
+    except ValueError:
+        return str(entity_id)
+
+
+class ProfileCache:
+    """
+    Rendered profile responses keyed by (kind, id, version)
+
+    invalidate() moves the entity to a new version rather than deleting
+    entries, so a request that read the row just before a write committed
+    stores its now-stale copy under the old version, where nothing looks.
+    With REDIS_URL set, versions and bodies are shared by all workers and
+    the local tier only saves the Redis payload fetch; without it each
+    process has its own versions and other workers see a write within ttl.
+    """
+
+    def __init__(
+        self,
+        ttl: float = PROFILE_CACHE_TTL,
+        max_entries: int = PROFILE_CACHE_MAX_ENTRIES,
+        settle_seconds: float = PROFILE_CACHE_SETTLE_SECONDS
+    ):
+        self.ttl = ttl
+        self.settle_seconds = settle_seconds
+        self._local = TTLCache(ttl, max_entries)
+        # (kind, id) -> version; process-wide counter so versions are never
+        # reused. Kept past `ttl` so entries filled under the previous
+        # version have expired before it is forgotten
+        self._versions = TTLCache(ttl * 2, max_entries * 4)
+        self._version_counter = itertools.count(1)
+        self._settling = TTLCache(settle_seconds or 1, max_entries)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(*parts) -> str:
+        return PROFILE_CACHE_PREFIX + ":".join(str(part) for part in parts)
+
+    def version(self, kind: str, entity_id: str) -> Optional[int]:
+        """Current version, or None when the shared tier cannot be read (do not cache then)"""
+        client = get_redis_client()
+        if client is None:
+            return self._versions.get((kind, entity_id), 0)
+        try:
+            return int(client.get(self._key("ver", kind, entity_id)) or 0)
+        except Exception as e:
+            logger.warning("profile cache version read failed: %s", e)
+            return None
+
+    def lookup(self, kind: str, entity_id) -> Tuple[Optional[int], Optional[CachedProfile]]:
+        """(version, cached profile or None); fill a miss with store(..., version, ...)"""
+        entity_id = _normalize_id(entity_id)
+        version = self.version(kind, entity_id)
+        if version is None:
+            return None, None
+        key = self._key(kind, entity_id, version)
+        entry = self._local.get(key)
+        if entry is None:
+            entry = self._lookup_shared(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return version, entry
+
+    def _lookup_shared(self, key: str) -> Optional[CachedProfile]:
+        client = get_redis_client()
+        if client is None:
+            return None
+        try:
+            body = client.get(key)
+        except Exception as e:
+            logger.warning("profile cache read failed: %s", e)
+            return None
+        if body is None:
+            return None
+        entry = CachedProfile(body, _etag(body))
+        self._local.set(key, entry)
+        return entry
+
+    def store(self, kind: str, entity_id, version: Optional[int], payload: Dict) -> CachedProfile:
+        """Serialize payload once and cache it under the version seen by lookup()"""
+        body = json.dumps(
+            jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+        entry = CachedProfile(body, _etag(body))
+        if version is None:
+            return entry
+
+        entity_id = _normalize_id(entity_id)
+        key = self._key(kind, entity_id, version)
+        client = get_redis_client()
+        ttl = self.settle_seconds if self._is_settling(client, kind, entity_id) else self.ttl
+        self._local.set(key, entry, ttl=ttl)
+        if client is not None:
+            try:
+                client.set(key, body, ex=max(1, int(ttl)))
+            except Exception as e:
+                logger.warning("profile cache write failed: %s", e)
+        return entry
+
+    def _is_settling(self, client, kind: str, entity_id: str) -> bool:
+        if not self.settle_seconds:
+            return False
+        if self._settling.get((kind, entity_id)):
+            return True
+        if client is None:
+            return False
+        try:
+            return bool(client.exists(self._key("settle", kind, entity_id)))
+        except Exception:
+            return True
+
+    def invalidate(self, kind: str, entity_id):
+        """Move the entity to a new version (call after the write commits)"""
+        entity_id = _normalize_id(entity_id)
+        self._local.delete(self._key(kind, entity_id, self._versions.get((kind, entity_id), 0)))
+        self._versions.set((kind, entity_id), next(self._version_counter))
+        if self.settle_seconds:
+            self._settling.set((kind, entity_id), True, ttl=self.settle_seconds)
+
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline()
+            pipe.incr(self._key("ver", kind, entity_id))
+            if self.settle_seconds:
+                pipe.set(self._key("settle", kind, entity_id), 1, ex=max(1, int(self.settle_seconds)))
+            pipe.execute()
+        except Exception as e:
+            logger.warning("profile cache invalidation failed: %s", e)
+
+    def clear(self):
+        self._local.clear()
+        self._versions.clear()
+        self._settling.clear()
+        self.hits = self.misses = 0
+
+
+profile_cache = ProfileCache()
+
+
+def invalidate_profile_after_commit(session: Session, kind: str, entity_id):
+    """Invalidate the entity's cached profile when `session` commits (dropped on rollback)"""
+    session.info.setdefault("profile_invalidations", set()).add((kind, _normalize_id(entity_id)))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    for kind, entity_id in session.info.pop("profile_invalidations", ()):
+        profile_cache.invalidate(kind, entity_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop("profile_invalidations", None)
+
+
+def _if_none_match(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip() for tag in header.split(",")}
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+async def _call(fn, *args):
+    """Redis calls block; keep them off the event loop (in-process only stays inline)"""
+    if get_redis_client() is None:
+        return fn(*args)
+    return await run_in_threadpool(fn, *args)
+
+
+async def cached_profile_response(
+    request: Request,
+    kind: str,
+    entity_id: str,
+    load: Callable[[], Awaitable[Dict]]
+):
+    """
+    Serve a profile from the cache, loading it on a miss
+
+    `load` builds the response dict; only {"success": True} results are
+    cached, anything else is returned as is. Responses carry an ETag and a
+    matching If-None-Match gets a bodiless 304.
+    """
+    version, entry = await _call(profile_cache.lookup, kind, entity_id)
+    if entry is None:
+        result = await load()
+        if not result.get("success"):
+            return result
+        entry = await _call(profile_cache.store, kind, entity_id, version, result)
+
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if _if_none_match(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
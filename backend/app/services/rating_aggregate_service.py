@@ -0,0 +1,398 @@
+"""
+Rating Aggregate Service
+Constant-time doctor rating averages from running per-doctor totals
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, case, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.enhanced_models import Doctor, DoctorRatingAggregate, Review
+from app.services.profile_cache import invalidate_profile_after_commit
+from app.utils.cache import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Optional rating categories (overall is always present)
+RATING_CATEGORIES = ["communication", "wait_time", "diagnosis_accuracy", "professionalism"]
+
+# Age buckets for the recency-weighted rating: (name, max age in days, weight)
+AGE_BUCKETS = [("recent", 30, 1.0), ("mid", 90, 0.8), ("old", None, 0.6)]
+
+REBUCKET_INTERVAL_SECONDS = int(os.getenv("RATING_REBUCKET_INTERVAL_SECONDS", "3600"))
+
+# One worker per interval runs the re-bucket job
+REBUCKET_LOCK_KEY = "rating_rebucket:lock"
+REBUCKET_ADVISORY_LOCK_ID = 7_316_204_118
+
+
+def _counts_towards_rating(review: Review) -> bool:
+    return bool(review.verified_visit) and not review.is_flagged
+
+
+def _age_bucket(created_at: datetime, as_of: datetime) -> str:
+    """Bucket of a review aged relative to as_of (future reviews are recent)"""
+    for name, max_days, _ in AGE_BUCKETS:
+        if max_days is None or created_at > as_of - timedelta(days=max_days):
+            return name
+    return AGE_BUCKETS[-1][0]
+
+
+def _empty_averages(include_counts: bool = False) -> Dict:
+    averages = {category: 0.0 for category in ["overall"] + RATING_CATEGORIES}
+    if include_counts:
+        averages["counts"] = {category: 0 for category in ["overall"] + RATING_CATEGORIES}
+    return averages
+
+
+class RatingAggregateService:
+    """Maintains DoctorRatingAggregate rows alongside review writes"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add_review(self, review: Review):
+        """Count a new review; call before committing the review's transaction"""
+        if _counts_towards_rating(review):
+            self._apply(review, 1)
+
+    def remove_review(self, review: Review):
+        """Un-count a review that was counted (e.g. before flagging or deleting it)"""
+        if _counts_towards_rating(review):
+            self._apply(review, -1)
+
+    def _apply(self, review: Review, sign: int):
+        aggregate, seeded = self._get_for_update(review)
+        if seeded and sign < 0:
+            # Seeded without this review already
+            self._sync_doctor(review.doctor_id, aggregate)
+            return
+        created_at = review.created_at or datetime.utcnow()
+
+        aggregate.review_count += sign
+        aggregate.overall_sum += sign * review.overall_rating
+        for category in RATING_CATEGORIES:
+            value = getattr(review, f"{category}_rating")
+            if value:
+                setattr(aggregate, f"{category}_sum", getattr(aggregate, f"{category}_sum") + sign * value)
+                setattr(aggregate, f"{category}_count", getattr(aggregate, f"{category}_count") + sign)
+
+        bucket = _age_bucket(created_at, aggregate.buckets_as_of)
+        setattr(aggregate, f"{bucket}_sum", getattr(aggregate, f"{bucket}_sum") + sign * review.overall_rating)
+        setattr(aggregate, f"{bucket}_count", getattr(aggregate, f"{bucket}_count") + sign)
+
+        self._sync_doctor(review.doctor_id, aggregate)
+
+    def _get_for_update(self, review: Review):
+        """
+        Locked aggregate row for the review's doctor
+
+        Returns (aggregate, seeded). A missing row (no reviews since aggregates
+        were introduced) is seeded from the stored reviews other than this one.
+        """
+        aggregate = self.db.query(DoctorRatingAggregate).filter(
+            DoctorRatingAggregate.doctor_id == review.doctor_id
+        ).with_for_update().first()
+        if aggregate:
+            return aggregate, False
+
+        self.db.flush()
+        aggregate = self._compute(review.doctor_id, exclude_review_id=review.id)
+        try:
+            with self.db.begin_nested():
+                self.db.add(aggregate)
+        except IntegrityError:
+            # Created concurrently by another writer
+            aggregate = self.db.query(DoctorRatingAggregate).filter(
+                DoctorRatingAggregate.doctor_id == review.doctor_id
+            ).with_for_update().one()
+            return aggregate, False
+        return aggregate, True
+
+    def _compute(
+        self,
+        doctor_id: str,
+        exclude_review_id: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> DoctorRatingAggregate:
+        """Build (not persist) an aggregate from the doctor's stored reviews"""
+        now = now or datetime.utcnow()
+        query = self.db.query(*self._aggregate_columns(now)).filter(
+            Review.doctor_id == doctor_id,
+            Review.verified_visit == True,
+            Review.is_flagged == False
+        )
+        if exclude_review_id is not None:
+            query = query.filter(Review.id != exclude_review_id)
+        return self._from_row(doctor_id, query.one(), now)
+
+    @staticmethod
+    def _aggregate_columns(now: datetime) -> list:
+        columns = [func.count(Review.id), func.coalesce(func.sum(Review.overall_rating), 0)]
+        for category in RATING_CATEGORIES:
+            value = getattr(Review, f"{category}_rating")
+            columns += [func.coalesce(func.sum(value), 0), func.count(value)]
+        lower = None
+        for name, max_days, _ in AGE_BUCKETS:
+            conditions = []
+            if max_days is not None:
+                conditions.append(Review.created_at > now - timedelta(days=max_days))
+            if lower is not None:
+                conditions.append(Review.created_at <= lower)
+            in_bucket = and_(*conditions)
+            columns += [
+                func.coalesce(func.sum(case((in_bucket, Review.overall_rating), else_=0)), 0),
+                func.coalesce(func.sum(case((in_bucket, 1), else_=0)), 0),
+            ]
+            if max_days is not None:
+                lower = now - timedelta(days=max_days)
+        return columns
+
+    @staticmethod
+    def _from_row(doctor_id: str, row, now: datetime) -> DoctorRatingAggregate:
+        values = iter(row)
+        aggregate = DoctorRatingAggregate(
+            doctor_id=doctor_id,
+            review_count=next(values),
+            overall_sum=next(values),
+            buckets_as_of=now
+        )
+        for category in RATING_CATEGORIES:
+            setattr(aggregate, f"{category}_sum", next(values))
+            setattr(aggregate, f"{category}_count", next(values))
+        for name, _, _ in AGE_BUCKETS:
+            setattr(aggregate, f"{name}_sum", next(values))
+            setattr(aggregate, f"{name}_count", next(values))
+        return aggregate
+
+    def _sync_doctor(self, doctor_id: str, aggregate: DoctorRatingAggregate):
+        """Copy the weighted rating and review count onto the doctor row"""
+        doctor = self.db.query(Doctor).filter(Doctor.id == doctor_id).first()
+        if doctor:
+            self._copy_to_doctor(doctor, aggregate)
+
+    def _copy_to_doctor(self, doctor: Doctor, aggregate: DoctorRatingAggregate):
+        rating_avg = self.weighted_average(aggregate)
+        if doctor.rating_avg != rating_avg or doctor.total_reviews != aggregate.review_count:
+            # Profile shows both; dropped if the transaction rolls back
+            invalidate_profile_after_commit(self.db, "doctor", doctor.id)
+        doctor.rating_avg = rating_avg
+        doctor.total_reviews = aggregate.review_count
+
+    @staticmethod
+    def weighted_average(aggregate: DoctorRatingAggregate) -> float:
+        """Recency-weighted overall rating: 1.0 < 30 days, 0.8 < 90 days, 0.6 older"""
+        total_weighted_rating = 0.0
+        total_weight = 0.0
+        for name, _, weight in AGE_BUCKETS:
+            total_weighted_rating += getattr(aggregate, f"{name}_sum") * weight
+            total_weight += getattr(aggregate, f"{name}_count") * weight
+        return round(total_weighted_rating / total_weight, 2) if total_weight > 0 else 0.0
+
+    def get_average_ratings(self, doctor_id: str) -> Dict:
+        """Plain average per rating category"""
+        aggregate = self.db.query(DoctorRatingAggregate).filter(
+            DoctorRatingAggregate.doctor_id == doctor_id
+        ).first()
+        if aggregate is None:
+            # Doctor not yet aggregated (no reviews since rollout)
+            return self.average_ratings_from_reviews(doctor_id)
+
+        averages = {
+            "overall": round(aggregate.overall_sum / aggregate.review_count, 2) if aggregate.review_count else 0.0
+        }
+        for category in RATING_CATEGORIES:
+            total = getattr(aggregate, f"{category}_sum")
+            count = getattr(aggregate, f"{category}_count")
+            averages[category] = round(total / count, 2) if count else 0.0
+        return averages
+
+    def average_ratings_from_reviews(self, doctor_id: str, include_counts: bool = False) -> Dict:
+        """Per-category averages straight from the reviews table (one query)"""
+        result = self.average_ratings_by_doctor([doctor_id], include_counts=include_counts)
+        return result.get(doctor_id) or _empty_averages(include_counts)
+
+    def average_ratings_by_doctor(self, doctor_ids: List[str], include_counts: bool = False) -> Dict[str, Dict]:
+        """
+        Per-category averages for several doctors in a single GROUP BY query
+
+        Unrated (NULL/0) categories are left out of each average, as before:
+        avg(x) FILTER (WHERE x > 0) on PostgreSQL, avg(CASE WHEN x > 0 ...) elsewhere.
+        """
+        postgres = self.db.get_bind().dialect.name == "postgresql"
+        columns = [Review.doctor_id, func.avg(Review.overall_rating), func.count(Review.id)]
+        for category in RATING_CATEGORIES:
+            value = getattr(Review, f"{category}_rating")
+            if postgres:
+                columns += [func.avg(value).filter(value > 0), func.count(value).filter(value > 0)]
+            else:
+                columns += [func.avg(case((value > 0, value))), func.count(case((value > 0, value)))]
+
+        rows = self.db.query(*columns).filter(
+            Review.doctor_id.in_(doctor_ids),
+            Review.verified_visit == True,
+            Review.is_flagged == False
+        ).group_by(Review.doctor_id).all()
+
+        result = {}
+        for row in rows:
+            values = iter(row[1:])
+            averages, counts = {}, {}
+            for category in ["overall"] + RATING_CATEGORIES:
+                average, count = next(values), next(values)
+                averages[category] = round(float(average), 2) if count else 0.0
+                counts[category] = count
+            if include_counts:
+                averages["counts"] = counts
+            result[row[0]] = averages
+        return result
+
+    def rebucket(self, now: Optional[datetime] = None) -> int:
+        """
+        Move reviews that aged past a bucket boundary since the last run
+
+        Only reviews created inside the (as_of - boundary, now - boundary]
+        window are read, grouped per doctor, so the cost follows the number of
+        reviews that changed bucket rather than the total. Only aggregates
+        with reviews to move are locked and loaded; the rest are advanced to
+        now in one UPDATE. Returns the number of aggregates whose buckets
+        changed; commits.
+        """
+        now = now or datetime.utcnow()
+        stale = self.db.scalars(
+            select(DoctorRatingAggregate.buckets_as_of)
+            .where(DoctorRatingAggregate.buckets_as_of < now)
+            .distinct()
+        ).all()
+
+        changed = []
+        for as_of in stale:
+            candidates = {row[0] for _, _, moved in self._moved(as_of, now) for row in moved}
+            if candidates:
+                # Re-check as_of under the lock: a concurrent run may have moved them already
+                aggregates = self.db.query(DoctorRatingAggregate).filter(
+                    DoctorRatingAggregate.doctor_id.in_(candidates),
+                    DoctorRatingAggregate.buckets_as_of == as_of
+                ).with_for_update().all()
+                by_doctor = {a.doctor_id: a for a in aggregates}
+                for name, next_name, moved in self._moved(as_of, now, list(by_doctor)):
+                    for doctor_id, rating_sum, count in moved:
+                        aggregate = by_doctor[doctor_id]
+                        setattr(aggregate, f"{name}_sum", getattr(aggregate, f"{name}_sum") - rating_sum)
+                        setattr(aggregate, f"{name}_count", getattr(aggregate, f"{name}_count") - count)
+                        setattr(aggregate, f"{next_name}_sum", getattr(aggregate, f"{next_name}_sum") + rating_sum)
+                        setattr(aggregate, f"{next_name}_count", getattr(aggregate, f"{next_name}_count") + count)
+                for aggregate in aggregates:
+                    aggregate.buckets_as_of = now
+                changed += aggregates
+
+            # Nothing to move for the others: their weighted rating is unchanged
+            self.db.execute(
+                update(DoctorRatingAggregate)
+                .where(
+                    DoctorRatingAggregate.buckets_as_of == as_of,
+                    DoctorRatingAggregate.doctor_id.not_in(candidates)
+                )
+                .values(buckets_as_of=now)
+                .execution_options(synchronize_session=False)
+            )
+
+        if changed:
+            doctors = self.db.query(Doctor).filter(Doctor.id.in_([a.doctor_id for a in changed])).all()
+            by_id = {doctor.id: doctor for doctor in doctors}
+            for aggregate in changed:
+                if aggregate.doctor_id in by_id:
+                    self._copy_to_doctor(by_id[aggregate.doctor_id], aggregate)
+
+        self.db.commit()
+        return len(changed)
+
+    def _moved(self, as_of: datetime, now: datetime, doctor_ids: Optional[List[str]] = None):
+        """Per boundary: (bucket, next bucket, [(doctor_id, rating_sum, count)]) aged across it since as_of"""
+        for (name, max_days, _), (next_name, _, _) in zip(AGE_BUCKETS, AGE_BUCKETS[1:]):
+            boundary = timedelta(days=max_days)
+            query = self.db.query(
+                Review.doctor_id,
+                func.sum(Review.overall_rating),
+                func.count(Review.id)
+            ).join(
+                DoctorRatingAggregate, DoctorRatingAggregate.doctor_id == Review.doctor_id
+            ).filter(
+                DoctorRatingAggregate.buckets_as_of == as_of,
+                Review.verified_visit == True,
+                Review.is_flagged == False,
+                Review.created_at > as_of - boundary,
+                Review.created_at <= now - boundary
+            )
+            if doctor_ids is not None:
+                query = query.filter(Review.doctor_id.in_(doctor_ids))
+            yield name, next_name, query.group_by(Review.doctor_id).all()
+
+    def rebuild(self, doctor_id: str) -> DoctorRatingAggregate:
+        """Recompute a doctor's aggregate from all reviews (backfill / repair); commits"""
+        aggregate = self._compute(doctor_id)
+        aggregate = self.db.merge(aggregate)
+        self._sync_doctor(doctor_id, aggregate)
+        self.db.commit()
+        return aggregate
+
+
+def _claim_rebucket_run(db: Session, interval_seconds: int) -> bool:
+    """
+    Whether this worker should run this interval's re-bucket
+
+    With Redis the first worker to claim the interval runs it (SET NX, expiring
+    with the interval). Without it, PostgreSQL's transaction-scoped advisory
+    lock keeps concurrent runs apart until rebucket() commits; SQLite
+    deployments are single-process.
+    """
+    client = get_redis_client()
+    if client is not None:
+        try:
+            return bool(client.set(REBUCKET_LOCK_KEY, os.getpid(), nx=True, ex=max(interval_seconds - 1, 1)))
+        except Exception as e:
+            logger.warning("rating re-bucket lock unavailable, using the database: %s", e)
+    if db.get_bind().dialect.name == "postgresql":
+        return bool(db.scalar(select(func.pg_try_advisory_xact_lock(REBUCKET_ADVISORY_LOCK_ID))))
+    return True
+
+
+def rebucket_once(session_factory, interval_seconds: int = REBUCKET_INTERVAL_SECONDS) -> Optional[int]:
+    """One re-bucket run in its own session; None when another worker has it"""
+    db = session_factory()
+    try:
+        if not _claim_rebucket_run(db, interval_seconds):
+            db.rollback()
+            return None
+        return RatingAggregateService(db).rebucket()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def run_rebucket_job(session_factory, interval_seconds: int = REBUCKET_INTERVAL_SECONDS):
+    """Background loop re-bucketing rating aggregates every interval_seconds"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            # Blocking database work stays off the event loop
+            updated = await run_in_threadpool(rebucket_once, session_factory, interval_seconds)
+        except Exception:
+            logger.exception("Rating re-bucket failed")
+            continue
+        if updated is not None:
+            logger.info("Re-bucketed %d doctor rating aggregates", updated)
+
+
+# Factory function
+def get_rating_aggregate_service(db: Session) -> RatingAggregateService:
+    """Factory function for dependency injection"""
+    return RatingAggregateService(db)
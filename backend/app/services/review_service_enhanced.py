@@ -3,11 +3,29 @@ Enhanced Review Service
 Multiple rating categories, AI moderation, weighted algorithm
 """
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
-from app.models.enhanced_models import Review, Appointment, User, Doctor
+from app.models.enhanced_models import Review, Appointment, User
 from app.services.ai_service import AIService
+from app.services.rating_aggregate_service import RatingAggregateService
+from app.utils.pagination import InvalidCursorError, Keyset, count_results, paginate, total_pages
+
+
+# Cursor sort keys per sort option (created_at, id as tie-breakers)
+REVIEW_KEYSETS = {
+    "recent": Keyset(
+        [(Review.created_at, True), (Review.id, True)],
+        key=lambda r: [r.created_at, str(r.id)]
+    ),
+    "rating_high": Keyset(
+        [(Review.overall_rating, True), (Review.created_at, True), (Review.id, True)],
+        key=lambda r: [r.overall_rating, r.created_at, str(r.id)]
+    ),
+    "rating_low": Keyset(
+        [(Review.overall_rating, False), (Review.created_at, True), (Review.id, True)],
+        key=lambda r: [r.overall_rating, r.created_at, str(r.id)]
+    ),
+}
 
 
 class EnhancedReviewService:
@@ -115,12 +133,13 @@ class EnhancedReviewService:
                 review.flag_reason = "AI detected inappropriate content"
         
         self.db.add(review)
+        self.db.flush()
+        
+        # Update doctor ratings (weighted algorithm) in the same transaction
+        RatingAggregateService(self.db).add_review(review)
         self.db.commit()
         self.db.refresh(review)
         
-        # Update doctor ratings (weighted algorithm)
-        self._update_doctor_ratings(doctor_id)
-        
         return {
             "success": True,
             "data": {
@@ -134,47 +153,6 @@ class EnhancedReviewService:
             }
         }
     
-    def _update_doctor_ratings(self, doctor_id: str):
-        """Update doctor ratings using weighted algorithm"""
-        doctor = self.db.query(Doctor).filter(Doctor.id == doctor_id).first()
-        if not doctor:
-            return
-        
-        # Get all verified reviews
-        reviews = self.db.query(Review).filter(
-            and_(
-                Review.doctor_id == doctor_id,
-                Review.verified_visit == True,
-                Review.is_flagged == False
-            )
-        ).all()
-        
-        if not reviews:
-            doctor.rating_avg = 0.0
-            doctor.total_reviews = 0
-        else:
-            # Weighted average (more recent reviews have higher weight)
-            total_weighted_rating = 0.0
-            total_weight = 0.0
-            
-            for review in reviews:
-                # Weight: 1.0 for reviews < 30 days, 0.8 for 30-90 days, 0.6 for > 90 days
-                days_old = (datetime.utcnow() - review.created_at).days
-                if days_old < 30:
-                    weight = 1.0
-                elif days_old < 90:
-                    weight = 0.8
-                else:
-                    weight = 0.6
-                
-                total_weighted_rating += review.overall_rating * weight
-                total_weight += weight
-            
-            doctor.rating_avg = round(total_weighted_rating / total_weight, 2) if total_weight > 0 else 0.0
-            doctor.total_reviews = len(reviews)
-        
-        self.db.commit()
-    
     def _is_inappropriate(self, comment: str, classification: Dict) -> bool:
         """Check if comment is inappropriate"""
         # Check sentiment
@@ -196,9 +174,15 @@ class EnhancedReviewService:
         doctor_id: str,
         page: int = 1,
         limit: int = 20,
-        sort: str = "recent"  # recent, rating_high, rating_low
+        sort: str = "recent",  # recent, rating_high, rating_low
+        cursor: Optional[str] = None,
+        count_mode: str = "exact"
     ) -> Dict:
-        """Get reviews for doctor with sorting"""
+        """
+        Get reviews for doctor with sorting
+        Pass cursor (next_cursor of the previous page, "" for the first) for keyset pagination
+        count_mode: exact, estimate or none (total is null, use has_more)
+        """
         query = self.db.query(Review).filter(
             and_(
                 Review.doctor_id == doctor_id,
@@ -208,15 +192,14 @@ class EnhancedReviewService:
         )
         
         # Sorting
-        if sort == "rating_high":
-            query = query.order_by(Review.overall_rating.desc(), Review.created_at.desc())
-        elif sort == "rating_low":
-            query = query.order_by(Review.overall_rating.asc(), Review.created_at.desc())
-        else:  # recent
-            query = query.order_by(Review.created_at.desc())
+        keyset = REVIEW_KEYSETS.get(sort, REVIEW_KEYSETS["recent"])
         
-        total = query.count()
-        reviews = query.offset((page - 1) * limit).limit(limit).all()
+        total = count_results(query, count_mode)
+        try:
+            result_page = paginate(query, keyset, limit, page=page, cursor=cursor)
+        except InvalidCursorError:
+            return {"success": False, "error": "Invalid cursor"}
+        reviews = result_page.items
         
         return {
             "success": True,
@@ -239,38 +222,17 @@ class EnhancedReviewService:
                     "page": page,
                     "limit": limit,
                     "total": total,
-                    "total_pages": (total + limit - 1) // limit
+                    "total_pages": total_pages(total, limit),
+                    "has_more": result_page.has_more
                 },
+                "next_cursor": result_page.next_cursor,
                 "average_ratings": self._calculate_average_ratings(doctor_id)
             }
         }
     
     def _calculate_average_ratings(self, doctor_id: str) -> Dict:
-        """Calculate average ratings for each category"""
-        reviews = self.db.query(Review).filter(
-            and_(
-                Review.doctor_id == doctor_id,
-                Review.verified_visit == True,
-                Review.is_flagged == False
-            )
-        ).all()
-        
-        if not reviews:
-            return {
-                "overall": 0.0,
-                "communication": 0.0,
-                "wait_time": 0.0,
-                "diagnosis_accuracy": 0.0,
-                "professionalism": 0.0
-            }
-        
-        return {
-            "overall": round(sum(r.overall_rating for r in reviews) / len(reviews), 2),
-            "communication": round(sum(r.communication_rating or 0 for r in reviews) / len([r for r in reviews if r.communication_rating]), 2) if any(r.communication_rating for r in reviews) else 0.0,
-            "wait_time": round(sum(r.wait_time_rating or 0 for r in reviews) / len([r for r in reviews if r.wait_time_rating]), 2) if any(r.wait_time_rating for r in reviews) else 0.0,
-            "diagnosis_accuracy": round(sum(r.diagnosis_accuracy_rating or 0 for r in reviews) / len([r for r in reviews if r.diagnosis_accuracy_rating]), 2) if any(r.diagnosis_accuracy_rating for r in reviews) else 0.0,
-            "professionalism": round(sum(r.professionalism_rating or 0 for r in reviews) / len([r for r in reviews if r.professionalism_rating]), 2) if any(r.professionalism_rating for r in reviews) else 0.0
-        }
+        """Calculate average ratings for each category (from the running aggregate)"""
+        return RatingAggregateService(self.db).get_average_ratings(doctor_id)
 
 
 # Factory function
@@ -4,10 +4,14 @@ Ensures only legitimate reviews from verified patients
 """
 from typing import Dict, Optional
 from datetime import datetime, timedelta
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from app.models import Review, Appointment, User
+from sqlalchemy import and_, func, select
+from app.models import Review, Appointment, AppointmentStatus, User
 from app.services.ai_service import AIService
+from app.services.rating_aggregate_service import RatingAggregateService
+
+MAX_REVIEWS_PER_DAY = 10
 
 
 class ReviewValidityService:
@@ -24,57 +28,55 @@ class ReviewValidityService:
         doctor_id: str,
         appointment_id: str,
         rating: int,
-        comment: Optional[str] = None
+        comment: Optional[str] = None,
+        classification: Optional[Dict] = None
     ) -> Dict:
         """
         Validate review creation with multiple checks
         
-        Returns validation result with success/error
+        Returns validation result with success/error. The comment is classified
+        at most once (only after the database checks pass) and the result is
+        returned as "classification" for reuse by the caller.
         """
+        # One statement returns everything checks 1-8 need
+        eligibility = self._eligibility(user_id, doctor_id, appointment_id)
+        
         # 1. Check user is verified
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
+        if eligibility is None:
             return {"valid": False, "error": "User not found"}
         
-        if not user.verified:
+        if not eligibility.verified:
             return {
                 "valid": False,
                 "error": "Only verified patients can leave reviews"
             }
         
         # 2. Check appointment exists and belongs to user
-        appointment = self.db.query(Appointment).filter(
-            and_(
-                Appointment.id == appointment_id,
-                Appointment.user_id == user_id,
-                Appointment.doctor_id == doctor_id
-            )
-        ).first()
-        
-        if not appointment:
+        if eligibility.appointment_id is None:
             return {
                 "valid": False,
                 "error": "Appointment not found or does not belong to user"
             }
         
         # 3. Check appointment is completed
-        if appointment.status != "completed":
+        if eligibility.status != AppointmentStatus.COMPLETED:
+            status = eligibility.status
             return {
                 "valid": False,
                 "error": "Review can only be created for completed appointments",
-                "details": {"appointment_status": appointment.status}
+                "details": {"appointment_status": status.value if status else None}
             }
         
-        # 4. Check appointment was checked in or doctor confirmed
-        if not appointment.checked_in and not appointment.doctor_confirmed:
+        # 4. Check appointment was checked in (appointments carry no separate
+        # doctor confirmation flag)
+        if not eligibility.checked_in:
             return {
                 "valid": False,
                 "error": "Appointment must be checked in or confirmed by doctor"
             }
         
         # 5. Check timestamp (review within X days of appointment)
-        appointment_date = appointment.start_time
-        days_since = (datetime.utcnow() - appointment_date).days
+        days_since = (datetime.utcnow() - eligibility.start_time).days
         
         if days_since > self.max_days_after_appointment:
             return {
@@ -83,39 +85,18 @@ class ReviewValidityService:
             }
         
         # 6. Check for duplicate review (same user, same appointment)
-        existing_review = self.db.query(Review).filter(
-            and_(
-                Review.user_id == user_id,
-                Review.appointment_id == appointment_id
-            )
-        ).first()
-        
-        if existing_review:
+        if eligibility.existing_review_id is not None:
             return {
                 "valid": False,
                 "error": "Review already exists for this appointment"
             }
         
-        # 7. Check for multiple reviews from same user for same doctor
-        user_reviews_count = self.db.query(Review).filter(
-            and_(
-                Review.user_id == user_id,
-                Review.doctor_id == doctor_id
-            )
-        ).count()
-        
-        # Allow multiple reviews if they're for different appointments
+        # 7. Multiple reviews from the same user for the same doctor are
+        # allowed if they're for different appointments
         # This is already handled by the appointment_id check above
         
         # 8. Rate limiting check (per user)
-        recent_reviews = self.db.query(Review).filter(
-            and_(
-                Review.user_id == user_id,
-                Review.created_at >= datetime.utcnow() - timedelta(hours=24)
-            )
-        ).count()
-        
-        if recent_reviews >= 10:  # Max 10 reviews per day
+        if eligibility.recent_reviews >= MAX_REVIEWS_PER_DAY:
             return {
                 "valid": False,
                 "error": "Rate limit exceeded. Maximum 10 reviews per day."
@@ -124,7 +105,8 @@ class ReviewValidityService:
         # 9. AI fraud detection (if comment provided)
         fraud_detected = False
         if comment and self.ai_service:
-            classification = self.ai_service.classify_review(comment)
+            if classification is None:
+                classification = self.ai_service.classify_review(comment)
             
             # Check for bot/fake style indicators
             if self._detect_bot_style(comment, classification):
@@ -138,9 +120,50 @@ class ReviewValidityService:
         return {
             "valid": True,
             "verified_visit": True,
-            "fraud_detected": fraud_detected
+            "fraud_detected": fraud_detected,
+            "classification": classification
         }
     
+    def _eligibility(self, user_id: str, doctor_id: str, appointment_id: str) -> Optional[Row]:
+        """
+        The user, their appointment with this doctor, any review of it and
+        their review count for the last 24 hours, in one round trip
+
+        None when the user does not exist; the appointment columns are None
+        when it does not exist or is not this user's with this doctor.
+        """
+        recent_reviews = (
+            select(func.count(Review.id))
+            .where(
+                Review.patient_id == user_id,
+                Review.created_at >= datetime.utcnow() - timedelta(hours=24)
+            )
+            .scalar_subquery()
+        )
+        statement = (
+            select(
+                User.verified,
+                Appointment.id.label("appointment_id"),
+                Appointment.status,
+                Appointment.checked_in,
+                Appointment.start_time,
+                Review.id.label("existing_review_id"),
+                recent_reviews.label("recent_reviews"),
+            )
+            .select_from(User)
+            .outerjoin(Appointment, and_(
+                Appointment.id == appointment_id,
+                Appointment.patient_id == User.id,
+                Appointment.doctor_id == doctor_id
+            ))
+            .outerjoin(Review, and_(
+                Review.appointment_id == Appointment.id,
+                Review.patient_id == User.id
+            ))
+            .where(User.id == user_id)
+        )
+        return self.db.execute(statement).first()
+    
     def _detect_bot_style(self, comment: str, classification: Dict) -> bool:
         """
         Detect bot/fake review style using heuristics and AI
@@ -170,7 +193,8 @@ class ReviewValidityService:
             return True
         
         # AI classification flags
-        if classification.get("sentiment_score") < 0.1 or classification.get("sentiment_score") > 0.9:
+        sentiment_score = classification.get("sentiment_score", 0.5)
+        if sentiment_score < 0.1 or sentiment_score > 0.9:
             # Extremely positive or negative might be suspicious
             if len(comment) < 50:  # Short extreme reviews are suspicious
                 return True
@@ -204,33 +228,34 @@ class ReviewValidityService:
         
         # Create review
         review = Review(
-            user_id=user_id,
+            patient_id=user_id,
             doctor_id=doctor_id,
             appointment_id=appointment_id,
-            rating=rating,
+            overall_rating=rating,
             comment=comment,
             verified_visit=True,
             is_verified=False  # Admin can verify later
         )
         
-        # AI sentiment analysis
+        # AI sentiment analysis (classified once, during validation)
+        classification = validation.get("classification") or {}
         if comment and self.ai_service:
-            classification = self.ai_service.classify_review(comment)
-            review.sentiment = classification.get("sentiment", "neutral")
+            review.ai_sentiment = classification.get("sentiment", "neutral")
         
         # Check if flagged
         if comment:
-            classification = self.ai_service.classify_review(comment) if self.ai_service else {}
             if self._detect_bot_style(comment, classification):
                 review.is_flagged = True
                 review.flag_reason = "AI fraud detection"
         
         self.db.add(review)
+        self.db.flush()
+        
+        # Update doctor ratings (weighted algorithm) in the same transaction
+        RatingAggregateService(self.db).add_review(review)
         self.db.commit()
         self.db.refresh(review)
         
-        # Trigger will automatically update doctor's rating_avg and num_reviews
-        
         return {
             "success": True,
             "data": {
@@ -240,11 +265,34 @@ class ReviewValidityService:
                     "comment": comment,
                     "verified_visit": True,
                     "is_flagged": review.is_flagged,
-                    "sentiment": review.sentiment
+                    "sentiment": review.ai_sentiment
                 }
             }
         }
 
+    def flag_review(self, review_id: str, reason: str) -> Dict:
+        """Flag a review as fraudulent; it stops counting towards the doctor's rating"""
+        review = self.db.query(Review).filter(Review.id == review_id).first()
+        if not review:
+            return {"success": False, "error": "Review not found"}
+        if not review.is_flagged:
+            # Un-count while it still counts
+            RatingAggregateService(self.db).remove_review(review)
+            review.is_flagged = True
+        review.flag_reason = reason
+        self.db.commit()
+        return {"success": True, "data": {"review": {"id": str(review.id), "is_flagged": True}}}
+    
+    def delete_review(self, review_id: str) -> Dict:
+        """Delete a review and un-count it from the doctor's rating"""
+        review = self.db.query(Review).filter(Review.id == review_id).first()
+        if not review:
+            return {"success": False, "error": "Review not found"}
+        RatingAggregateService(self.db).remove_review(review)
+        self.db.delete(review)
+        self.db.commit()
+        return {"success": True, "data": {"review": {"id": str(review_id)}}}
+
 
 # Factory function
 def get_review_validity_service(db: Session, ai_service: Optional[AIService] = None) -> ReviewValidityService:
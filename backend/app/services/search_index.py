@@ -0,0 +1,192 @@
+"""
+Search Index Service
+Full-text search index for doctors (PostgreSQL tsvector/GIN, SQLite FTS5)
+"""
+import logging
+import re
+import weakref
+from typing import List, Optional, Tuple
+
+from sqlalchemy import column, func, inspect, literal_column, or_, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query, Session
+
+from app.models.enhanced_models import Doctor
+
+logger = logging.getLogger(__name__)
+
+# Columns indexed for free-text doctor search
+DOCTOR_SEARCH_COLUMNS = ["display_name", "specialization", "practice_city", "practice_name"]
+
+DOCTOR_FTS_TABLE = "doctors_fts"
+DOCTOR_FTS_KEYS_TABLE = "doctors_fts_keys"
+DOCTOR_SEARCH_VECTOR = "search_vector"
+
+# Cache of "is the index present" per engine, so search does not inspect the schema per request
+_index_state: "weakref.WeakKeyDictionary[Engine, bool]" = weakref.WeakKeyDictionary()
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def _postgres_ddl() -> List[str]:
+    document = " || ' ' || ".join(f"coalesce({col}, '')" for col in DOCTOR_SEARCH_COLUMNS)
+    return [
+        f"ALTER TABLE doctors ADD COLUMN IF NOT EXISTS {DOCTOR_SEARCH_VECTOR} tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('simple', {document})) STORED",
+        f"CREATE INDEX IF NOT EXISTS idx_doctors_search_vector ON doctors USING GIN({DOCTOR_SEARCH_VECTOR})",
+    ]
+
+
+def _sqlite_ddl() -> List[str]:
+    # doctors has a TEXT primary key, so its rowid is implicit and VACUUM or a
+    # table rebuild may renumber it; FTS rows are keyed through their own
+    # INTEGER PRIMARY KEY table instead, which keeps its values
+    keys = DOCTOR_FTS_KEYS_TABLE
+    cols = ", ".join(DOCTOR_SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{col}" for col in DOCTOR_SEARCH_COLUMNS)
+    assignments = ", ".join(f"{col} = new.{col}" for col in DOCTOR_SEARCH_COLUMNS)
+    key_of = f"(SELECT key FROM {keys} WHERE id = {{}}.id)"
+    return [
+        f"CREATE TABLE IF NOT EXISTS {keys} (key INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE)",
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {DOCTOR_FTS_TABLE} USING fts5({cols}, tokenize='unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {DOCTOR_FTS_TABLE}_ai AFTER INSERT ON doctors BEGIN "
+        f"INSERT OR IGNORE INTO {keys}(id) VALUES (new.id); "
+        f"INSERT INTO {DOCTOR_FTS_TABLE}(rowid, {cols}) VALUES ({key_of.format('new')}, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {DOCTOR_FTS_TABLE}_ad AFTER DELETE ON doctors BEGIN "
+        f"DELETE FROM {DOCTOR_FTS_TABLE} WHERE rowid = {key_of.format('old')}; "
+        f"DELETE FROM {keys} WHERE id = old.id; END",
+        f"CREATE TRIGGER IF NOT EXISTS {DOCTOR_FTS_TABLE}_au AFTER UPDATE OF id, {cols} ON doctors BEGIN "
+        f"UPDATE {keys} SET id = new.id WHERE id = old.id; "
+        f"UPDATE {DOCTOR_FTS_TABLE} SET {assignments} WHERE rowid = {key_of.format('new')}; END",
+        # (Re)index every row; also repairs the index after a rebuild of doctors dropped the triggers
+        f"INSERT OR IGNORE INTO {keys}(id) SELECT id FROM doctors",
+        f"DELETE FROM {DOCTOR_FTS_TABLE}",
+        f"INSERT INTO {DOCTOR_FTS_TABLE}(rowid, {cols}) "
+        f"SELECT {keys}.key, {', '.join(f'doctors.{col}' for col in DOCTOR_SEARCH_COLUMNS)} "
+        f"FROM doctors JOIN {keys} ON {keys}.id = doctors.id",
+    ]
+
+
+def doctor_search_index_ddl(dialect: str) -> List[str]:
+    """Statements that create the doctor full-text index ([] if the dialect has none)"""
+    if dialect == "postgresql":
+        return _postgres_ddl()
+    if dialect == "sqlite":
+        return _sqlite_ddl()
+    return []
+
+
+def drop_doctor_search_index_ddl(dialect: str) -> List[str]:
+    """Statements that remove the doctor full-text index"""
+    if dialect == "postgresql":
+        return [
+            "DROP INDEX IF EXISTS idx_doctors_search_vector",
+            f"ALTER TABLE doctors DROP COLUMN IF EXISTS {DOCTOR_SEARCH_VECTOR}",
+        ]
+    if dialect == "sqlite":
+        return [
+            *(f"DROP TRIGGER IF EXISTS {DOCTOR_FTS_TABLE}_{suffix}" for suffix in ("ai", "ad", "au")),
+            f"DROP TABLE IF EXISTS {DOCTOR_FTS_TABLE}",
+            f"DROP TABLE IF EXISTS {DOCTOR_FTS_KEYS_TABLE}",
+        ]
+    return []
+
+
+def ensure_doctor_search_index(engine: Engine) -> bool:
+    """
+    Create the doctor full-text index if it does not exist
+
+    PostgreSQL: generated tsvector column + GIN index
+    SQLite: FTS5 table kept in sync by triggers
+    Returns True when the index is available afterwards.
+    """
+    statements = doctor_search_index_ddl(engine.dialect.name)
+    if not statements:
+        _index_state[engine] = False
+        return False
+
+    try:
+        with engine.begin() as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+    except Exception as e:
+        logger.warning("doctor search index not created: %s", e)
+        _index_state[engine] = False
+        return False
+
+    _index_state[engine] = True
+    return True
+
+
+def has_doctor_search_index(db: Session) -> bool:
+    """Check (once per engine) whether the doctor full-text index exists"""
+    engine = db.get_bind().engine
+    if engine in _index_state:
+        return _index_state[engine]
+
+    try:
+        inspector = inspect(engine)
+        if engine.dialect.name == "postgresql":
+            present = any(c["name"] == DOCTOR_SEARCH_VECTOR for c in inspector.get_columns("doctors"))
+        elif engine.dialect.name == "sqlite":
+            present = inspector.has_table(DOCTOR_FTS_TABLE)
+        else:
+            present = False
+    except Exception:
+        present = False
+
+    _index_state[engine] = present
+    return present
+
+
+def _search_tokens(q: str) -> List[str]:
+    """Split a raw query into safe word tokens (no query-syntax characters)"""
+    return _TOKEN_PATTERN.findall(q.lower())
+
+
+def apply_doctor_text_search(query: Query, db: Session, q: str) -> Tuple[Query, Optional[object]]:
+    """
+    Restrict a Doctor query to rows matching the free-text query
+
+    Every word must match; the last word is treated as a prefix so results
+    update while the user is still typing.
+    Returns the filtered query and a relevance expression to sort by
+    (None when the index is missing and the LIKE fallback was used).
+    """
+    tokens = _search_tokens(q)
+    if not tokens or not has_doctor_search_index(db):
+        return _apply_like_search(query, q), None
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        tsquery = " & ".join(tokens[:-1] + [f"{tokens[-1]}:*"])
+        ts_query = func.to_tsquery("simple", tsquery)
+        vector = literal_column(f"doctors.{DOCTOR_SEARCH_VECTOR}")
+        query = query.filter(vector.op("@@")(ts_query))
+        # ts_rank: higher is better
+        return query, func.ts_rank(vector, ts_query).desc()
+
+    # SQLite FTS5: quote tokens so they are matched literally
+    match = " ".join(f'"{t}"' for t in tokens[:-1]) + f' "{tokens[-1]}"*'
+    fts = table(DOCTOR_FTS_TABLE, column("rowid"), column("rank"))
+    keys = table(DOCTOR_FTS_KEYS_TABLE, column("key"), column("id"))
+    query = (
+        query.join(keys, keys.c.id == Doctor.id)
+        .join(fts, fts.c.rowid == keys.c.key)
+        .filter(literal_column(DOCTOR_FTS_TABLE).op("MATCH")(match.strip()))
+    )
+    # FTS5 rank is bm25(): lower is better
+    return query, fts.c.rank.asc()
+
+
+def _apply_like_search(query: Query, q: str) -> Query:
+    """Fallback substring search used when no full-text index exists"""
+    search_term = f"%{q.lower()}%"
+    return query.filter(
+        or_(
+            func.lower(Doctor.display_name).like(search_term),
+            func.lower(Doctor.specialization).like(search_term),
+            func.lower(Doctor.practice_city).like(search_term),
+            func.lower(Doctor.practice_name).like(search_term)
+        )
+    )
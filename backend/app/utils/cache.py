@@ -0,0 +1,78 @@
+"""
+Cache Utilities
+In-process LRU cache with TTL and an optional shared Redis client
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from app.utils.lazy_imports import lazy_import
+
+# Only imported when a Redis URL is configured
+redis = lazy_import("redis")
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after `ttl` seconds"""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_redis_clients = {}
+_redis_lock = threading.Lock()
+
+
+def get_redis_client(url: Optional[str] = None):
+    """
+    Shared Redis client for REDIS_URL (or `url`)
+
+    Returns None when no URL is configured or the redis package is not
+    installed, so callers can fall back to in-process caching.
+    """
+    url = url or os.getenv("REDIS_URL")
+    if not url or not url.startswith(("redis://", "rediss://", "unix://")) or not redis.available:
+        return None
+    with _redis_lock:
+        client = _redis_clients.get(url)
+        if client is None:
+            client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+            _redis_clients[url] = client
+        return client
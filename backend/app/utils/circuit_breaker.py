@@ -0,0 +1,165 @@
+"""
+Circuit Breaker and Bulkhead
+Fail fast when a third-party provider is down or slow instead of tying up worker threads
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+# Consecutive failed calls that open the circuit
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+# Seconds an open circuit rejects calls before letting a trial call through
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+# Calls in flight per provider; the rest are rejected immediately
+BULKHEAD_MAX_CONCURRENT = int(os.getenv("BULKHEAD_MAX_CONCURRENT", "10"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ProviderUnavailableError(Exception):
+    """Call rejected without contacting the provider; adapters treat it like a network error"""
+
+    def __init__(self, provider: str, reason: str):
+        super().__init__(f"{provider} unavailable: {reason}")
+        self.provider = provider
+        self.reason = reason
+
+
+class CircuitOpenError(ProviderUnavailableError):
+    pass
+
+
+class BulkheadFullError(ProviderUnavailableError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker with a concurrency bulkhead
+
+    closed -> open after `failure_threshold` consecutive failures. Open
+    rejects every call for `reset_timeout` seconds, then half-open lets a
+    single trial call through: success closes the circuit, failure opens
+    it again. Independently, at most `max_concurrent` calls run at once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+        max_concurrent: int = BULKHEAD_MAX_CONCURRENT,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_concurrent = max_concurrent
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._consecutive_failures = 0
+        self._in_flight = 0
+        self.trips = 0
+        self.rejected_open = 0
+        self.rejected_bulkhead = 0
+        self.successes = 0
+        self.failures = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+        return self._state
+
+    def _admit(self) -> bool:
+        """Reserve a slot; returns whether this call is the half-open trial"""
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN or (state == HALF_OPEN and self._trial_in_flight):
+                self.rejected_open += 1
+                raise CircuitOpenError(self.name, "circuit open")
+            if self._in_flight >= self.max_concurrent:
+                self.rejected_bulkhead += 1
+                raise BulkheadFullError(self.name, f"{self._in_flight} calls in flight")
+            self._in_flight += 1
+            trial = state == HALF_OPEN
+            if trial:
+                self._trial_in_flight = True
+            return trial
+
+    def _trip(self):
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self.trips += 1
+        logger.warning("circuit opened", extra={"provider": self.name, "trips": self.trips})
+
+    def record_success(self, trial: bool = False):
+        with self._lock:
+            self.successes += 1
+            self._consecutive_failures = 0
+            if trial or self._state == HALF_OPEN:
+                logger.info("circuit closed", extra={"provider": self.name})
+                self._state = CLOSED
+
+    def record_failure(self, trial: bool = False):
+        with self._lock:
+            self.failures += 1
+            self._consecutive_failures += 1
+            if trial or (self._state == CLOSED and self._consecutive_failures >= self.failure_threshold):
+                self._trip()
+
+    @contextmanager
+    def guard(self):
+        """
+        Run one provider call
+
+        Raises CircuitOpenError / BulkheadFullError without running the
+        body. An exception from the body counts as a failure; otherwise the
+        body reports the outcome through the yielded callable
+        (`report(ok)`), defaulting to success.
+        """
+        trial = self._admit()
+        outcome = {"ok": True}
+        try:
+            yield lambda ok: outcome.__setitem__("ok", ok)
+        except BaseException:
+            self.record_failure(trial)
+            raise
+        else:
+            if outcome["ok"]:
+                self.record_success(trial)
+            else:
+                self.record_failure(trial)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                if trial:
+                    self._trial_in_flight = False
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "trips": self.trips,
+                "in_flight": self._in_flight,
+                "max_concurrent": self.max_concurrent,
+                "consecutive_failures": self._consecutive_failures,
+                "rejected_open": self.rejected_open,
+                "rejected_bulkhead": self.rejected_bulkhead,
+                "successes": self.successes,
+                "failures": self.failures,
+            }
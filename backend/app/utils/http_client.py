@@ -0,0 +1,350 @@
+"""
+Outbound HTTP
+Shared keep-alive pools, jittered retries and latency histograms for third-party API calls
+"""
+import email.utils
+import importlib.util
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.lazy_imports import lazy_import
+from app.utils.metrics import record_outbound
+
+# Loaded with the first outbound call
+httpx = lazy_import("httpx")
+
+logger = logging.getLogger(__name__)
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+# Idle connections kept open per host for reuse
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+# HTTP/2 needs the h2 package (pip install httpx[http2]); HTTP/1.1 keep-alive otherwise
+HTTP2_ENABLED = (
+    os.getenv("HTTP2_ENABLED", "true").lower() == "true" and importlib.util.find_spec("h2") is not None
+)
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    When and how long to wait before retrying an outbound call
+
+    Idempotent methods are retried on transport errors and RETRY_STATUSES.
+    Other methods (POST, PATCH) are only retried when the connection could
+    not be opened, since the request cannot have reached the server.
+    """
+    attempts: int = 3
+    backoff_base: float = 0.2
+    backoff_max: float = 5.0
+    statuses: frozenset = RETRY_STATUSES
+    retry_non_idempotent: bool = False
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential delay after failed attempt number `attempt` (1-based)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+
+NO_RETRY = RetryPolicy(attempts=1)
+
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram (Prometheus layout)"""
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._counts = [0] * (len(self.buckets_ms) + 1)
+        self._sum_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        ms = seconds * 1000
+        index = next((i for i, bound in enumerate(self.buckets_ms) if ms <= bound), len(self.buckets_ms))
+        with self._lock:
+            self._counts[index] += 1
+            self._sum_ms += ms
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound (ms) of the bucket holding the q-th percentile (inf past the last bucket)"""
+        with self._lock:
+            counts = list(self._counts)
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q / 100 * total
+        seen = 0
+        for bound, count in zip(self.buckets_ms + (float("inf"),), counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts = list(self._counts)
+            sum_ms = self._sum_ms
+        cumulative, buckets = 0, {}
+        for bound, count in zip(self.buckets_ms + (float("inf"),), counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {"count": cumulative, "sum_ms": round(sum_ms, 3), "buckets": buckets}
+
+
+class AdapterMetrics:
+    """Per-adapter outbound call counters and latency"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.statuses: Dict[str, int] = {}
+
+    def record(self, seconds: float, status: Optional[int]):
+        self.latency.observe(seconds)
+        with self._lock:
+            self.requests += 1
+            if status is None:
+                self.errors += 1
+            else:
+                key = f"{status // 100}xx"
+                self.statuses[key] = self.statuses.get(key, 0) + 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counters = {
+                "requests": self.requests,
+                "retries": self.retries,
+                "errors": self.errors,
+                "statuses": dict(self.statuses),
+            }
+        return {
+            **counters,
+            "p50_ms": self.latency.percentile(50),
+            "p99_ms": self.latency.percentile(99),
+            "latency": self.latency.snapshot(),
+        }
+
+
+def _retry_after(response) -> Optional[float]:
+    """Seconds from a Retry-After header (delta or HTTP date)"""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdapterClient:
+    """
+    Outbound calls for one adapter
+
+    Shares the process connection pool; has its own timeout, retry policy,
+    metrics and circuit breaker. request() returns the final response
+    (raise_for_status() is the caller's choice), raises httpx.HTTPError,
+    or raises ProviderUnavailableError without calling out while the
+    provider's circuit is open or its bulkhead is full.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        outbound: "OutboundHTTP",
+        timeout: float,
+        retry: RetryPolicy,
+        metrics: AdapterMetrics,
+        breaker: CircuitBreaker,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.retry = retry
+        self.metrics = metrics
+        self.breaker = breaker
+        self._outbound = outbound
+        self._sleep = sleep
+
+    def _record(self, seconds: float, status: Optional[int]):
+        self.metrics.record(seconds, status)
+        record_outbound(self.name, seconds, status)
+
+    def _can_retry(self, method: str, attempt: int, error: Exception = None) -> bool:
+        if attempt >= self.retry.attempts:
+            return False
+        if method in IDEMPOTENT_METHODS or self.retry.retry_non_idempotent:
+            return True
+        # Never sent: safe to retry anything
+        return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+    def request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs):
+        with self.breaker.guard() as report:
+            response = self._request_with_retries(method, url, timeout, **kwargs)
+            # 4xx means the provider is up and answered
+            report(response.status_code < 500 and response.status_code != 429)
+            return response
+
+    def _request_with_retries(self, method: str, url: str, timeout: Optional[float], **kwargs):
+        method = method.upper()
+        timeout = timeout or self.timeout
+        timeouts = httpx.Timeout(timeout, connect=min(timeout, HTTP_CONNECT_TIMEOUT))
+        client = self._outbound.http
+        attempt = 0
+        while True:
+            attempt += 1
+            started = time.perf_counter()
+            try:
+                response = client.request(method, url, timeout=timeouts, **kwargs)
+            except httpx.TransportError as e:
+                self._record(time.perf_counter() - started, None)
+                if not self._can_retry(method, attempt, e):
+                    raise
+                delay = self.retry.backoff(attempt)
+                reason = type(e).__name__
+            else:
+                self._record(time.perf_counter() - started, response.status_code)
+                if response.status_code not in self.retry.statuses or not self._can_retry(method, attempt):
+                    return response
+                retry_after = _retry_after(response)
+                delay = self.retry.backoff(attempt) if retry_after is None else min(retry_after, self.retry.backoff_max)
+                reason = response.status_code
+                response.close()
+
+            self.metrics.record_retry()
+            logger.info(
+                "retrying outbound call",
+                extra={"adapter": self.name, "method": method, "host": urlsplit(url).hostname,
+                       "attempt": attempt, "reason": reason, "delay_s": round(delay, 3)}
+            )
+            self._sleep(delay)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+
+class OutboundHTTP:
+    """
+    Process-wide outbound HTTP client
+
+    One httpx.Client (built on first use) keeps a keep-alive pool per
+    host, so repeated calls to the same API skip the TCP and TLS
+    handshakes; HTTP/2 multiplexes them when h2 is installed. Each
+    adapter gets an AdapterClient with its own timeout and retry policy.
+    """
+
+    def __init__(self, transport=None, http2: Optional[bool] = None):
+        self._transport = transport
+        self._http2 = HTTP2_ENABLED if http2 is None else http2
+        self._http = None
+        self._metrics: Dict[str, AdapterMetrics] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def http(self):
+        if self._http is None:
+            with self._lock:
+                if self._http is None:
+                    self._http = httpx.Client(
+                        http2=self._http2,
+                        transport=self._transport,
+                        limits=httpx.Limits(
+                            max_connections=HTTP_MAX_CONNECTIONS,
+                            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                        ),
+                    )
+        return self._http
+
+    def client(
+        self,
+        name: str,
+        timeout: float = 10.0,
+        retry: Optional[RetryPolicy] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        **breaker_options
+    ) -> AdapterClient:
+        """
+        Client for one provider
+
+        Metrics and the circuit breaker are shared by all clients with the
+        same name; breaker_options (failure_threshold, reset_timeout,
+        max_concurrent) apply when the first one is created.
+        """
+        with self._lock:
+            metrics = self._metrics.setdefault(name, AdapterMetrics())
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(name, **breaker_options)
+        return AdapterClient(name, self, timeout, retry or RetryPolicy(), metrics, breaker, sleep)
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            metrics = dict(self._metrics)
+            breakers = dict(self._breakers)
+        return {name: {**m.snapshot(), "circuit": breakers[name].snapshot()} for name, m in metrics.items()}
+
+    def close(self):
+        with self._lock:
+            http, self._http = self._http, None
+        if http is not None:
+            http.close()
+
+
+_outbound: Optional[OutboundHTTP] = None
+_outbound_lock = threading.Lock()
+
+
+# Factory function
+def get_outbound_http() -> OutboundHTTP:
+    """Process-wide outbound client (closed by the app container on shutdown)"""
+    global _outbound
+    with _outbound_lock:
+        if _outbound is None:
+            _outbound = OutboundHTTP()
+        return _outbound
+
+
+def close_outbound_http():
+    global _outbound
+    with _outbound_lock:
+        outbound, _outbound = _outbound, None
+    if outbound is not None:
+        outbound.close()
@@ -0,0 +1,71 @@
+"""
+Lazy Imports
+Third-party SDKs imported on first use instead of at worker start
+"""
+import importlib
+import importlib.util
+import threading
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access
+
+    `sendgrid = lazy_import("sendgrid")` reads like the normal import at
+    the call sites (`sendgrid.SendGridAPIClient(...)`), but the SDK and its
+    dependency tree only load when a request actually needs them. A missing
+    package raises ImportError at that point, not when the app starts.
+    """
+
+    def __init__(self, name: str, install_hint: Optional[str] = None):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_install_hint", install_hint or name.partition(".")[0])
+        object.__setattr__(self, "_module", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _load(self) -> ModuleType:
+        module = self._module
+        if module is None:
+            with self._lock:
+                module = self._module
+                if module is None:
+                    try:
+                        module = importlib.import_module(self._name)
+                    except ImportError as e:
+                        raise ImportError(
+                            f"{self._name} is not installed (pip install {self._install_hint})"
+                        ) from e
+                    object.__setattr__(self, "_module", module)
+        return module
+
+    @property
+    def available(self) -> bool:
+        """Whether the package is installed, without importing it"""
+        if self._module is not None:
+            return True
+        try:
+            return importlib.util.find_spec(self._name.partition(".")[0]) is not None
+        except (ImportError, ValueError):
+            return False
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        # e.g. openai.api_key = ...
+        setattr(self._load(), attr, value)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name: str, install_hint: Optional[str] = None) -> LazyModule:
+    """Module proxy for `name`; see LazyModule"""
+    return LazyModule(name, install_hint)
@@ -0,0 +1,201 @@
+"""
+Prometheus Metrics
+Request latency, per-request DB time, connection pool and outbound call metrics
+"""
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.query_profiler import QueryProfile
+
+# Under gunicorn every worker writes its samples to files in this directory
+# and /metrics merges them (see gunicorn.conf.py). prometheus_client reads
+# it when first imported, so it must be set before the app is loaded.
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR") or None
+# Per-request SQL counts and time. Any cursor-execute listener puts every
+# statement on SQLAlchemy's event path (~8 us each); off leaves pool metrics
+DB_QUERY_METRICS = os.getenv("DB_QUERY_METRICS", "true").lower() == "true"
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30)
+OUTBOUND_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status code",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time to the end of the response body",
+    ["method", "route"], buckets=REQUEST_BUCKETS
+)
+# livesum: workers that exit drop out of the total
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests being handled",
+    ["method"], multiprocess_mode="livesum"
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "SQL statements executed while handling one request",
+    ["route"], buckets=QUERY_COUNT_BUCKETS
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_query_seconds_per_request", "Time spent in SQL statements while handling one request",
+    ["route"], buckets=REQUEST_BUCKETS
+)
+DB_POOL_CHECKOUT = Histogram(
+    "db_pool_checkout_seconds", "Time to get a connection from the pool (waiting, connecting, pre-ping)",
+    ["engine"], buckets=POOL_WAIT_BUCKETS
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections in use", ["engine"], multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond pool_size", ["engine"], multiprocess_mode="livesum"
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Configured pool_size", ["engine"], multiprocess_mode="livesum"
+)
+OUTBOUND_REQUEST_DURATION = Histogram(
+    "outbound_request_duration_seconds", "Third-party API calls (one observation per attempt)",
+    ["provider", "status"], buckets=OUTBOUND_BUCKETS
+)
+
+
+# Set by the metrics middleware; copied into threadpool calls and the
+# greenlets of the async engine, so all of a request's queries land here
+request_db_stats: contextvars.ContextVar[Optional[QueryProfile]] = contextvars.ContextVar(
+    "request_db_stats", default=None
+)
+
+_QUERY_STARTED = "metrics_query_started"
+
+
+def _finish_query(conn, statement: str):
+    started = conn.info.pop(_QUERY_STARTED, None)
+    stats = request_db_stats.get()
+    if started is not None and stats is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def _pool_recorder(name: str):
+    checked_out_gauge = DB_POOL_CHECKED_OUT.labels(name)
+    overflow_gauge = DB_POOL_OVERFLOW.labels(name)
+
+    def record(pool, returning: bool = False):
+        # NullPool / StaticPool (tests, aiosqlite defaults) have no sizes to report
+        if not hasattr(pool, "checkedout"):
+            return
+        checked_out, overflow = pool.checkedout(), pool.overflow()
+        if returning:
+            # The checkin event fires before the pool takes the connection back:
+            # it goes to the idle queue, or is closed when that is full
+            idle = pool.size() - checked_out + overflow
+            checked_out -= 1
+            if idle >= pool.size():
+                overflow -= 1
+        checked_out_gauge.set(checked_out)
+        overflow_gauge.set(max(0, overflow))
+
+    return record
+
+
+def _time_checkouts(engine: Engine, name: str):
+    # Wraps the engine rather than its pool, which dispose() replaces. Not an
+    # engine event: any of those puts every statement on the event path.
+    raw_connection = engine.raw_connection
+    histogram = DB_POOL_CHECKOUT.labels(name)
+
+    def timed_raw_connection():
+        started = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            histogram.observe(time.perf_counter() - started)
+
+    engine.raw_connection = timed_raw_connection
+
+
+def _time_queries(engine: Engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if request_db_stats.get() is not None:
+            conn.info[_QUERY_STARTED] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _finish_query(conn, statement)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        if context.connection is not None:
+            _finish_query(context.connection, context.statement)
+
+
+def instrument_engine(engine: Engine, name: str, query_metrics: bool = DB_QUERY_METRICS):
+    """
+    Count and time SQL statements per request, and report pool usage
+
+    Takes the sync Engine (`async_engine.sync_engine` for an async one).
+    """
+    if query_metrics:
+        _time_queries(engine)
+
+    record_pool = _pool_recorder(name)
+
+    # Pool listeners on the engine carry over when dispose() recreates the pool
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        record_pool(engine.pool)
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        record_pool(engine.pool, returning=True)
+
+    if hasattr(engine.pool, "size"):
+        DB_POOL_SIZE.labels(name).set(engine.pool.size())
+    _time_checkouts(engine, name)
+
+
+def _status_class(status: Optional[int]) -> str:
+    return f"{status // 100}xx" if status else "error"
+
+
+def record_outbound(provider: str, seconds: float, status: Optional[int]):
+    """One outbound attempt; `status` None for a transport error"""
+    OUTBOUND_REQUEST_DURATION.labels(provider, _status_class(status)).observe(seconds)
+
+
+@contextmanager
+def track_outbound(provider: str):
+    """
+    Time an SDK call (Twilio, SendGrid, OpenAI) like an AdapterClient request
+
+    SDKs raise on non-2xx responses; the status is taken from the exception
+    when it carries one, otherwise the call is recorded as "error".
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        status = getattr(e, "status_code", None) or getattr(e, "status", None)
+        record_outbound(provider, time.perf_counter() - started, status if isinstance(status, int) else None)
+        raise
+    record_outbound(provider, time.perf_counter() - started, 200)
+
+
+def render_metrics(multiproc_dir: Optional[str] = PROMETHEUS_MULTIPROC_DIR):
+    """Exposition text for /metrics: this process, or every gunicorn worker when multiproc_dir is set"""
+    if multiproc_dir:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=multiproc_dir)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
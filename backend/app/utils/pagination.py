@@ -0,0 +1,218 @@
+"""
+Pagination Utilities
+Offset and keyset (cursor) pagination for listing endpoints
+"""
+import base64
+import binascii
+import enum
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, literal, or_, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Query
+
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# count=exact runs COUNT(*), estimate uses planner rows / a cached count, none skips it
+COUNT_MODES = ("exact", "estimate", "none")
+COUNT_MODE_PATTERN = "^(exact|estimate|none)$"
+
+COUNT_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_COUNT_CACHE_TTL", "60"))
+COUNT_CACHE_MAX_ENTRIES = 1024
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, enum.Enum):
+        # SQLAlchemy Enum columns store (and compare against) member names
+        return value.name
+    raise TypeError(f"Cannot encode {type(value).__name__} in cursor")
+
+
+def _json_object_hook(obj: dict) -> Any:
+    if "$dt" in obj:
+        return datetime.fromisoformat(obj["$dt"])
+    return obj
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode sort-key values into an opaque, URL-safe cursor"""
+    raw = json.dumps(list(values), default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(
+            base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"),
+            object_hook=_json_object_hook
+        )
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+    if not isinstance(values, list):
+        raise InvalidCursorError("Invalid cursor")
+    return values
+
+
+class Keyset:
+    """
+    Sort key used for cursor pagination
+
+    columns: (expression, descending) pairs, ending with a unique column (id)
+    key: extracts the matching values from a result row
+    """
+
+    def __init__(self, columns: Sequence[Tuple[Any, bool]], key: Callable[[Any], Sequence[Any]]):
+        self.columns = list(columns)
+        self.key = key
+
+    def order_by(self) -> list:
+        return [expr.desc() if descending else expr.asc() for expr, descending in self.columns]
+
+    def after(self, values: Sequence[Any]):
+        """Predicate selecting rows that sort strictly after the given key"""
+        if len(values) != len(self.columns):
+            raise InvalidCursorError("Invalid cursor")
+
+        bound = [literal(value, type_=expr.type) for (expr, _), value in zip(self.columns, values)]
+        directions = {descending for _, descending in self.columns}
+
+        # Uniform direction: a single row-value comparison (index friendly)
+        if len(directions) == 1:
+            exprs = tuple_(*[expr for expr, _ in self.columns])
+            return exprs < tuple_(*bound) if directions.pop() else exprs > tuple_(*bound)
+
+        # Mixed directions: (a > x) OR (a = x AND b < y) OR ...
+        clauses = []
+        for i, (expr, descending) in enumerate(self.columns):
+            equal_prefix = [self.columns[j][0] == bound[j] for j in range(i)]
+            step = expr < bound[i] if descending else expr > bound[i]
+            clauses.append(and_(*equal_prefix, step))
+        return or_(*clauses)
+
+    def cursor_for(self, row: Any) -> str:
+        return encode_cursor(self.key(row))
+
+
+@dataclass
+class Page:
+    items: list
+    has_more: bool
+    next_cursor: Optional[str] = None
+
+
+def paginate(
+    query: Query,
+    keyset: Keyset,
+    limit: int,
+    page: int = 1,
+    cursor: Optional[str] = None,
+    order_by: Optional[list] = None
+) -> Page:
+    """
+    Fetch one page of results
+
+    cursor is None: offset mode, returns rows for `page`
+    cursor given: cursor mode, returns rows after the cursor ("" = first page)
+
+    Rows are ordered by the keyset unless `order_by` overrides it (offset
+    mode only); next_cursor is only produced when the keyset ordering is used.
+    Fetches limit + 1 rows to know whether another page exists.
+    """
+    if cursor is not None:
+        if cursor:
+            query = query.filter(keyset.after(decode_cursor(cursor)))
+        query = query.order_by(*keyset.order_by())
+    else:
+        query = query.order_by(*(order_by or keyset.order_by()))
+        query = query.offset((page - 1) * limit)
+
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    items = rows[:limit]
+
+    next_cursor = None
+    if has_more and items and (cursor is not None or order_by is None):
+        next_cursor = keyset.cursor_for(items[-1])
+
+    return Page(items=items, has_more=has_more, next_cursor=next_cursor)
+
+
+# COUNT(*) results keyed by filter signature
+count_cache = TTLCache(COUNT_CACHE_TTL_SECONDS, COUNT_CACHE_MAX_ENTRIES)
+
+
+def _filter_signature(query: Query) -> str:
+    """Stable key for a query's SQL and bound parameters"""
+    compiled = query.statement.compile(dialect=query.session.get_bind().dialect)
+    params = sorted((k, repr(v)) for k, v in compiled.params.items())
+    return hashlib.sha1(f"{compiled}|{params}".encode("utf-8")).hexdigest()
+
+
+def _planner_estimate(query: Query) -> Optional[int]:
+    """Row estimate from PostgreSQL's planner (EXPLAIN, no execution)"""
+    bind = query.session.get_bind()
+    compiled = query.statement.compile(
+        dialect=bind.dialect,
+        compile_kwargs={"literal_binds": True}
+    )
+    # Literal rendering already escapes % for the driver's paramstyle
+    plan = query.session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}").scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_results(query: Query, mode: str = "exact") -> Optional[int]:
+    """
+    Total row count for a filtered (unordered, unpaginated) query
+
+    exact: SELECT count(*)
+    estimate: planner estimate on PostgreSQL, otherwise a cached exact count per
+              filter signature (SEARCH_COUNT_CACHE_TTL seconds)
+    none: no count (None); use Page.has_more instead
+    """
+    if mode == "none":
+        return None
+
+    if mode == "estimate":
+        if query.session.get_bind().dialect.name == "postgresql":
+            try:
+                # Savepoint: a failed EXPLAIN would otherwise abort the whole
+                # transaction, and the fallback count with it
+                with query.session.begin_nested():
+                    return _planner_estimate(query)
+            except SQLAlchemyError:
+                logger.warning("planner row estimate failed; using a cached count", exc_info=True)
+        key = _filter_signature(query)
+        cached = count_cache.get(key)
+        if cached is not None:
+            return cached
+        total = query.count()
+        count_cache.set(key, total)
+        return total
+
+    return query.count()
+
+
+def total_pages(total: Optional[int], limit: int) -> Optional[int]:
+    """Number of pages for a count (None when the count was skipped)"""
+    if total is None:
+        return None
+    return (total + limit - 1) // limit
@@ -0,0 +1,150 @@
+"""
+Password Hashing
+bcrypt on a dedicated, bounded thread pool so hashing never blocks the event loop
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import bcrypt
+
+# Work factor for new hashes; stored hashes with another cost are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Hash jobs allowed to wait for a worker before new ones are rejected
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+# bcrypt only uses the first 72 bytes
+BCRYPT_MAX_BYTES = 72
+
+
+class PasswordHasherBusyError(RuntimeError):
+    """Raised when the hashing queue is full (shed load instead of queueing forever)"""
+
+
+def _encode(password: str) -> bytes:
+    return password.encode("utf-8")[:BCRYPT_MAX_BYTES]
+
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """Hash password using bcrypt (blocking)"""
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
+    return bcrypt.hashpw(_encode(password), salt).decode("utf-8")
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify password against hash (blocking)"""
+    try:
+        return bcrypt.checkpw(_encode(plain_password), hashed_password.encode("utf-8"))
+    except Exception:
+        return False
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """Cost factor stored in a bcrypt hash ($2b$12$...), None if unrecognised"""
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed_password: str, rounds: Optional[int] = None) -> bool:
+    """Whether a stored hash uses a different cost than the configured one"""
+    return hash_rounds(hashed_password) != (rounds or BCRYPT_ROUNDS)
+
+
+class PasswordHasher:
+    """
+    Bounded executor for bcrypt work
+
+    At most `workers` hashes run at once (bcrypt releases the GIL, so they
+    run in parallel); at most `max_queue` more wait. Beyond that, calls fail
+    fast with PasswordHasherBusyError. stats() exposes queue depth.
+    """
+
+    def __init__(
+        self,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_queue: int = PASSWORD_HASH_MAX_QUEUE,
+        rounds: int = BCRYPT_ROUNDS
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0  # submitted, not finished (queued + running)
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._max_pending = 0
+
+    def _run(self, fn, *args):
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                self._completed += 1
+
+    def _admit(self):
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordHasherBusyError("Password hashing queue is full")
+            self._pending += 1
+            self._max_pending = max(self._max_pending, self._pending)
+
+    async def _submit(self, fn, *args):
+        self._admit()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._run, fn, *args)
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._submit(verify_password, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return needs_rehash(hashed_password, self.rounds)
+
+    def hash_sync(self, password: str) -> str:
+        """For sync callers (already off the event loop); still bounded by the pool"""
+        self._admit()
+        return self._executor.submit(self._run, hash_password, password, self.rounds).result()
+
+    def verify_sync(self, password: str, hashed_password: str) -> bool:
+        self._admit()
+        return self._executor.submit(self._run, verify_password, password, hashed_password).result()
+
+    def stats(self) -> Dict[str, int]:
+        """Queue-depth metrics"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "max_pending": self._max_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+
+_hasher: Optional[PasswordHasher] = None
+_hasher_lock = threading.Lock()
+
+
+# Factory function
+def get_password_hasher() -> PasswordHasher:
+    """Process-wide hasher"""
+    global _hasher
+    with _hasher_lock:
+        if _hasher is None:
+            _hasher = PasswordHasher()
+        return _hasher
@@ -0,0 +1,110 @@
+"""
+Query Profiler
+Statement count, duplicate statements and DB time per request or code block
+"""
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Statement text shown per line in a report
+REPORT_STATEMENT_CHARS = 200
+
+
+class QueryProfile:
+    """
+    SQL statements run during one request or profile_queries() block
+
+    With `track_statements`, each distinct statement text is counted too:
+    one that runs again and again with different parameters is the N+1
+    signature (a lazy relationship or a lookup inside a loop).
+    """
+    __slots__ = ("queries", "seconds", "statements")
+
+    def __init__(self, track_statements: bool = False):
+        self.queries = 0
+        self.seconds = 0.0
+        self.statements: Optional[Counter] = Counter() if track_statements else None
+
+    def record(self, statement: str, seconds: float):
+        self.queries += 1
+        self.seconds += seconds
+        if self.statements is not None:
+            self.statements[statement] += 1
+
+    @property
+    def duplicates(self) -> Dict[str, int]:
+        """Statements run more than once, with how often"""
+        if not self.statements:
+            return {}
+        return {statement: count for statement, count in self.statements.items() if count > 1}
+
+    @property
+    def duplicate_count(self) -> int:
+        """Executions that repeated an earlier statement"""
+        return sum(count - 1 for count in self.duplicates.values())
+
+    def server_timing(self) -> str:
+        """Server-Timing header value (shown in the browser's network panel)"""
+        return f'db;dur={self.seconds * 1000:.2f};desc="{self.queries} queries, {self.duplicate_count} duplicate"'
+
+    def report(self) -> str:
+        lines = [f"{self.queries} statements ({self.duplicate_count} duplicate) in {self.seconds * 1000:.2f} ms"]
+        for statement, count in (self.statements or Counter()).most_common():
+            text = " ".join(statement.split())
+            if len(text) > REPORT_STATEMENT_CHARS:
+                text = text[:REPORT_STATEMENT_CHARS] + "..."
+            lines.append(f"  {count}x {text}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile_queries():
+    """
+    Record every statement this process executes while the block runs
+
+    Listens on all engines (including ones created inside the block and the
+    sync side of async engines) in every thread, so it also sees requests a
+    TestClient serves from its own thread. Meant for tests and dev scripts:
+    live requests are profiled one by one by the metrics middleware.
+
+        with profile_queries() as profile:
+            client.get("/api/doctors/search")
+        print(profile.report())
+    """
+    profile = QueryProfile(track_statements=True)
+    started_key = ("query_profiler", id(profile))
+    lock = threading.Lock()
+
+    def finish(conn, statement):
+        started = conn.info.pop(started_key, None)
+        if started is not None:
+            with lock:
+                profile.record(statement, time.perf_counter() - started)
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info[started_key] = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        finish(conn, statement)
+
+    def handle_error(context):
+        if context.connection is not None:
+            finish(context.connection, context.statement)
+
+    listeners = [
+        ("before_cursor_execute", before_cursor_execute),
+        ("after_cursor_execute", after_cursor_execute),
+        ("handle_error", handle_error),
+    ]
+    for name, listener in listeners:
+        event.listen(Engine, name, listener)
+    try:
+        yield profile
+    finally:
+        for name, listener in listeners:
+            event.remove(Engine, name, listener)
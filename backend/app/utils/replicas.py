@@ -0,0 +1,162 @@
+"""
+Read Replica Routing
+Round-robin over health-checked replica engines, with read-your-writes stickiness
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", "5"))
+REPLICA_HEALTH_TIMEOUT = float(os.getenv("REPLICA_HEALTH_TIMEOUT", "1"))
+# After a client's own write its reads go to the primary for this long
+# (covers normal replication lag)
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_YOUR_WRITES_COOKIE = "medrate_rw"
+
+# Clients without cookies (bearer-token API clients): sha256(token) -> primary-until
+_recent_writers = TTLCache(ttl=READ_YOUR_WRITES_SECONDS, max_entries=50000)
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    healthy: bool = True
+    failures: int = 0
+    last_checked: float = 0.0
+    sessionmaker: async_sessionmaker = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.sessionmaker = async_sessionmaker(self.engine, autoflush=False, expire_on_commit=False)
+
+
+class ReplicaPool:
+    """
+    Replica engines for read-only sessions
+
+    pick() hands out healthy replicas round-robin and returns None when
+    there are none, so callers fall back to the primary.
+    """
+
+    def __init__(self, engines: Optional[List[AsyncEngine]] = None):
+        self.replicas = [
+            Replica(name=engine.url.render_as_string(hide_password=True), engine=engine)
+            for engine in engines or []
+        ]
+        self._next = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self) -> Optional[Replica]:
+        """Next healthy replica, round-robin"""
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next % len(self.replicas)]
+            self._next += 1
+            if replica.healthy:
+                return replica
+        return None
+
+    def mark_unhealthy(self, replica: Replica, error: Exception = None):
+        if replica.healthy:
+            logger.warning("replica marked unhealthy", extra={"replica": replica.name, "error": str(error)})
+        replica.healthy = False
+        replica.failures += 1
+
+    async def check(self, replica: Replica) -> bool:
+        """SELECT 1 against a replica and record the result"""
+        replica.last_checked = time.monotonic()
+        try:
+            async with replica.engine.connect() as conn:
+                await asyncio.wait_for(conn.execute(text("SELECT 1")), REPLICA_HEALTH_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.mark_unhealthy(replica, e)
+            return False
+        if not replica.healthy:
+            logger.info("replica healthy again", extra={"replica": replica.name})
+        replica.healthy = True
+        replica.failures = 0
+        return True
+
+    async def check_all(self) -> List[bool]:
+        return await asyncio.gather(*[self.check(replica) for replica in self.replicas])
+
+    async def dispose(self):
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+async def run_replica_health_checks(pool: ReplicaPool, interval: float = REPLICA_HEALTH_INTERVAL):
+    """Background task: re-check every replica each interval"""
+    while True:
+        await pool.check_all()
+        await asyncio.sleep(interval)
+
+
+def _writer_key(authorization: Optional[str]) -> Optional[str]:
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+
+
+def record_write(request, response, now: Optional[float] = None):
+    """Pin this client's reads to the primary for READ_YOUR_WRITES_SECONDS"""
+    until = (now or time.time()) + READ_YOUR_WRITES_SECONDS
+    response.set_cookie(
+        READ_YOUR_WRITES_COOKIE,
+        str(int(until) + 1),
+        max_age=int(READ_YOUR_WRITES_SECONDS) + 1,
+        httponly=True,
+        samesite="lax"
+    )
+    key = _writer_key(request.headers.get("authorization"))
+    if key:
+        _recent_writers.set(key, until)
+
+
+def needs_primary(request, now: Optional[float] = None) -> bool:
+    """Whether this client wrote recently enough that a replica may be stale"""
+    now = now or time.time()
+    cookie = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    if cookie:
+        try:
+            if float(cookie) > now:
+                return True
+        except ValueError:
+            pass
+    key = _writer_key(request.headers.get("authorization"))
+    return bool(key) and (_recent_writers.get(key) or 0) > now
+
+
+async def replica_session(pool: ReplicaPool, primary: async_sessionmaker, request=None):
+    """
+    Read-only session: a healthy replica, or the primary when the client
+    wrote recently or no replica is available
+
+    session.info["replica"] names the replica used (None for the primary).
+    """
+    replica = None
+    if pool and not (request is not None and needs_primary(request)):
+        replica = pool.pick()
+    factory = replica.sessionmaker if replica else primary
+    async with factory() as session:
+        session.info["replica"] = replica.name if replica else None
+        try:
+            yield session
+        except Exception as e:
+            if replica is not None and getattr(e, "connection_invalidated", False):
+                pool.mark_unhealthy(replica, e)
+            raise
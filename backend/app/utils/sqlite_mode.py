@@ -0,0 +1,204 @@
+"""
+SQLite Production Mode
+WAL journal, per-connection pragmas and an in-process single-writer gate
+"""
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import MissingGreenlet, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.util import await_only
+
+# Applied to every new connection; journal_mode=WAL persists in the file but
+# is cheap to re-assert
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    # Durable across application crashes; only an OS crash can lose the
+    # last commits (fsync at checkpoints instead of every commit)
+    "synchronous": "NORMAL",
+    "busy_timeout": int(float(os.getenv("SQLITE_BUSY_TIMEOUT", "20")) * 1000),
+    "cache_size": -int(os.getenv("SQLITE_CACHE_KB", "65536")),  # negative = KiB
+    "mmap_size": int(os.getenv("SQLITE_MMAP_BYTES", str(256 * 1024 * 1024))),
+    "temp_store": "MEMORY",
+}
+SQLITE_WRITE_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "20"))
+# A sync session writing on the event loop thread blocks the loop while it
+# waits, and a holder on the same loop cannot finish meanwhile: give up fast
+SQLITE_LOOP_WRITE_TIMEOUT = float(os.getenv("SQLITE_LOOP_WRITE_TIMEOUT", "0.5"))
+
+_WRITER_KEY = "sqlite_writer"
+
+
+def _is_sqlite_connection(dbapi_connection) -> bool:
+    return isinstance(dbapi_connection, sqlite3.Connection) or (
+        type(dbapi_connection).__name__ == "AsyncAdapt_aiosqlite_connection"
+    )
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Optional[Dict] = None):
+    """Set pragmas on each new connection of a SQLite engine"""
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        if not _is_sqlite_connection(dbapi_connection):
+            return
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+class SingleWriterGate:
+    """
+    FIFO lock that lets one session at a time write to SQLite
+
+    SQLite allows a single writer; without this, concurrent writers spin on
+    busy_timeout and read-then-write transactions fail outright with
+    "database is locked". Waiters are served in arrival order: threads block
+    in acquire(), coroutines await acquire_async() without blocking the loop.
+    """
+
+    def __init__(self, timeout: float = SQLITE_WRITE_TIMEOUT):
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self._skipped = set()
+        self._async_waiters = {}
+        self._max_waiting = 0
+        self._acquired = 0
+
+    def _take_ticket(self) -> int:
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        self._max_waiting = max(self._max_waiting, self._next_ticket - self._serving - 1)
+        return ticket
+
+    def _give_up(self, ticket: int):
+        # Give up our place; release() steps over it
+        self._skipped.add(ticket)
+        raise OperationalError(
+            "single-writer gate", {}, TimeoutError("timed out waiting for SQLite writer slot")
+        )
+
+    def acquire(self, timeout: Optional[float] = None):
+        with self._cond:
+            ticket = self._take_ticket()
+            deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+            while self._serving != ticket:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    if self._serving == ticket:
+                        break
+                    self._give_up(ticket)
+            self._acquired += 1
+
+    async def acquire_async(self):
+        loop = asyncio.get_running_loop()
+        with self._cond:
+            ticket = self._take_ticket()
+            if self._serving == ticket:
+                self._acquired += 1
+                return
+            waiter = loop.create_future()
+            self._async_waiters[ticket] = (loop, waiter)
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            with self._cond:
+                self._async_waiters.pop(ticket, None)
+                if self._serving != ticket:
+                    self._give_up(ticket)
+        except asyncio.CancelledError:
+            with self._cond:
+                self._async_waiters.pop(ticket, None)
+                served = self._serving == ticket
+                if not served:
+                    self._skipped.add(ticket)
+            if served:
+                # Served just as we were cancelled: pass the slot on
+                self.release()
+            raise
+        with self._cond:
+            self._acquired += 1
+
+    def release(self):
+        with self._cond:
+            self._serving += 1
+            while self._serving in self._skipped:
+                self._skipped.discard(self._serving)
+                self._serving += 1
+            self._cond.notify_all()
+            if self._serving in self._async_waiters:
+                loop, waiter = self._async_waiters.pop(self._serving)
+                loop.call_soon_threadsafe(_wake, waiter)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "waiting": max(0, self._next_ticket - self._serving - 1),
+                "max_waiting": self._max_waiting,
+                "writes": self._acquired,
+            }
+
+
+def _wake(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def serialize_writes(session_factory, gate: SingleWriterGate):
+    """
+    Hold the gate from a session's first write until its transaction ends
+
+    Only writing sessions take the gate; plain reads never wait. Works with a
+    sessionmaker or an async_sessionmaker (whose sessions wait on the gate
+    without blocking the event loop).
+    """
+    target = session_factory
+    if isinstance(session_factory, async_sessionmaker):
+        # Session events fire on the sync session behind each AsyncSession;
+        # a subclass keeps the listeners off every other Session
+        sync_session_class = session_factory.kw.get("sync_session_class") or AsyncSession.sync_session_class
+        target = type("GatedSession", (sync_session_class,), {})
+        session_factory.configure(sync_session_class=target)
+
+    def _acquire(session):
+        if session.info.get(_WRITER_KEY):
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Worker thread: blocking here holds up nobody else
+            gate.acquire()
+        else:
+            try:
+                # AsyncSession: wait on the loop like any other await
+                await_only(gate.acquire_async())
+            except MissingGreenlet:
+                # Sync session on the loop thread: only a short, bounded wait
+                gate.acquire(timeout=SQLITE_LOOP_WRITE_TIMEOUT)
+        session.info[_WRITER_KEY] = True
+
+    @event.listens_for(target, "before_flush")
+    def _before_flush(session, flush_context, instances):
+        _acquire(session)
+
+    @event.listens_for(target, "do_orm_execute")
+    def _before_bulk_dml(orm_execute_state):
+        # session.execute(update(...)) and friends skip the flush
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            _acquire(orm_execute_state.session)
+
+    @event.listens_for(target, "after_transaction_end")
+    def _release(session, transaction):
+        # Commit, rollback or close of the outermost transaction (not savepoints)
+        if transaction.parent is None and session.info.pop(_WRITER_KEY, False):
+            gate.release()
@@ -0,0 +1,138 @@
+"""
+Structured Logging
+JSON-lines logging through a queue, so request handlers never block on stdout
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import traceback
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+# Loggers configured here; modules log with logging.getLogger(__name__)
+APP_LOGGERS = ("app", "src")
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Fraction of successful (< 400) requests that get an access log line
+SUCCESS_SAMPLE_RATE = float(os.getenv("LOG_SUCCESS_SAMPLE_RATE", "0.01"))
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed via `extra`
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_debug_requests = os.getenv("DEBUG_REQUEST_LOGGING", "false").lower() == "true"
+_level = LOG_LEVEL
+_listener: Optional[logging.handlers.QueueListener] = None
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, request_id and extras"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and key != "request_id":
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = "".join(traceback.format_exception(*record.exc_info))
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _RequestContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    Captures the request id in the calling task before the record is queued
+
+    Only the exception text is rendered here; JSON formatting and the write
+    happen on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.request_id = request_id_var.get()
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info))
+            record.exc_info = None
+        # Resolve %-args now: they may reference objects that change later
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def configure_logging(stream=None, level: str = LOG_LEVEL) -> logging.handlers.QueueListener:
+    """
+    Route the app loggers through a queue to a background JSON writer
+
+    Idempotent; returns the running listener. The loggers drop to DEBUG
+    while DEBUG_REQUEST_LOGGING is on, so the request dumps get through.
+    """
+    global _listener, _level
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter())
+        _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=False)
+        _listener.start()
+        atexit.register(stop_logging)
+
+        handler = _RequestContextQueueHandler(log_queue)
+        _level = level
+        for name in APP_LOGGERS:
+            logger = logging.getLogger(name)
+            logger.handlers = [handler]
+            logger.propagate = False
+        _apply_level()
+        return _listener
+
+
+def _apply_level():
+    level = logging.DEBUG if _debug_requests else _level
+    for name in APP_LOGGERS:
+        logging.getLogger(name).setLevel(level)
+
+
+def stop_logging():
+    """Flush queued records and stop the background writer"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            for name in APP_LOGGERS:
+                logging.getLogger(name).handlers = []
+            _listener = None
+
+
+def sample_success() -> bool:
+    """Whether to log this successful request (LOG_SUCCESS_SAMPLE_RATE)"""
+    return SUCCESS_SAMPLE_RATE >= 1.0 or random.random() < SUCCESS_SAMPLE_RATE
+
+
+def debug_requests_enabled() -> bool:
+    return _debug_requests
+
+
+def set_debug_requests(enabled: bool):
+    """Toggle per-request debug dumps at runtime (DEBUG_REQUEST_LOGGING at startup)"""
+    global _debug_requests
+    _debug_requests = enabled
+    _apply_level()
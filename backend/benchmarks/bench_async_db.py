@@ -0,0 +1,159 @@
+"""
+Benchmark: sync Session vs AsyncSession under concurrent doctor searches
+
+Runs the doctor search on one event loop the way the old route did (sync
+Session queried inside an async handler) and through get_async_db
+(aiosqlite + run_sync). Alongside the searches, a cheap /ping endpoint is
+polled every 2 ms to show how long the event loop stalls.
+
+Run from backend/:  python -m benchmarks.bench_async_db [doctors] [requests] [concurrency]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.database import Base, async_database_url, get_async_db
+from app.models.enhanced_models import Doctor, SubscriptionPlan, VerificationStatus
+from app.routes import doctors
+
+PING_INTERVAL = 0.002
+
+SEARCH = dict(
+    q="cardio", specialization=None, location="Durban", rating=None, verified=True,
+    medicalAid=None, telehealth=None, lat=None, lng=None, radius_km=25, sort="relevance",
+    page=1, limit=20, cursor=None, count="exact"
+)
+
+
+def seed(url, count):
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    plans = list(SubscriptionPlan)
+    specialities = ["Cardiologist", "General Practitioner", "Dermatologist", "Paediatrician"]
+    with Session(engine) as db:
+        db.add_all(
+            Doctor(
+                user_id=f"user-{i}",
+                display_name=f"Dr. {i}",
+                specialization=specialities[i % len(specialities)],
+                practice_city="Durban" if i % 3 else "Cape Town",
+                practice_province="KwaZulu-Natal",
+                bio="Cardiology and general care" if i % 5 == 0 else "Family medicine",
+                verification_status=VerificationStatus.VERIFIED,
+                subscription_plan=plans[i % len(plans)],
+                rating_avg=(i % 50) / 10,
+                total_reviews=i % 40,
+            )
+            for i in range(count)
+        )
+        db.commit()
+    return engine
+
+
+def build_app(sync_engine, url):
+    SyncSession = sessionmaker(bind=sync_engine)
+    async_engine = create_async_engine(
+        async_database_url(url), poolclass=AsyncAdaptedQueuePool, pool_size=5, max_overflow=10
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    app = FastAPI()
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    @app.get("/sync-search")
+    async def sync_search():
+        # What the route did before: blocking queries on the event loop
+        with SyncSession() as db:
+            return doctors._search_doctors(db, **SEARCH)
+
+    @app.get("/async-search")
+    async def async_search(db: AsyncSession = Depends(get_async_db)):
+        return await db.run_sync(doctors._search_doctors, **SEARCH)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app, async_engine
+
+
+async def run(app, path, requests, concurrency):
+    """Search throughput plus /ping latency sampled while the searches run"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(requests))
+        ping_ms = []
+        done = asyncio.Event()
+
+        async def worker():
+            for _ in remaining:
+                response = await client.get(path)
+                assert response.json()["success"]
+
+        async def pinger():
+            # Latency from when the ping was due, so time spent waiting for a
+            # blocked loop counts
+            while True:
+                due = time.perf_counter() + PING_INTERVAL
+                await asyncio.sleep(PING_INTERVAL)
+                await client.get("/ping")
+                ping_ms.append((time.perf_counter() - due) * 1000)
+                if done.is_set():
+                    break
+
+        ping_task = asyncio.create_task(pinger())
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+        done.set()
+        await ping_task
+
+    ping_ms.sort()
+    return {
+        "rps": requests / elapsed,
+        "ping_p50": statistics.median(ping_ms),
+        "ping_p99": ping_ms[int(len(ping_ms) * 0.99) - 1] if len(ping_ms) > 1 else ping_ms[0],
+        "ping_max": ping_ms[-1],
+    }
+
+
+async def main(count=5000, requests=400, concurrency=20):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        sync_engine = seed(url, count)
+        app, async_engine = build_app(sync_engine, url)
+
+        await run(app, "/async-search", 20, 4)  # warm up pools and caches
+        results = {
+            "sync Session (blocking)": await run(app, "/sync-search", requests, concurrency),
+            "AsyncSession (aiosqlite)": await run(app, "/async-search", requests, concurrency),
+        }
+        await async_engine.dispose()
+        sync_engine.dispose()
+
+    print(f"{requests} searches over {count} doctors, concurrency {concurrency}")
+    print(f"{'':26} {'search/s':>9} {'ping p50':>9} {'ping p99':>9} {'ping max':>9}")
+    for name, r in results.items():
+        print(
+            f"{name:26} {r['rps']:9.1f} {r['ping_p50']:7.2f}ms "
+            f"{r['ping_p99']:7.2f}ms {r['ping_max']:7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    asyncio.run(main(*args))
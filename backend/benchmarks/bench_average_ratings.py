@@ -0,0 +1,109 @@
+"""
+Benchmark: per-category average ratings for one doctor
+
+Compares the previous approach (load every Review object, average in Python)
+with the single GROUP BY query and with the running aggregate row.
+
+Run from backend/:  python -m benchmarks.bench_average_ratings [reviews]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.enhanced_models import Doctor, Review
+from app.services.rating_aggregate_service import RatingAggregateService
+
+REPEATS = 20
+
+
+def legacy_average_ratings(db, doctor_id):
+    """The pre-aggregate _calculate_average_ratings (full ORM load + Python passes)"""
+    reviews = db.query(Review).filter(
+        and_(
+            Review.doctor_id == doctor_id,
+            Review.verified_visit == True,
+            Review.is_flagged == False
+        )
+    ).all()
+    if not reviews:
+        return {}
+    return {
+        "overall": round(sum(r.overall_rating for r in reviews) / len(reviews), 2),
+        "communication": round(sum(r.communication_rating or 0 for r in reviews) / len([r for r in reviews if r.communication_rating]), 2) if any(r.communication_rating for r in reviews) else 0.0,
+        "wait_time": round(sum(r.wait_time_rating or 0 for r in reviews) / len([r for r in reviews if r.wait_time_rating]), 2) if any(r.wait_time_rating for r in reviews) else 0.0,
+        "diagnosis_accuracy": round(sum(r.diagnosis_accuracy_rating or 0 for r in reviews) / len([r for r in reviews if r.diagnosis_accuracy_rating]), 2) if any(r.diagnosis_accuracy_rating for r in reviews) else 0.0,
+        "professionalism": round(sum(r.professionalism_rating or 0 for r in reviews) / len([r for r in reviews if r.professionalism_rating]), 2) if any(r.professionalism_rating for r in reviews) else 0.0
+    }
+
+
+def seed(db, count):
+    doctor = Doctor(user_id="bench-user", display_name="Dr. Bench", specialization="General Practitioner")
+    db.add(doctor)
+    db.flush()
+    rng = random.Random(42)
+    now = datetime.utcnow()
+
+    def maybe():
+        return rng.randint(1, 5) if rng.random() < 0.7 else None
+
+    db.bulk_insert_mappings(Review, [
+        {
+            "id": f"review-{i}",
+            "patient_id": f"patient-{i}",
+            "doctor_id": doctor.id,
+            "appointment_id": f"appointment-{i}",
+            "overall_rating": rng.randint(1, 5),
+            "communication_rating": maybe(),
+            "wait_time_rating": maybe(),
+            "diagnosis_accuracy_rating": maybe(),
+            "professionalism_rating": maybe(),
+            "verified_visit": True,
+            "is_flagged": rng.random() < 0.05,
+            "created_at": now - timedelta(days=rng.randint(0, 400)),
+        }
+        for i in range(count)
+    ])
+    db.commit()
+    return doctor.id
+
+
+def timed(label, fn):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        result = fn()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / REPEATS
+    print(f"{label:<28} {elapsed_ms:9.2f} ms")
+    return result, elapsed_ms
+
+
+def main(count=10_000):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    doctor_id = seed(db, count)
+    service = RatingAggregateService(db)
+
+    print(f"{count} reviews for one doctor, SQLite in-memory, mean of {REPEATS} runs")
+
+    def legacy():
+        db.expunge_all()
+        return legacy_average_ratings(db, doctor_id)
+
+    legacy_result, legacy_ms = timed("ORM load + Python", legacy)
+    query_result, query_ms = timed("single GROUP BY query", lambda: service.average_ratings_from_reviews(doctor_id))
+
+    service.rebuild(doctor_id)
+    aggregate_result, aggregate_ms = timed("aggregate row", lambda: service.get_average_ratings(doctor_id))
+
+    assert legacy_result == query_result == aggregate_result, (legacy_result, query_result, aggregate_result)
+    print(f"GROUP BY speed-up: {legacy_ms / query_ms:.0f}x, aggregate row: {legacy_ms / aggregate_ms:.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
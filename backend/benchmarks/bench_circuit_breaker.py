@@ -0,0 +1,75 @@
+"""
+Benchmark: verification calls against a hung provider, with and without the circuit breaker
+
+A local server accepts requests and never answers in time, like a
+provider that is up but stalled. Worker threads call it through
+app.utils.http_client with a short timeout standing in for the real
+10-30 s ones. Without a breaker every call waits out its timeout (and
+retries); with one, calls fail fast to the fallback once the circuit opens.
+
+Run from backend/:  python -m benchmarks.bench_circuit_breaker [calls] [workers]
+"""
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.utils.circuit_breaker import ProviderUnavailableError
+from app.utils.http_client import NO_RETRY, OutboundHTTP, httpx
+
+TIMEOUT = 0.25
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        time.sleep(TIMEOUT * 4)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(url, calls, workers, **breaker_options):
+    outbound = OutboundHTTP(http2=False)
+    http = outbound.client("provider", timeout=TIMEOUT, retry=NO_RETRY, **breaker_options)
+
+    def call(_):
+        start = time.perf_counter()
+        try:
+            http.post(url, json={})
+        except (httpx.HTTPError, ProviderUnavailableError):
+            pass  # adapter returns its "pending" / "manual_review" fallback
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        latencies = sorted(pool.map(call, range(calls)))
+    wall = time.perf_counter() - start
+    circuit = outbound.stats()["provider"]["circuit"]
+    outbound.close()
+    return statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.99) - 1] * 1000, wall, circuit
+
+
+def main(calls=200, workers=8):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/verify"
+
+    results = {
+        "no breaker": run(url, calls, workers, failure_threshold=10 ** 9, max_concurrent=10 ** 9),
+        "breaker (5 failures)": run(url, calls, workers, failure_threshold=5, reset_timeout=30),
+    }
+    server.shutdown()
+
+    print(f"{calls} calls, {workers} workers, provider hung, {TIMEOUT * 1000:.0f} ms timeout")
+    print(f"{'':22} {'p50':>9} {'p99':>9} {'wall':>7}  provider calls")
+    for name, (p50, p99, wall, circuit) in results.items():
+        print(f"{name:22} {p50:7.2f}ms {p99:7.2f}ms {wall:6.2f}s  {circuit['successes'] + circuit['failures']}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:3]])
@@ -0,0 +1,79 @@
+"""
+Benchmark: worker cold import, time and memory
+
+Each row imports modules in a fresh interpreter and reports wall time,
+peak RSS and the number of loaded modules. "app.main" is what a uvicorn
+worker pays before serving; "+ service modules" also imports the
+notification, AI, payment and video modules used by the (currently
+disabled) routers; "+ SDKs used" then touches the third-party SDKs, which
+is the cost a worker only pays once a request needs them.
+
+Run from backend/:  python -m benchmarks.bench_import_time [runs] [backend_dir]
+(pass another checkout's backend/ as backend_dir to compare revisions)
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVICE_MODULES = [
+    "app.services.notification_service",
+    "app.services.ai_service",
+    "app.services.payment_service",
+    "app.adapters.twilio_video_adapter",
+    "app.adapters.user_verification_adapter",
+]
+# Installed SDKs the modules above use
+SDK_MODULES = ["twilio.rest", "sendgrid", "openai", "requests", "redis"]
+
+PROBE = """
+import importlib, json, resource, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        pass  # SDK not installed (eager imports fail here too)
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": elapsed, "rss_mb": rss_kb / 1024, "modules": len(sys.modules)}}))
+"""
+
+
+def measure(modules, backend_dir, runs):
+    samples = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as cwd:  # keep medrate.db out of the tree
+            out = subprocess.run(
+                [sys.executable, "-c", PROBE.format(modules=modules)],
+                cwd=cwd, env={**os.environ, "PYTHONPATH": backend_dir},
+                capture_output=True, text=True, check=True
+            ).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    return (
+        statistics.median(s["seconds"] for s in samples),
+        statistics.median(s["rss_mb"] for s in samples),
+        samples[-1]["modules"],
+    )
+
+
+def main(runs=5, backend_dir=BACKEND_DIR):
+    rows = (
+        ("app.main", ["app.main"]),
+        ("+ service modules", ["app.main", *SERVICE_MODULES]),
+        ("+ SDKs used", ["app.main", *SERVICE_MODULES, *SDK_MODULES]),
+    )
+    print(f"{backend_dir}: median of {runs} fresh interpreters")
+    print(f"{'':20} {'import':>9} {'peak RSS':>10} {'modules':>8}")
+    for name, modules in rows:
+        seconds, rss_mb, count = measure(modules, backend_dir, runs)
+        print(f"{name:20} {seconds * 1000:7.0f}ms {rss_mb:8.1f}MB {count:8d}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 5, os.path.abspath(args[1]) if len(args) > 1 else BACKEND_DIR)
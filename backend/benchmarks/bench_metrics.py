@@ -0,0 +1,96 @@
+"""
+Benchmark: cost of the metrics middleware and DB hooks per request
+
+The same route (three SELECTs on a SQLite file) is served through ASGI in
+process (httpx ASGITransport) by a bare app, by one with MetricsMiddleware
+and pool metrics only (DB_QUERY_METRICS=false), and by one with per-request
+query timing as well. The p50 differences are what /metrics costs a
+request; most of the query timing cost is SQLAlchemy's own event dispatch,
+which any cursor-execute listener switches on.
+
+Run from backend/:  python -m benchmarks.bench_metrics [requests]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+
+from app.middleware.metrics import MetricsMiddleware
+from app.utils.metrics import instrument_engine
+
+QUERIES = 3
+
+
+def build(url, instrumented, query_metrics=False):
+    engine = create_engine(url, pool_size=5, max_overflow=10)
+    if instrumented:
+        instrument_engine(engine, f"bench_{query_metrics}", query_metrics=query_metrics)
+    app = FastAPI()
+
+    @app.get("/doctors/{doctor_id}")
+    async def get_doctor(doctor_id: int):
+        with engine.connect() as conn:
+            for _ in range(QUERIES):
+                conn.execute(text("SELECT :id"), {"id": doctor_id})
+        return {"id": doctor_id}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app, engine
+
+
+async def timed(client, requests):
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        response = await client.get(f"/doctors/{i % 50}")
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+    latencies.sort()
+    return statistics.median(latencies) * 1e6, latencies[int(len(latencies) * 0.99) - 1] * 1e6
+
+
+async def run(url, requests):
+    apps = {
+        "bare": build(url, False),
+        "pool metrics": build(url, True),
+        "+ query timing": build(url, True, query_metrics=True),
+    }
+    clients = {
+        name: httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+        for name, (app, _) in apps.items()
+    }
+    for client in clients.values():
+        await timed(client, 200)  # warm up
+    results = {}
+    # Interleave rounds so drift affects both equally
+    for _ in range(5):
+        for name, client in clients.items():
+            results.setdefault(name, []).append(await timed(client, requests // 5))
+    for client in clients.values():
+        await client.aclose()
+    for _, engine in apps.values():
+        engine.dispose()
+    return {name: tuple(statistics.median(r[i] for r in rounds) for i in range(2)) for name, rounds in results.items()}
+
+
+def main(requests=5000):
+    with tempfile.TemporaryDirectory() as tmp:
+        results = asyncio.run(run(f"sqlite:///{os.path.join(tmp, 'bench.db')}", requests))
+
+    print(f"{requests} GETs ({QUERIES} queries each) through ASGI in process, SQLite")
+    print(f"{'':14} {'p50':>9} {'p99':>9}")
+    for name, (p50, p99) in results.items():
+        print(f"{name:14} {p50:7.1f}us {p99:7.1f}us")
+    for name in ("pool metrics", "+ query timing"):
+        print(f"added by {name} (p50): {results[name][0] - results['bare'][0]:.1f} us")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
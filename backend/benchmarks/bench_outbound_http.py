@@ -0,0 +1,73 @@
+"""
+Benchmark: outbound calls, one connection per call vs the shared keep-alive pool
+
+Sequential GETs against a local HTTP server. "per-call" is the previous
+adapter pattern (module-level requests.get, a new TCP connection each
+time); "shared pool" goes through app.utils.http_client. Plain HTTP on
+loopback, so this understates the win against a remote TLS API, where
+each new connection also pays the round trips and the TLS handshake.
+
+Run from backend/:  python -m benchmarks.bench_outbound_http [calls]
+"""
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from app.utils.http_client import OutboundHTTP
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without this, Nagle plus
+    # delayed ACKs stall every keep-alive response by ~40 ms
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = b'{"status": "OK"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def timed(call, calls):
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.99) - 1] * 1000, sum(latencies)
+
+
+def main(calls=2000):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/geocode"
+
+    outbound = OutboundHTTP(http2=False)
+    http = outbound.client("bench", timeout=10)
+    results = {
+        "per-call (requests.get)": timed(lambda: requests.get(url, timeout=10).json(), calls),
+        "shared pool (httpx)": timed(lambda: http.get(url).json(), calls),
+    }
+    outbound.close()
+    server.shutdown()
+
+    print(f"{calls} sequential GETs, loopback HTTP")
+    print(f"{'':26} {'p50':>8} {'p99':>8} {'calls/s':>9}")
+    for name, (p50, p99, total) in results.items():
+        print(f"{name:26} {p50:6.2f}ms {p99:6.2f}ms {calls / total:9.0f}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,110 @@
+"""
+Benchmark: GET /api/doctors/{id}, rebuilt from the database vs served from the profile cache
+
+Requests go through the ASGI app in process (httpx ASGITransport) against
+a SQLite file read via aiosqlite, cycling over a few popular doctors.
+"uncached" clears the cache before every request, which is what each hit
+cost before; "cached" is a warm in-process tier; "304" adds If-None-Match
+with the ETag the client already holds.
+
+Run from backend/:  python -m benchmarks.bench_profile_cache [requests]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.database import Base, async_database_url, get_read_db
+from app.models.enhanced_models import Doctor, VerificationStatus
+from app.routes import doctors
+from app.services import profile_cache as profile_cache_module
+from app.services.profile_cache import profile_cache
+
+POPULAR = 20
+
+
+def seed(url):
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        rows = [
+            Doctor(
+                user_id=f"user-{i}",
+                display_name=f"Dr. {i}",
+                specialization="Cardiologist",
+                practice_city="Durban",
+                practice_province="KwaZulu-Natal",
+                bio="Cardiology and general care " * 10,
+                languages_spoken=["English", "isiZulu"],
+                verification_status=VerificationStatus.VERIFIED,
+                rating_avg=4.5,
+                total_reviews=120,
+            )
+            for i in range(POPULAR)
+        ]
+        db.add_all(rows)
+        db.commit()
+        ids = [row.id for row in rows]
+    engine.dispose()
+    return ids
+
+
+async def timed(client, paths, requests, headers=None, before=None):
+    latencies = []
+    for i in range(requests):
+        path = paths[i % len(paths)]
+        if before:
+            before()
+        start = time.perf_counter()
+        response = await client.get(path, headers=headers(path) if headers else None)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code in (200, 304)
+    latencies.sort()
+    return statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.99) - 1] * 1000
+
+
+async def run(url, ids, requests):
+    engine = create_async_engine(async_database_url(url))
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def read_db():
+        async with sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(doctors.router, prefix="/api/doctors")
+    app.dependency_overrides[get_read_db] = read_db
+    paths = [f"/api/doctors/{doctor_id}" for doctor_id in ids]
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        uncached = await timed(client, paths, requests, before=profile_cache.clear)
+        etags = {path: (await client.get(path)).headers["etag"] for path in paths}
+        cached = await timed(client, paths, requests)
+        not_modified = await timed(client, paths, requests, headers=lambda path: {"If-None-Match": etags[path]})
+    await engine.dispose()
+    return {"uncached (DB every hit)": uncached, "cached": cached, "304 (If-None-Match)": not_modified}
+
+
+def main(requests=2000):
+    profile_cache_module.get_redis_client = lambda: None  # in-process tier only
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        ids = seed(url)
+        results = asyncio.run(run(url, ids, requests))
+
+    print(f"{requests} GET /api/doctors/{{id}} over {POPULAR} doctors, in-process ASGI, SQLite")
+    print(f"{'':26} {'p50':>8} {'p99':>8}")
+    for name, (p50, p99) in results.items():
+        print(f"{name:26} {p50:6.3f}ms {p99:6.3f}ms")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,84 @@
+"""
+Benchmark: per-request logging overhead
+
+Compares the previous middleware logging (seven print(..., flush=True) calls
+per request) with the queue-backed JSON logger at the default success sample
+rate, writing to a real file so flushes hit the OS.
+
+Run from backend/:  python -m benchmarks.bench_request_logging [requests]
+"""
+import contextlib
+import logging
+import sys
+import tempfile
+import threading
+import time
+
+from app.utils import structured_logging
+from app.utils.structured_logging import configure_logging, request_id_var, sample_success, stop_logging
+
+THREADS = 8
+
+
+def legacy_request(i):
+    print(f"\n{'='*60}", flush=True)
+    print("[DEBUG] ===== NEW REQUEST =====", flush=True)
+    print("[DEBUG] Method: GET", flush=True)
+    print("[DEBUG] Path: /api/doctors/search", flush=True)
+    print(f"[DEBUG] Full URL: http://localhost/api/doctors/search?q={i}", flush=True)
+    print("[DEBUG] Response status: 200", flush=True)
+    print("[DEBUG] Response content-type: application/json", flush=True)
+
+
+logger = logging.getLogger("app.main")
+
+
+def structured_request(i):
+    token = request_id_var.set(f"req-{i}")
+    try:
+        if sample_success():
+            logger.info("request completed", extra={
+                "method": "GET", "path": "/api/doctors/search", "status": 200, "duration_ms": 1.0
+            })
+    finally:
+        request_id_var.reset(token)
+
+
+def run(fn, count):
+    """Call fn from THREADS threads (like a threadpool of workers); per-call microseconds"""
+    per_thread = count // THREADS
+
+    def worker(offset):
+        for i in range(per_thread):
+            fn(offset + i)
+
+    threads = [threading.Thread(target=worker, args=(t * per_thread,)) for t in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return (time.perf_counter() - start) * 1_000_000 / (per_thread * THREADS)
+
+
+def main(count=40_000):
+    with tempfile.TemporaryFile("w") as sink:
+        with contextlib.redirect_stdout(sink):
+            legacy_us = run(legacy_request, count)
+
+        stop_logging()
+        configure_logging(stream=sink)
+        structured_us = run(structured_request, count)
+
+        structured_logging.SUCCESS_SAMPLE_RATE = 1.0
+        unsampled_us = run(structured_request, count)
+        stop_logging()
+
+    print(f"{count} requests on {THREADS} threads, output to a file")
+    print(f"7 x print(flush=True)            {legacy_us:7.2f} us/request")
+    print(f"queue JSON logger, 1% sampled    {structured_us:7.2f} us/request")
+    print(f"queue JSON logger, every request {unsampled_us:7.2f} us/request")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40_000)
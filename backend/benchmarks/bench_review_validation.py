@@ -0,0 +1,153 @@
+"""
+Benchmark: review eligibility checks before and after the single-statement query
+
+The previous validate_review_creation ran five lookups (user, appointment,
+existing review, the unused user-doctor count, 24-hour count); it is kept
+here with the column names corrected. Both run every check on an eligible
+visit, against a SQLite file and then with a simulated network round trip
+added to each statement, which is what a separate database server charges.
+
+Run from backend/:  python -m benchmarks.bench_review_validation [calls] [rtt_ms]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.enhanced_models import Appointment, AppointmentStatus, Doctor, Review, User
+from app.services.review_validity_service import ReviewValidityService
+
+PATIENTS = 2000
+DOCTORS = 200
+APPOINTMENTS_PER_PATIENT = 5
+
+
+def legacy_validate(db, user_id, doctor_id, appointment_id):
+    """The previous sequence of lookups (column names corrected)"""
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user or not user.verified:
+        return False
+    appointment = db.query(Appointment).filter(
+        and_(
+            Appointment.id == appointment_id,
+            Appointment.patient_id == user_id,
+            Appointment.doctor_id == doctor_id
+        )
+    ).first()
+    if not appointment or appointment.status != AppointmentStatus.COMPLETED or not appointment.checked_in:
+        return False
+    if (datetime.utcnow() - appointment.start_time).days > 90:
+        return False
+    existing_review = db.query(Review).filter(
+        and_(Review.patient_id == user_id, Review.appointment_id == appointment_id)
+    ).first()
+    if existing_review:
+        return False
+    db.query(Review).filter(and_(Review.patient_id == user_id, Review.doctor_id == doctor_id)).count()
+    recent_reviews = db.query(Review).filter(
+        and_(Review.patient_id == user_id, Review.created_at >= datetime.utcnow() - timedelta(hours=24))
+    ).count()
+    return recent_reviews < 10
+
+
+def seed(db):
+    """Patients with a few reviewed visits each and one unreviewed, eligible visit"""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    db.bulk_insert_mappings(User, [
+        {"id": f"patient-{p}", "email": f"p{p}@example.com", "phone": f"+2782{p:07d}",
+         "full_name": f"Patient {p}", "verified": True}
+        for p in range(PATIENTS)
+    ])
+    db.bulk_insert_mappings(Doctor, [
+        {"id": f"doctor-{d}", "user_id": f"doctor-user-{d}", "display_name": f"Dr. {d}",
+         "specialization": "General Practitioner"}
+        for d in range(DOCTORS)
+    ])
+    appointments, reviews, eligible = [], [], []
+    for p in range(PATIENTS):
+        for a in range(APPOINTMENTS_PER_PATIENT):
+            appointment = {
+                "id": f"appointment-{p}-{a}", "patient_id": f"patient-{p}",
+                "doctor_id": f"doctor-{rng.randrange(DOCTORS)}",
+                "start_time": now - timedelta(days=rng.randint(1, 60)),
+                "status": AppointmentStatus.COMPLETED, "checked_in": True,
+            }
+            appointments.append(appointment)
+            if a:
+                reviews.append({
+                    "id": f"review-{p}-{a}", "patient_id": appointment["patient_id"],
+                    "doctor_id": appointment["doctor_id"], "appointment_id": appointment["id"],
+                    "overall_rating": rng.randint(1, 5), "created_at": now - timedelta(hours=rng.randint(1, 2000)),
+                })
+            else:
+                eligible.append((appointment["patient_id"], appointment["doctor_id"], appointment["id"]))
+    db.bulk_insert_mappings(Appointment, appointments)
+    db.bulk_insert_mappings(Review, reviews)
+    db.commit()
+    return eligible
+
+
+def timed(fn, cases, calls):
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        assert fn(*cases[i % len(cases)])
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return statistics.median(latencies) * 1e6, latencies[int(len(latencies) * 0.99) - 1] * 1e6
+
+
+def run(engine, cases, calls):
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    service = ReviewValidityService(db)
+    paths = {
+        "before (5 queries)": lambda *case: legacy_validate(db, *case),
+        "after (1 query)": lambda *case: service.validate_review_creation(*case, rating=5)["valid"],
+    }
+    for fn in paths.values():
+        timed(fn, cases, 200)  # warm up
+    results = {}
+    # Interleave rounds so drift affects both equally
+    for _ in range(5):
+        for name, fn in paths.items():
+            results.setdefault(name, []).append(timed(fn, cases, calls // 5))
+            db.expunge_all()
+    db.close()
+    return {name: tuple(statistics.median(r[i] for r in rounds) for i in range(2)) for name, rounds in results.items()}
+
+
+def main(calls=5000, rtt_ms=0.2):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as db:
+            cases = seed(db)
+
+        print(f"{calls} validations of eligible visits ({PATIENTS} patients, {len(cases) * (APPOINTMENTS_PER_PATIENT - 1)} reviews)")
+        print(f"{'':28} {'p50':>9} {'p99':>9}")
+        for label, rtt in (("SQLite file", 0), (f"+ {rtt_ms} ms per round trip", rtt_ms / 1000)):
+            def network(*args):
+                time.sleep(rtt)
+
+            if rtt:
+                event.listen(engine, "before_cursor_execute", network)
+            results = run(engine, cases, calls if not rtt else calls // 5)
+            if rtt:
+                event.remove(engine, "before_cursor_execute", network)
+            print(label)
+            for name, (p50, p99) in results.items():
+                print(f"  {name:26} {p50:7.1f}us {p99:7.1f}us")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]], *[float(a) for a in sys.argv[2:3]])
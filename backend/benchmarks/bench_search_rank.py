@@ -0,0 +1,98 @@
+"""
+Benchmark: first page of verified doctor search, query-time sort vs search_rank
+
+The previous order (plan, rating, review count, id) has to sort every
+matching row before LIMIT; ordering by search_rank, id reads the
+(verification_status, search_rank, id) index in order and stops once the
+page is full. A selective filter (one small city) is included: there the
+ordered scan walks further before it fills a page.
+
+Run from backend/:  python -m benchmarks.bench_search_rank [doctors]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, func, or_
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.enhanced_models import Doctor, SubscriptionPlan, VerificationStatus, doctor_search_rank
+from app.routes.doctors import DOCTOR_KEYSET
+
+CALLS = 300
+LIMIT = 20
+SPECIALIZATIONS = ["General Practitioner", "Cardiologist", "Dermatologist", "Paediatrician", "Psychiatrist"]
+CITIES = ["Johannesburg", "Cape Town", "Durban", "Pretoria", "Gqeberha", "Bloemfontein"]
+
+LEGACY_ORDER = [
+    Doctor.subscription_plan.desc(),
+    func.coalesce(Doctor.rating_avg, 0.0).desc(),
+    func.coalesce(Doctor.total_reviews, 0).desc(),
+    Doctor.id.desc(),
+]
+
+FILTERS = {
+    "verified only": [],
+    "+ specialization": [Doctor.specialization.ilike("%practitioner%")],
+    "+ small city": [or_(Doctor.practice_city.ilike("%bloemfontein%"), Doctor.practice_province.ilike("%bloemfontein%"))],
+}
+
+
+def seed(db, count):
+    rng = random.Random(42)
+    plans = [SubscriptionPlan.FREE] * 8 + [SubscriptionPlan.BASIC] + [SubscriptionPlan.PREMIUM]
+    statuses = [VerificationStatus.VERIFIED] * 7 + [VerificationStatus.PENDING] * 3
+    rows = []
+    for i in range(count):
+        plan, rating, reviews = rng.choice(plans), round(rng.uniform(1, 5), 2), rng.randint(0, 300)
+        rows.append({
+            "id": f"doctor-{i:07d}", "user_id": f"user-{i}", "display_name": f"Dr. {i}",
+            "specialization": rng.choice(SPECIALIZATIONS),
+            # Bloemfontein is 1% of doctors
+            "practice_city": "Bloemfontein" if rng.random() < 0.01 else rng.choice(CITIES[:-1]),
+            "practice_province": "Gauteng", "verification_status": rng.choice(statuses),
+            "subscription_plan": plan, "rating_avg": rating, "total_reviews": reviews,
+            # Bulk inserts skip the ORM flush hooks
+            "search_rank": doctor_search_rank(plan, rating, reviews),
+        })
+    db.bulk_insert_mappings(Doctor, rows)
+    db.commit()
+
+
+def timed(db, filters, order_by):
+    latencies = []
+    for _ in range(CALLS):
+        start = time.perf_counter()
+        query = db.query(Doctor).filter(Doctor.verification_status == VerificationStatus.VERIFIED, *filters)
+        rows = query.order_by(*order_by).limit(LIMIT + 1).all()
+        latencies.append(time.perf_counter() - start)
+        db.expunge_all()
+    latencies.sort()
+    return statistics.median(latencies) * 1e3, latencies[int(len(latencies) * 0.99) - 1] * 1e3, [d.id for d in rows]
+
+
+def main(count=50000):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as db:
+            seed(db, count)
+            db.connection().exec_driver_sql("ANALYZE")
+            db.commit()
+
+            print(f"first page ({LIMIT}) of verified search, {count} doctors, SQLite file, {CALLS} calls")
+            print(f"{'':18} {'sort p50':>10} {'sort p99':>10} {'rank p50':>10} {'rank p99':>10}")
+            for name, filters in FILTERS.items():
+                legacy = timed(db, filters, LEGACY_ORDER)
+                ranked = timed(db, filters, DOCTOR_KEYSET.order_by())
+                assert legacy[2] == ranked[2], "search_rank must keep the same order"
+                print(f"{name:18} {legacy[0]:8.2f}ms {legacy[1]:8.2f}ms {ranked[0]:8.2f}ms {ranked[1]:8.2f}ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,102 @@
+"""
+Benchmark: concurrent SQLite writes, default settings vs tuned mode
+
+Each writer thread repeatedly reads a doctor, inserts a review and bumps
+the doctor's review count in one transaction (the review-submission
+shape). Default mode is the previous configuration: rollback journal,
+synchronous=FULL, 20 s busy timeout, no write serialization. Tuned mode
+is WAL + synchronous=NORMAL + pragmas + the single-writer gate.
+
+Run from backend/:  python -m benchmarks.bench_sqlite_writes [threads] [writes_per_thread]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.enhanced_models import Doctor, Review
+from app.utils.sqlite_mode import SingleWriterGate, apply_sqlite_pragmas, serialize_writes
+
+
+def make_session_factory(path, tuned):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "timeout": 20},
+        pool_size=5,
+        max_overflow=10
+    )
+    if tuned:
+        apply_sqlite_pragmas(engine)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    if tuned:
+        serialize_writes(factory, SingleWriterGate())
+    with factory() as db:
+        db.add(Doctor(id="doctor-1", user_id="user-1", display_name="Dr. Bench", specialization="GP", total_reviews=0))
+        db.commit()
+    return engine, factory
+
+
+def run(factory, threads, writes):
+    errors = []
+    latencies = []
+    lock = threading.Lock()
+
+    def writer():
+        for _ in range(writes):
+            start = time.perf_counter()
+            try:
+                with factory() as db:
+                    doctor = db.query(Doctor).filter(Doctor.id == "doctor-1").one()
+                    db.add(Review(
+                        patient_id=uuid.uuid4().hex,
+                        doctor_id=doctor.id,
+                        appointment_id=uuid.uuid4().hex,
+                        overall_rating=5,
+                        verified_visit=True
+                    ))
+                    doctor.total_reviews = (doctor.total_reviews or 0) + 1
+                    db.commit()
+            except Exception as e:
+                with lock:
+                    errors.append(type(e).__name__)
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=writer) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else float("nan")
+    return len(latencies) / elapsed, len(errors), p99
+
+
+def main(threads=8, writes=25):
+    results = {}
+    for name, tuned in (("default (journal, FULL)", False), ("tuned (WAL, NORMAL, gate)", True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine, factory = make_session_factory(os.path.join(tmp, "bench.db"), tuned)
+            results[name] = run(factory, threads, writes)
+            engine.dispose()
+
+    print(f"{threads} writer threads x {writes} read-then-write transactions")
+    print(f"{'':28} {'commits/s':>10} {'errors':>7} {'p99':>10}")
+    for name, (rate, errors, p99) in results.items():
+        print(f"{name:28} {rate:10.1f} {errors:7d} {p99:8.1f}ms")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,90 @@
+"""
+Benchmark: worker time-to-first-request, import-time DDL vs migrate-once
+
+Starts uvicorn in a subprocess and polls until the first successful
+response from /health. "import-time DDL" reproduces the previous
+startup, where every worker ran create_all and the search/geo index DDL
+before serving. "migrate once" runs `python -m app.migrate` ahead of time,
+as a deploy does, and then times only the worker start.
+
+Run from backend/:  python -m benchmarks.bench_startup [runs]
+"""
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The startup work app.main used to do on import
+LEGACY_STARTUP = """
+import uvicorn
+from app.database import Base, engine
+from app.models import enhanced_models
+from app.services.geo_index import ensure_geo_indexes
+from app.services.search_index import ensure_doctor_search_index
+Base.metadata.create_all(bind=engine)
+ensure_doctor_search_index(engine)
+ensure_geo_indexes(engine)
+uvicorn.run("app.main:app", host="127.0.0.1", port={port}, log_level="warning")
+"""
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_to_first_request(cmd, cwd, port, timeout=60.0) -> float:
+    env = {**os.environ, "PYTHONPATH": BACKEND_DIR}
+    env.pop("DATABASE_URL", None)  # ./medrate.db in the temp cwd
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError(f"server did not answer within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def run(mode, runs):
+    samples = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as cwd:
+            port = free_port()
+            if mode == "legacy":
+                cmd = [sys.executable, "-c", LEGACY_STARTUP.format(port=port)]
+            else:
+                subprocess.run(
+                    [sys.executable, "-m", "app.migrate"], cwd=cwd, check=True,
+                    env={**os.environ, "PYTHONPATH": BACKEND_DIR}, capture_output=True
+                )
+                cmd = [sys.executable, "-m", "uvicorn", "app.main:app",
+                       "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+            samples.append(time_to_first_request(cmd, cwd, port))
+    return samples
+
+
+def main(runs=5):
+    print(f"time to first /health response, {runs} cold starts each (SQLite)")
+    print(f"{'':24} {'median':>9} {'min':>9} {'max':>9}")
+    for name, mode in (("import-time DDL", "legacy"), ("migrate once", "migrated")):
+        samples = run(mode, runs)
+        print(f"{name:24} {statistics.median(samples) * 1000:7.0f}ms "
+              f"{min(samples) * 1000:7.0f}ms {max(samples) * 1000:7.0f}ms")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,28 @@
+"""
+Gunicorn Configuration
+Uvicorn workers sharing one Prometheus registry through PROMETHEUS_MULTIPROC_DIR
+"""
+import glob
+import os
+
+# Must be set before prometheus_client is imported, here and in the workers
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/medrate-metrics")
+
+from prometheus_client import multiprocess  # noqa: E402
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+
+def on_starting(server):
+    """Start from empty metric files; ones left by a previous run would be summed in"""
+    directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, "*.db")):
+        os.remove(path)
+
+
+def child_exit(server, worker):
+    """Drop a dead worker's live gauges (in-flight requests, pool usage)"""
+    multiprocess.mark_process_dead(worker.pid)
@@ -3,9 +3,10 @@ HPCSA (Health Professions Council of South Africa) Adapter
 Mock and real implementations for doctor credential verification
 """
 import os
-import requests
 from typing import Dict, Optional, Any
 from datetime import datetime
+from app.utils.circuit_breaker import ProviderUnavailableError
+from app.utils.http_client import get_outbound_http, httpx
 
 
 class HPCSAAdapter:
@@ -15,6 +16,7 @@ class HPCSAAdapter:
         self.api_url = os.getenv("HPCSA_API_URL", "https://api.hpcsa.co.za/v1")
         self.api_key = os.getenv("HPCSA_API_KEY")
         self.mock_mode = os.getenv("HPCSA_MOCK_MODE", "true").lower() == "true"
+        self.http = get_outbound_http().client("hpcsa", timeout=float(os.getenv("HPCSA_TIMEOUT", "10")))
     
     def verify_doctor(self, hpcsa_number: str, full_name: str) -> Dict[str, Any]:
         """
@@ -102,11 +104,10 @@ class HPCSAAdapter:
                 "full_name": full_name
             }
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.api_url}/verify",
                 json=payload,
-                headers=headers,
-                timeout=10
+                headers=headers
             )
             
             response.raise_for_status()
@@ -125,7 +126,7 @@ class HPCSAAdapter:
                 "message": data.get("message", "HPCSA verification completed")
             }
             
-        except requests.RequestException as e:
+        except (httpx.HTTPError, ProviderUnavailableError) as e:
             # On API failure, require manual review
             return {
                 "verified": False,
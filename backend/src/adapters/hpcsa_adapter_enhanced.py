@@ -2,13 +2,33 @@
 Enhanced HPCSA Adapter
 Supports API, web scraping, and mock modes
 """
+import functools
 import os
-import requests
 import re
 from typing import Dict, Optional, Any
 from datetime import datetime
-from bs4 import BeautifulSoup  # For web scraping
-from ratelimit import limits, sleep_and_retry
+from app.utils.circuit_breaker import ProviderUnavailableError
+from app.utils.http_client import NO_RETRY, get_outbound_http, httpx
+from app.utils.lazy_imports import lazy_import
+
+# Loaded on the first live lookup; mock mode never needs them
+bs4 = lazy_import("bs4", "beautifulsoup4")  # For web scraping
+ratelimit = lazy_import("ratelimit")
+
+
+def _rate_limited(calls: int, period: int):
+    """ratelimit's @sleep_and_retry @limits, applied on the first call so the package loads lazily"""
+    def decorator(fn):
+        limited = None
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            nonlocal limited
+            if limited is None:
+                limited = ratelimit.sleep_and_retry(ratelimit.limits(calls=calls, period=period)(fn))
+            return limited(*args, **kwargs)
+        return wrapper
+    return decorator
 
 
 class HPCSAAdapterEnhanced:
@@ -20,6 +40,10 @@ class HPCSAAdapterEnhanced:
         self.mock_mode = os.getenv("HPCSA_MOCK_MODE", "true").lower() == "true"
         self.use_web_scraping = os.getenv("HPCSA_USE_WEB_SCRAPING", "false").lower() == "true"
         self.web_scrape_url = os.getenv("HPCSA_WEB_URL", "https://www.hpcsa.co.za/verify")
+        outbound = get_outbound_http()
+        self.http = outbound.client("hpcsa", timeout=float(os.getenv("HPCSA_TIMEOUT", "10")))
+        # The register site is rate limited (see _web_scrape_verify); do not add retries on top
+        self.scrape_http = outbound.client("hpcsa_web", timeout=15, retry=NO_RETRY)
     
     def verify_doctor(
         self,
@@ -138,11 +162,10 @@ class HPCSAAdapterEnhanced:
                 "hpcsa": hpcsa_number
             }
             
-            response = requests.get(
+            response = self.http.get(
                 f"{self.api_url}/verify",
                 params=params,
-                headers=headers,
-                timeout=10
+                headers=headers
             )
             
             response.raise_for_status()
@@ -169,7 +192,7 @@ class HPCSAAdapterEnhanced:
                 "message": "HPCSA API verification completed"
             }
             
-        except requests.RequestException as e:
+        except (httpx.HTTPError, ProviderUnavailableError) as e:
             return {
                 "verified": False,
                 "status": "manual_review",
@@ -179,8 +202,7 @@ class HPCSAAdapterEnhanced:
                 "message": "HPCSA API unavailable, manual review required"
             }
     
-    @sleep_and_retry
-    @limits(calls=10, period=60)  # Rate limit: 10 calls per minute
+    @_rate_limited(calls=10, period=60)  # Rate limit: 10 calls per minute
     def _web_scrape_verify(self, hpcsa_number: str, full_name: str) -> Dict[str, Any]:
         """
         Verify using web scraping (rate-limited, compliant)
@@ -195,10 +217,9 @@ class HPCSAAdapterEnhanced:
                 "verify": "true"
             }
             
-            response = requests.post(
+            response = self.scrape_http.post(
                 self.web_scrape_url,
                 data=payload,
-                timeout=15,
                 headers={
                     "User-Agent": "RateTheDoctor/1.0 (Compliant Web Scraper)"
                 }
@@ -207,7 +228,7 @@ class HPCSAAdapterEnhanced:
             response.raise_for_status()
             
             # Parse HTML response
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = bs4.BeautifulSoup(response.content, 'html.parser')
             
             # Extract registration details (adjust selectors based on actual site)
             # This is example structure
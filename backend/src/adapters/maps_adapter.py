@@ -3,9 +3,9 @@ Google Maps Adapter
 Mock and real implementations for location services
 """
 import os
-import requests
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from app.utils.http_client import get_outbound_http
 
 
 @dataclass
@@ -28,6 +28,7 @@ class MapsAdapter:
         self.api_key = os.getenv("GOOGLE_MAPS_API_KEY")
         self.mock_mode = os.getenv("GOOGLE_MAPS_MOCK_MODE", "true").lower() == "true"
         self.base_url = "https://maps.googleapis.com/maps/api"
+        self.http = get_outbound_http().client("google_maps", timeout=float(os.getenv("GOOGLE_MAPS_TIMEOUT", "10")))
     
     def geocode(self, address: str) -> Optional[Location]:
         """Convert address to coordinates"""
@@ -155,7 +156,7 @@ class MapsAdapter:
                 "region": "za"  # South Africa
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -177,7 +178,7 @@ class MapsAdapter:
                 "key": self.api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -204,7 +205,7 @@ class MapsAdapter:
                 "units": "metric"
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -240,7 +241,7 @@ class MapsAdapter:
                 "key": self.api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             data = response.json()
             
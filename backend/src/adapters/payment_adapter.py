@@ -5,6 +5,7 @@ Supports Paystack (primary) and Stripe (alternative) with mock mode
 import os
 from typing import Dict, Optional, Literal
 from enum import Enum
+from app.utils.http_client import get_outbound_http
 
 
 class PaymentProvider(Enum):
@@ -28,6 +29,7 @@ class PaymentAdapter:
             self.provider = PaymentProvider.PAYSTACK
         
         self.api_key = os.getenv("PAYMENT_PROVIDER_KEY")
+        self.http = get_outbound_http().client("paystack", timeout=float(os.getenv("PAYSTACK_TIMEOUT", "10")))
     
     def create_subscription(
         self,
@@ -119,8 +121,6 @@ class PaymentAdapter:
         currency: str
     ) -> Dict:
         """Create subscription with Paystack"""
-        import requests
-        
         try:
             url = "https://api.paystack.co/subscription"
             headers = {
@@ -135,7 +135,7 @@ class PaymentAdapter:
                 "currency": currency.lower()
             }
             
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            response = self.http.post(url, json=payload, headers=headers)
             response.raise_for_status()
             data = response.json()
             
@@ -158,15 +158,13 @@ class PaymentAdapter:
     
     def _paystack_verify_payment(self, reference: str) -> Dict:
         """Verify payment with Paystack"""
-        import requests
-        
         try:
             url = f"https://api.paystack.co/transaction/verify/{reference}"
             headers = {
                 "Authorization": f"Bearer {self.api_key}"
             }
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.http.get(url, headers=headers)
             response.raise_for_status()
             data = response.json()
             
@@ -188,15 +186,13 @@ class PaymentAdapter:
     
     def _paystack_cancel_subscription(self, subscription_id: str) -> Dict:
         """Cancel subscription with Paystack"""
-        import requests
-        
         try:
             url = f"https://api.paystack.co/subscription/{subscription_id}"
             headers = {
                 "Authorization": f"Bearer {self.api_key}"
             }
             
-            response = requests.delete(url, headers=headers, timeout=10)
+            response = self.http.delete(url, headers=headers)
             response.raise_for_status()
             data = response.json()
             
@@ -7,6 +7,7 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from ..models import AuditLog, User
 from ipaddress import ip_address
+from app.utils.pagination import InvalidCursorError, Keyset, count_results, paginate, total_pages
 
 
 class AuditService:
@@ -72,9 +73,15 @@ class AuditService:
         admin_id: Optional[str] = None,
         action: Optional[str] = None,
         page: int = 1,
-        limit: int = 50
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact"
     ) -> Dict:
-        """Get audit logs with filters"""
+        """
+        Get audit logs with filters (newest first)
+        Pass cursor (next_cursor of the previous page, "" for the first) for keyset pagination
+        count_mode: exact, estimate or none (total is null, use has_more)
+        """
         from sqlalchemy import and_
         
         query = self.db.query(AuditLog)
@@ -92,10 +99,17 @@ class AuditService:
         if filters:
             query = query.filter(and_(*filters))
         
-        total = query.count()
-        logs = query.order_by(AuditLog.created_at.desc()).offset(
-            (page - 1) * limit
-        ).limit(limit).all()
+        keyset = Keyset(
+            [(AuditLog.created_at, True), (AuditLog.id, True)],
+            key=lambda log: [log.created_at, str(log.id)]
+        )
+        
+        total = count_results(query, count_mode)
+        try:
+            result_page = paginate(query, keyset, limit, page=page, cursor=cursor)
+        except InvalidCursorError:
+            return {"success": False, "error": "Invalid cursor"}
+        logs = result_page.items
         
         return {
             "success": True,
@@ -119,8 +133,10 @@ class AuditService:
                     "page": page,
                     "limit": limit,
                     "total": total,
-                    "total_pages": (total + limit - 1) // limit
-                }
+                    "total_pages": total_pages(total, limit),
+                    "has_more": result_page.has_more
+                },
+                "next_cursor": result_page.next_cursor
             }
         }
 
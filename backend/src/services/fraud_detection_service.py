@@ -3,17 +3,23 @@ Fraud Detection Service
 AI-powered fraud detection for document verification
 """
 import os
+import json
+import asyncio
 import openai
 from typing import Dict, List, Optional
 from datetime import datetime
+from app.adapters.openai_adapter import AsyncOpenAIAdapter, get_openai_adapter
+
+DOCUMENT_ANALYSIS_MODEL = "gpt-4-vision-preview"
 
 
 class FraudDetectionService:
     """Service for detecting fraudulent documents using AI and heuristics"""
     
-    def __init__(self):
+    def __init__(self, openai_adapter: Optional[AsyncOpenAIAdapter] = None):
         self.openai_key = os.getenv("OPENAI_API_KEY")
         self.mock_mode = os.getenv("OPENAI_MOCK_MODE", "false").lower() == "true"
+        self.openai_adapter = openai_adapter or get_openai_adapter()
         
         if not self.mock_mode and self.openai_key:
             openai.api_key = self.openai_key
@@ -31,29 +37,49 @@ class FraudDetectionService:
         - flags: List of suspicious elements
         - confidence: Confidence in analysis (0-1)
         """
-        risk_score = 0
-        flags = []
-        
         # 1. Heuristic checks
         heuristic_results = self._run_heuristic_checks(documents)
-        risk_score += heuristic_results["risk_score"]
-        flags.extend(heuristic_results["flags"])
         
         # 2. AI analysis (if enabled)
         if not self.mock_mode and self.openai_key:
             ai_results = self._run_ai_analysis(documents)
-            risk_score += ai_results["risk_score"]
-            flags.extend(ai_results["flags"])
         else:
             # Mock AI analysis
             ai_results = self._mock_ai_analysis(documents)
-            risk_score += ai_results["risk_score"]
-            flags.extend(ai_results["flags"])
         
         # 3. Document consistency check
         consistency_results = self._check_document_consistency(documents)
-        risk_score += consistency_results["risk_score"]
-        flags.extend(consistency_results["flags"])
+        
+        return self._combine_results(heuristic_results, ai_results, consistency_results)
+    
+    async def analyze_documents_async(
+        self,
+        documents: Dict[str, str]  # {document_type: s3_url}
+    ) -> Dict[str, any]:
+        """
+        Non-blocking analyze_documents for async handlers
+        
+        Documents are analysed concurrently through the shared async OpenAI
+        client (bounded by its concurrency limit and per-call timeout).
+        """
+        heuristic_results = self._run_heuristic_checks(documents)
+        
+        if not self.mock_mode and self.openai_key:
+            ai_results = await self._run_ai_analysis_async(documents)
+        else:
+            ai_results = self._mock_ai_analysis(documents)
+        
+        consistency_results = self._check_document_consistency(documents)
+        
+        return self._combine_results(heuristic_results, ai_results, consistency_results)
+    
+    def _combine_results(self, heuristic_results: Dict, ai_results: Dict, consistency_results: Dict) -> Dict:
+        """Sum the partial risk scores and flags into the final report"""
+        risk_score = 0
+        flags = []
+        for partial in (heuristic_results, ai_results, consistency_results):
+            risk_score += partial["risk_score"]
+            flags.extend(partial["flags"])
         
         # Cap risk score at 100
         risk_score = min(risk_score, 100)
@@ -115,99 +141,138 @@ class FraudDetectionService:
     
     def _run_ai_analysis(self, documents: Dict[str, str]) -> Dict:
         """Run AI-based document analysis using OpenAI Vision"""
-        risk_score = 0
-        flags = []
-        
         try:
             # Analyze each document
-            for doc_type, doc_url in documents.items():
-                analysis = self._analyze_document_with_ai(doc_url, doc_type)
-                
-                if analysis.get("suspicious"):
-                    risk_score += 15
-                    flags.append({
-                        "type": "ai_detected_suspicious",
-                        "severity": "medium",
-                        "document": doc_type,
-                        "message": analysis.get("message", "AI detected suspicious elements"),
-                        "confidence": analysis.get("confidence", 0.7)
-                    })
-                
-                if analysis.get("manipulation_detected"):
-                    risk_score += 25
-                    flags.append({
-                        "type": "image_manipulation",
-                        "severity": "high",
-                        "document": doc_type,
-                        "message": "Possible image manipulation detected"
-                    })
+            analyses = {
+                doc_type: self._analyze_document_with_ai(doc_url, doc_type)
+                for doc_type, doc_url in documents.items()
+            }
+        except Exception as e:
+            return self._ai_failure_result(e)
         
+        return self._score_ai_analyses(analyses)
+    
+    async def _run_ai_analysis_async(self, documents: Dict[str, str]) -> Dict:
+        """Concurrent _run_ai_analysis"""
+        try:
+            results = await asyncio.gather(*[
+                self._analyze_document_with_ai_async(doc_url, doc_type)
+                for doc_type, doc_url in documents.items()
+            ])
         except Exception as e:
-            # If AI analysis fails, increase risk slightly
-            risk_score += 5
-            flags.append({
-                "type": "ai_analysis_failed",
-                "severity": "low",
-                "message": f"AI analysis unavailable: {str(e)}"
-            })
+            return self._ai_failure_result(e)
+        
+        return self._score_ai_analyses(dict(zip(documents.keys(), results)))
+    
+    def _score_ai_analyses(self, analyses: Dict[str, Dict]) -> Dict:
+        risk_score = 0
+        flags = []
+        
+        for doc_type, analysis in analyses.items():
+            if analysis.get("suspicious"):
+                risk_score += 15
+                flags.append({
+                    "type": "ai_detected_suspicious",
+                    "severity": "medium",
+                    "document": doc_type,
+                    "message": analysis.get("message", "AI detected suspicious elements"),
+                    "confidence": analysis.get("confidence", 0.7)
+                })
+            
+            if analysis.get("manipulation_detected"):
+                risk_score += 25
+                flags.append({
+                    "type": "image_manipulation",
+                    "severity": "high",
+                    "document": doc_type,
+                    "message": "Possible image manipulation detected"
+                })
         
         return {
             "risk_score": min(risk_score, 50),  # Cap AI risk at 50
             "flags": flags
         }
     
-    def _analyze_document_with_ai(self, document_url: str, doc_type: str) -> Dict:
-        """Use OpenAI Vision API to analyze document"""
-        try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4-vision-preview",
-                messages=[
+    def _ai_failure_result(self, error: Exception) -> Dict:
+        # If AI analysis fails, increase risk slightly
+        return {
+            "risk_score": 5,
+            "flags": [{
+                "type": "ai_analysis_failed",
+                "severity": "low",
+                "message": f"AI analysis unavailable: {str(error)}"
+            }]
+        }
+    
+    def _document_messages(self, document_url: str, doc_type: str) -> List[Dict]:
+        return [
+            {
+                "role": "system",
+                "content": "You are a document verification expert. Analyze documents for authenticity, signs of manipulation, and verify text consistency."
+            },
+            {
+                "role": "user",
+                "content": [
                     {
-                        "role": "system",
-                        "content": "You are a document verification expert. Analyze documents for authenticity, signs of manipulation, and verify text consistency."
+                        "type": "text",
+                        "text": f"Analyze this {doc_type} document. Check for: 1) Signs of image manipulation or editing, 2) Text consistency and readability, 3) Document authenticity markers. Return JSON with: suspicious (boolean), manipulation_detected (boolean), confidence (0-1), message (string)."
                     },
                     {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"Analyze this {doc_type} document. Check for: 1) Signs of image manipulation or editing, 2) Text consistency and readability, 3) Document authenticity markers. Return JSON with: suspicious (boolean), manipulation_detected (boolean), confidence (0-1), message (string)."
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {"url": document_url}
-                            }
-                        ]
+                        "type": "image_url",
+                        "image_url": {"url": document_url}
                     }
-                ],
+                ]
+            }
+        ]
+    
+    def _parse_document_analysis(self, content: str) -> Dict:
+        # Extract JSON from response
+        try:
+            return json.loads(content)
+        except:
+            # Fallback: parse text response
+            return {
+                "suspicious": "suspicious" in content.lower(),
+                "manipulation_detected": "manipulation" in content.lower(),
+                "confidence": 0.7,
+                "message": content
+            }
+    
+    def _analysis_failed(self, error: Exception) -> Dict:
+        return {
+            "suspicious": False,
+            "manipulation_detected": False,
+            "confidence": 0.5,
+            "message": f"AI analysis failed: {str(error)}"
+        }
+    
+    def _analyze_document_with_ai(self, document_url: str, doc_type: str) -> Dict:
+        """Use OpenAI Vision API to analyze document"""
+        try:
+            response = openai.ChatCompletion.create(
+                model=DOCUMENT_ANALYSIS_MODEL,
+                messages=self._document_messages(document_url, doc_type),
                 max_tokens=200
             )
             
             # Parse response (simplified - in production, use proper JSON parsing)
-            content = response.choices[0].message.content
-            
-            # Extract JSON from response
-            import json
-            try:
-                analysis = json.loads(content)
-            except:
-                # Fallback: parse text response
-                analysis = {
-                    "suspicious": "suspicious" in content.lower(),
-                    "manipulation_detected": "manipulation" in content.lower(),
-                    "confidence": 0.7,
-                    "message": content
-                }
+            return self._parse_document_analysis(response.choices[0].message.content)
             
-            return analysis
+        except Exception as e:
+            return self._analysis_failed(e)
+    
+    async def _analyze_document_with_ai_async(self, document_url: str, doc_type: str) -> Dict:
+        """Non-blocking _analyze_document_with_ai (timeouts count as a failed analysis)"""
+        try:
+            content = await self.openai_adapter.chat_completion(
+                model=DOCUMENT_ANALYSIS_MODEL,
+                messages=self._document_messages(document_url, doc_type),
+                max_tokens=200
+            )
+            return self._parse_document_analysis(content)
             
         except Exception as e:
-            return {
-                "suspicious": False,
-                "manipulation_detected": False,
-                "confidence": 0.5,
-                "message": f"AI analysis failed: {str(e)}"
-            }
+            return self._analysis_failed(e)
     
     def _mock_ai_analysis(self, documents: Dict[str, str]) -> Dict:
         """Mock AI analysis for development"""
@@ -0,0 +1,74 @@
+"""
+Shared Test Fixtures
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from app.database import async_database_url
+from app.middleware import rate_limit
+from app.utils.query_profiler import profile_queries
+
+
+@event.listens_for(Engine, "connect")
+def _skip_fsync(dbapi_connection, connection_record):
+    """Test databases are throwaway; file-backed SQLite need not fsync every DDL statement"""
+    if "sqlite" in type(dbapi_connection).__module__ or "aiosqlite" in type(dbapi_connection).__name__:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.close()
+
+
+@pytest.fixture
+def async_db_override():
+    """
+    Factory for a get_async_db / get_read_db override reading the same SQLite file as a sync engine
+
+    Tests seed data through a sync Session; routes read it through aiosqlite.
+    """
+    def make(sync_engine):
+        async_engine = create_async_engine(
+            async_database_url(sync_engine.url.render_as_string(hide_password=False)),
+            connect_args={"check_same_thread": False},
+            poolclass=NullPool
+        )
+        session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with session_factory() as session:
+                yield session
+
+        return override_get_async_db
+
+    return make
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limits():
+    """Rate limit counters do not carry over between tests"""
+    rate_limit._limiter = rate_limit.RateLimiter()
+    yield
+    rate_limit._limiter = None
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Fail when a block runs more than `n` SQL statements (any engine, any thread)
+
+        with assert_max_queries(2):
+            client.get("/api/doctors/search")
+
+    The failure lists each statement with how often it ran, so an N+1
+    shows up as one statement repeated once per row.
+    """
+    @contextmanager
+    def check(n):
+        with profile_queries() as profile:
+            yield profile
+        assert profile.queries <= n, f"expected at most {n} SQL statements, got {profile.report()}"
+
+    return check
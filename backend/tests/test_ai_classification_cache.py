@@ -0,0 +1,92 @@
+"""
+Tests for the AI Review Classification Cache
+"""
+import pytest
+from app.services import ai_service as ai_module
+from app.services.ai_service import AIService, classification_cache
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the shared Redis tier"""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+
+@pytest.fixture
+def ai_service(monkeypatch):
+    """AI service in mock mode that counts model calls"""
+    monkeypatch.setenv("OPENAI_MOCK_MODE", "true")
+    monkeypatch.setattr(ai_module, "get_redis_client", lambda: None)
+    classification_cache.clear()
+    service = AIService()
+    service.calls = 0
+    uncached = service._classify_review_uncached
+
+    def counting(comment):
+        service.calls += 1
+        return uncached(comment)
+
+    service._classify_review_uncached = counting
+    yield service
+    classification_cache.clear()
+
+
+def test_identical_comments_classified_once(ai_service):
+    first = ai_service.classify_review("Excellent doctor, very professional")
+    second = ai_service.classify_review("Excellent  doctor, very professional\n")
+    assert first == second
+    assert first["sentiment"] == "positive"
+    assert ai_service.calls == 1
+
+    ai_service.classify_review("Terrible wait, poor service")
+    assert ai_service.calls == 2
+
+
+def test_cached_result_is_not_shared(ai_service):
+    result = ai_service.classify_review("Great experience")
+    result["categories"].append("mutated")
+    assert "mutated" not in ai_service.classify_review("Great experience")["categories"]
+
+
+def test_failed_call_is_not_cached(ai_service):
+    ai_service._classify_review_uncached = lambda comment: None
+    assert ai_service.classify_review("Good doctor")["sentiment"] == "positive"
+    assert len(classification_cache) == 0
+
+
+def test_redis_tier(monkeypatch, ai_service):
+    fake = FakeRedis()
+    monkeypatch.setattr(ai_module, "get_redis_client", lambda: fake)
+
+    result = ai_service.classify_review("Wonderful and professional")
+    assert len(fake.store) == 1
+
+    # Another process: empty local tier, warm Redis
+    classification_cache.clear()
+    assert ai_service.classify_review("Wonderful and professional") == result
+    assert ai_service.calls == 1
+
+
+def test_redis_errors_are_logged_and_skipped(monkeypatch, ai_service):
+    class DownRedis:
+        def get(self, key):
+            raise ConnectionError("redis down")
+
+        set = get
+
+    warnings = []
+    monkeypatch.setattr(ai_module, "get_redis_client", lambda: DownRedis())
+    monkeypatch.setattr(ai_module.logger, "warning", lambda msg, *args, **kwargs: warnings.append((msg, kwargs)))
+
+    assert ai_service.classify_review("Great and kind")["sentiment"] == "positive"
+    assert warnings == [
+        ("Classification cache read failed", {"exc_info": True}),
+        ("Classification cache write failed", {"exc_info": True}),
+    ]
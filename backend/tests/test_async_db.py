@@ -0,0 +1,87 @@
+"""
+Tests for the Async Database Path
+"""
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base, async_database_url, get_read_db, get_db
+from app.models.enhanced_models import Doctor, Review
+from app.routes import doctors, reviews
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Create test database file (the routes read it through the async engine)"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(engine):
+    """Create test database session"""
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(engine, db_session, async_db_override):
+    app = FastAPI()
+    app.include_router(doctors.router, prefix="/api/doctors")
+    app.include_router(reviews.router, prefix="/api/reviews")
+    # Reads must not touch the sync session
+    app.dependency_overrides[get_db] = lambda: pytest.fail("sync session used")
+    app.dependency_overrides[get_read_db] = async_db_override(engine)
+    return TestClient(app)
+
+
+@pytest.fixture
+def doctor(db_session):
+    doctor = Doctor(user_id="user-1", display_name="Dr. Naidoo", specialization="Paediatrician")
+    db_session.add(doctor)
+    db_session.commit()
+    return doctor
+
+
+def test_async_database_url():
+    assert async_database_url("sqlite:///./medrate.db") == "sqlite+aiosqlite:///./medrate.db"
+    assert async_database_url("postgresql://u:p@db:5432/medrate") == "postgresql+asyncpg://u:p@db:5432/medrate"
+    assert async_database_url("postgresql+psycopg2://u:p@db/medrate") == "postgresql+asyncpg://u:p@db/medrate"
+
+
+def test_doctor_detail(client, doctor, assert_max_queries):
+    with assert_max_queries(2):
+        response = client.get(f"/api/doctors/{doctor.id}")
+    assert response.json()["data"]["name"] == "Dr. Naidoo"
+    with assert_max_queries(2):
+        assert client.get("/api/doctors/missing").json()["success"] is False
+
+
+def test_review_listing(client, db_session, doctor, assert_max_queries):
+    for i in range(3):
+        db_session.add(Review(
+            patient_id=f"patient-{i}",
+            doctor_id=doctor.id,
+            appointment_id=f"appointment-{i}",
+            overall_rating=i + 3,
+            verified_visit=True,
+            is_flagged=False,
+            created_at=datetime(2024, 1, i + 1)
+        ))
+    db_session.commit()
+
+    with assert_max_queries(5):
+        response = client.get("/api/reviews", params={"doctor_id": doctor.id, "sort": "rating_high", "limit": 2})
+    body = response.json()
+    assert body["success"] is True
+    assert [r["overall_rating"] for r in body["data"]["reviews"]] == [5, 4]
@@ -0,0 +1,162 @@
+"""
+Tests for Provider Circuit Breakers and Bulkheads
+"""
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from app import main
+from app.adapters.user_verification_adapter import UserVerificationAdapter
+from app.utils.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, BulkheadFullError, CircuitBreaker, CircuitOpenError
+)
+from app.utils.http_client import OutboundHTTP
+from src.adapters.hpcsa_adapter_enhanced import HPCSAAdapterEnhanced
+
+DOWN = "http://127.0.0.1:9"  # discard port: nothing listens
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fail(breaker, times=1):
+    for _ in range(times):
+        with pytest.raises(RuntimeError):
+            with breaker.guard():
+                raise RuntimeError("provider down")
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("test", failure_threshold=3, reset_timeout=30, max_concurrent=2, clock=clock)
+
+
+@pytest.fixture
+def outbound():
+    outbound = OutboundHTTP(http2=False)
+    yield outbound
+    outbound.close()
+
+
+def test_opens_after_consecutive_failures(breaker):
+    fail(breaker, 2)
+    with breaker.guard():
+        pass  # a success resets the count
+    fail(breaker, 2)
+    assert breaker.state == CLOSED
+
+    fail(breaker)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        with breaker.guard():
+            pytest.fail("open circuit ran the call")
+    snapshot = breaker.snapshot()
+    assert snapshot["trips"] == 1
+    assert snapshot["rejected_open"] == 1
+
+
+def test_half_open_trial(breaker, clock):
+    fail(breaker, 3)
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+
+    # Trial fails: open again for another reset_timeout
+    fail(breaker)
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["trips"] == 2
+
+    clock.now += 30
+    with breaker.guard():
+        # Only one trial at a time
+        with pytest.raises(CircuitOpenError):
+            with breaker.guard():
+                pass
+    assert breaker.state == CLOSED
+
+
+def test_reported_failure_counts(breaker):
+    for _ in range(3):
+        with breaker.guard() as report:
+            report(False)
+    assert breaker.state == OPEN
+
+
+def test_bulkhead_limits_concurrency(breaker):
+    entered, release = threading.Barrier(3), threading.Event()
+
+    def call():
+        with breaker.guard():
+            entered.wait()
+            release.wait()
+
+    threads = [threading.Thread(target=call) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    entered.wait()
+    with pytest.raises(BulkheadFullError):
+        with breaker.guard():
+            pass
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    snapshot = breaker.snapshot()
+    assert snapshot["rejected_bulkhead"] == 1
+    assert snapshot["in_flight"] == 0
+    assert snapshot["state"] == CLOSED  # a full bulkhead is not a provider failure
+
+
+def test_verification_fails_fast_to_pending(outbound, monkeypatch):
+    monkeypatch.setenv("USER_VERIFICATION_MOCK_MODE", "false")
+    monkeypatch.setenv("USER_VERIFICATION_PROVIDER", "smile_identity")
+    monkeypatch.setenv("SMILE_IDENTITY_API_URL", DOWN)
+    monkeypatch.setattr("app.adapters.user_verification_adapter.get_outbound_http", lambda: outbound)
+    outbound.client("smile_identity", failure_threshold=1)
+    adapter = UserVerificationAdapter()
+
+    results = [adapter.verify_user("u1", "8001015009087", "Thandi Nkosi", "", "") for _ in range(3)]
+
+    assert all(r["status"] == "pending" and not r["verified"] for r in results)
+    stats = outbound.stats()
+    assert stats["smile_identity"]["requests"] == 3  # first call and its retries; the rest never left the process
+    assert stats["smile_identity"]["circuit"]["state"] == OPEN
+    assert stats["smile_identity"]["circuit"]["rejected_open"] == 2
+    assert stats["trulioo"]["circuit"]["state"] == CLOSED  # separate breaker per provider
+
+
+def test_hpcsa_fails_fast_to_manual_review(outbound, monkeypatch):
+    monkeypatch.setenv("HPCSA_MOCK_MODE", "false")
+    monkeypatch.setenv("HPCSA_API_KEY", "key")
+    monkeypatch.setenv("HPCSA_API_URL", DOWN)
+    monkeypatch.setattr("src.adapters.hpcsa_adapter_enhanced.get_outbound_http", lambda: outbound)
+    outbound.client("hpcsa", failure_threshold=1)
+    adapter = HPCSAAdapterEnhanced()
+
+    first = adapter.verify_doctor("MP123456", "Dr Test")
+    second = adapter.verify_doctor("MP123456", "Dr Test")
+
+    assert first["status"] == second["status"] == "manual_review"
+    assert "circuit open" in second["error"]
+    assert outbound.stats()["hpcsa"]["circuit"]["failures"] == 1
+
+
+def test_provider_metrics_endpoint(outbound, monkeypatch):
+    monkeypatch.setattr(main, "get_outbound_http", lambda: outbound)
+    outbound.client("yoco")
+
+    response = TestClient(main.app, base_url="http://localhost").get("/metrics/providers")
+
+    assert response.status_code == 200
+    circuit = response.json()["yoco"]["circuit"]
+    assert circuit["state"] == CLOSED
+    assert circuit["trips"] == 0
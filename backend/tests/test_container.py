@@ -0,0 +1,50 @@
+"""
+Tests for the Application Container
+"""
+import pytest
+from app import container as container_module
+from app.adapters.openai_adapter import get_openai_adapter
+from app.adapters.payment_adapter import get_payment_adapter
+from app.adapters.user_verification_adapter import get_user_verification_adapter
+from app.api.v1.hospitals import get_hospital_service
+from app.container import get_container, shutdown_container, start_container
+from app.services.ai_service import get_ai_service
+from app.services.notification_service import get_notification_service
+from app.utils.http_client import get_outbound_http
+
+
+@pytest.fixture(autouse=True)
+def fresh_container():
+    container_module._container = None
+    yield
+    container_module._container = None
+
+
+def test_factories_share_instances():
+    container = start_container()
+    assert get_ai_service() is get_ai_service() is container.ai_service
+    assert get_notification_service() is container.notification_service
+    assert get_payment_adapter() is container.payment_adapter
+    assert get_user_verification_adapter() is container.user_verification_adapter
+    assert container.ai_service.openai_adapter is get_openai_adapter()
+
+
+def test_hospital_service_uses_shared_payment_adapter():
+    service = get_hospital_service(db=None)
+    assert service.payment_adapter is get_payment_adapter()
+    assert get_hospital_service(db=None) is not service  # per request: it holds the session
+
+
+@pytest.mark.asyncio
+async def test_shutdown_closes_clients():
+    container = get_container()
+    outbound = get_outbound_http()
+    http = outbound.http  # open the pool
+    closed = []
+    http.close = lambda: closed.append(True)
+
+    await shutdown_container()
+
+    assert closed == [True]
+    assert get_outbound_http() is not outbound
+    assert get_container() is not container
@@ -0,0 +1,178 @@
+"""
+Tests for Doctor Search
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base, get_read_db, get_db
+from app.models.enhanced_models import Doctor, SubscriptionPlan, VerificationStatus
+from app.routes import doctors
+from app.services.search_index import ensure_doctor_search_index, has_doctor_search_index
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Create test database file (the routes read it through the async engine)"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(engine):
+    """Create test database session"""
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(engine, db_session, async_db_override):
+    """Test client for the doctors router"""
+    app = FastAPI()
+    app.include_router(doctors.router, prefix="/api/doctors")
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_read_db] = async_db_override(engine)
+    return TestClient(app)
+
+
+def make_doctor(db_session, name, specialization, city, plan=SubscriptionPlan.FREE, rating=0.0, reviews=0):
+    """Create a verified doctor"""
+    doctor = Doctor(
+        user_id=f"user-{name}",
+        display_name=name,
+        specialization=specialization,
+        practice_city=city,
+        practice_province="Gauteng",
+        practice_name=f"{name} Practice",
+        verification_status=VerificationStatus.VERIFIED,
+        subscription_plan=plan,
+        rating_avg=rating,
+        total_reviews=reviews
+    )
+    db_session.add(doctor)
+    db_session.commit()
+    return doctor
+
+
+@pytest.fixture
+def sample_doctors(db_session):
+    """Create a handful of doctors"""
+    return [
+        make_doctor(db_session, "Dr. Naidoo", "Cardiologist", "Durban", rating=4.9, reviews=40),
+        make_doctor(db_session, "Dr. Smith", "Dermatologist", "Johannesburg", rating=4.1, reviews=10),
+        make_doctor(db_session, "Dr. Cardoso", "General Practitioner", "Cape Town", rating=3.5, reviews=3),
+    ]
+
+
+def names(response):
+    return [d["name"] for d in response.json()["data"]["doctors"]]
+
+
+class TestFullTextSearch:
+    """Doctor search through the FTS5 index"""
+
+    def test_index_created(self, engine, db_session):
+        assert ensure_doctor_search_index(engine) is True
+        assert has_doctor_search_index(db_session) is True
+
+    def test_prefix_match(self, engine, client, sample_doctors, assert_max_queries):
+        ensure_doctor_search_index(engine)
+        with assert_max_queries(3):
+            response = client.get("/api/doctors/search", params={"q": "cardio"})
+        assert response.status_code == 200
+        assert names(response) == ["Dr. Naidoo"]
+
+    def test_all_words_must_match(self, engine, client, sample_doctors):
+        ensure_doctor_search_index(engine)
+        response = client.get("/api/doctors/search", params={"q": "dermatologist johannesburg"})
+        assert names(response) == ["Dr. Smith"]
+        assert response.json()["data"]["pagination"]["total"] == 1
+
+    def test_index_kept_in_sync_on_write(self, engine, client, db_session, sample_doctors):
+        ensure_doctor_search_index(engine)
+        make_doctor(db_session, "Dr. Botha", "Paediatrician", "Pretoria")
+        assert names(client.get("/api/doctors/search", params={"q": "paed"})) == ["Dr. Botha"]
+
+        doctor = sample_doctors[1]
+        doctor.practice_city = "Bloemfontein"
+        db_session.commit()
+        assert names(client.get("/api/doctors/search", params={"q": "bloemfontein"})) == ["Dr. Smith"]
+        assert names(client.get("/api/doctors/search", params={"q": "johannesburg"})) == []
+
+    def test_index_survives_table_rebuild(self, engine, client, db_session, sample_doctors):
+        ensure_doctor_search_index(engine)
+        db_session.delete(sample_doctors[0])
+        db_session.commit()
+        # Rebuilding doctors (as SQLite ALTERs and VACUUM may) renumbers its implicit rowids
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE doctors_copy AS SELECT * FROM doctors")
+            conn.exec_driver_sql("DROP TABLE doctors")
+            conn.exec_driver_sql("ALTER TABLE doctors_copy RENAME TO doctors")
+        assert names(client.get("/api/doctors/search", params={"q": "dermatologist"})) == ["Dr. Smith"]
+        assert names(client.get("/api/doctors/search", params={"q": "cardoso"})) == ["Dr. Cardoso"]
+
+    def test_query_syntax_is_escaped(self, engine, client, sample_doctors):
+        ensure_doctor_search_index(engine)
+        response = client.get("/api/doctors/search", params={"q": 'smith" * ('})
+        assert response.status_code == 200
+        assert names(response) == ["Dr. Smith"]
+
+    def test_promoted_first(self, engine, client, db_session, sample_doctors):
+        ensure_doctor_search_index(engine)
+        make_doctor(db_session, "Dr. Cardiff", "Cardiologist", "Pretoria", plan=SubscriptionPlan.PREMIUM)
+        response = client.get("/api/doctors/search", params={"q": "cardiologist"})
+        data = response.json()["data"]["doctors"]
+        assert [d["name"] for d in data] == ["Dr. Cardiff", "Dr. Naidoo"]
+        assert data[0]["promoted"] is True
+
+
+class TestLikeFallback:
+    """Doctor search without the full-text index"""
+
+    def test_substring_match_without_index(self, client, db_session, sample_doctors, assert_max_queries):
+        assert has_doctor_search_index(db_session) is False
+        # Substring (not prefix) match is only possible on the LIKE path
+        with assert_max_queries(4):
+            response = client.get("/api/doctors/search", params={"q": "ardio"})
+        assert names(response) == ["Dr. Naidoo"]
+
+
+class TestSearchRank:
+    """Search order from the materialised search_rank column"""
+
+    def test_rank_follows_plan_rating_and_reviews(self, client, db_session):
+        free = make_doctor(db_session, "Dr. Free", "Cardiologist", "Durban", rating=4.9, reviews=40)
+        basic = make_doctor(db_session, "Dr. Basic", "Cardiologist", "Durban", plan=SubscriptionPlan.BASIC, rating=3.0)
+        busy = make_doctor(db_session, "Dr. Busy", "Cardiologist", "Durban", rating=4.9, reviews=41)
+        assert names(client.get("/api/doctors/search")) == ["Dr. Basic", "Dr. Busy", "Dr. Free"]
+
+        # Rating, review count and plan changes re-rank on flush
+        free.total_reviews = 42
+        db_session.commit()
+        assert names(client.get("/api/doctors/search")) == ["Dr. Basic", "Dr. Free", "Dr. Busy"]
+        busy.subscription_plan = SubscriptionPlan.PREMIUM
+        basic.rating_avg = 1.0
+        db_session.commit()
+        assert names(client.get("/api/doctors/search")) == ["Dr. Busy", "Dr. Basic", "Dr. Free"]
+
+    def test_verified_search_reads_rank_index(self, db_session):
+        query = (
+            db_session.query(Doctor)
+            .filter(Doctor.verification_status == VerificationStatus.VERIFIED)
+            .filter(Doctor.specialization.ilike("%cardio%"))
+            .order_by(*doctors.DOCTOR_KEYSET.order_by())
+            .limit(21)
+        )
+        sql = query.statement.compile(db_session.get_bind(), compile_kwargs={"literal_binds": True})
+        plan = " ".join(row[-1] for row in db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+        assert "ix_doctors_verification_search_rank" in plan
+        # Rows come out in index order: no sort step, so LIMIT stops the scan early
+        assert "TEMP B-TREE" not in plan
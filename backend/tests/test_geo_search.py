@@ -0,0 +1,162 @@
+"""
+Tests for Near-Me (Geospatial) Search
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base, get_read_db, get_db
+from app.models.enhanced_models import Doctor, VerificationStatus
+from app.routes import doctors
+from app.services.geo_index import bounding_box, ensure_geo_indexes, has_geo_index, haversine_km
+
+DURBAN = (-29.8587, 31.0218)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Create test database file (the routes read it through the async engine)"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(engine):
+    """Create test database session"""
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(engine, db_session, async_db_override):
+    """Test client for the doctors router"""
+    app = FastAPI()
+    app.include_router(doctors.router, prefix="/api/doctors")
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_read_db] = async_db_override(engine)
+    return TestClient(app)
+
+
+def make_doctor(db_session, name, lat, lng):
+    """Create a verified doctor at a location"""
+    doctor = Doctor(
+        user_id=f"user-{name}",
+        display_name=name,
+        specialization="General Practitioner",
+        verification_status=VerificationStatus.VERIFIED,
+        latitude=lat,
+        longitude=lng
+    )
+    db_session.add(doctor)
+    db_session.commit()
+    return doctor
+
+
+@pytest.fixture
+def located_doctors(db_session):
+    """Doctors around KwaZulu-Natal plus one far away and one without coordinates"""
+    return [
+        make_doctor(db_session, "Dr. Umhlanga", -29.7256, 31.0849),          # ~16 km
+        make_doctor(db_session, "Dr. Berea", -29.8490, 31.0050),              # ~2 km
+        make_doctor(db_session, "Dr. Pietermaritzburg", -29.6006, 30.3794),   # ~68 km
+        make_doctor(db_session, "Dr. Johannesburg", -26.2041, 28.0473),       # ~500 km
+        make_doctor(db_session, "Dr. Nowhere", None, None),
+    ]
+
+
+def search(client, **params):
+    params.setdefault("lat", DURBAN[0])
+    params.setdefault("lng", DURBAN[1])
+    return client.get("/api/doctors/search", params=params).json()
+
+
+def test_haversine_km():
+    assert haversine_km(*DURBAN, *DURBAN) == 0
+    assert haversine_km(-29.8587, 31.0218, -26.2041, 28.0473) == pytest.approx(500, abs=10)
+    assert haversine_km(None, 31.0, -26.2, 28.0) is None
+
+
+def test_bounding_box_contains_circle():
+    min_lat, max_lat, min_lng, max_lng = bounding_box(*DURBAN, 50)
+    assert haversine_km(min_lat, DURBAN[1], *DURBAN) == pytest.approx(50, rel=0.01)
+    assert min_lng < DURBAN[1] - 0.45 and max_lng > DURBAN[1] + 0.45
+    # Near the antimeridian the longitude prefilter is dropped
+    assert bounding_box(0.0, 179.9, 50)[2:] == (None, None)
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+class TestNearMe:
+    """Near-me search with the R*Tree index and with the plain column prefilter"""
+
+    @pytest.fixture(autouse=True)
+    def index(self, engine, db_session, indexed):
+        if indexed:
+            assert ensure_geo_indexes(engine) is True
+        assert has_geo_index(db_session, "doctors") is indexed
+
+    def test_radius_filter(self, client, located_doctors, indexed, assert_max_queries):
+        with assert_max_queries(4):
+            result = search(client, radius_km=20)
+        names = {d["name"] for d in result["data"]["doctors"]}
+        assert names == {"Dr. Umhlanga", "Dr. Berea"}
+        assert result["data"]["pagination"]["total"] == 2
+
+    def test_sort_by_distance(self, client, located_doctors, indexed, assert_max_queries):
+        with assert_max_queries(4):
+            data = search(client, radius_km=100, sort="distance")["data"]["doctors"]
+        assert [d["name"] for d in data] == ["Dr. Berea", "Dr. Umhlanga", "Dr. Pietermaritzburg"]
+        assert data[0]["distanceKm"] < data[1]["distanceKm"] < data[2]["distanceKm"]
+        assert data[2]["distanceKm"] == pytest.approx(68, abs=3)
+
+    def test_distance_cursor_walk(self, client, located_doctors, indexed):
+        seen = []
+        cursor = ""
+        while cursor is not None:
+            data = search(client, radius_km=1000, sort="distance", limit=1, cursor=cursor)["data"]
+            seen += [d["name"] for d in data["doctors"]]
+            cursor = data["nextCursor"]
+        assert seen == ["Dr. Berea", "Dr. Umhlanga", "Dr. Pietermaritzburg", "Dr. Johannesburg"]
+
+    def test_index_follows_updates(self, client, db_session, located_doctors, indexed):
+        far = located_doctors[3]
+        far.latitude, far.longitude = -29.8600, 31.0200
+        db_session.commit()
+        names = [d["name"] for d in search(client, radius_km=1, sort="distance")["data"]["doctors"]]
+        assert names == ["Dr. Johannesburg"]
+
+
+def test_index_survives_table_rebuild(engine, client, db_session, located_doctors):
+    ensure_geo_indexes(engine)
+    db_session.delete(located_doctors[0])
+    db_session.commit()
+    # Rebuilding doctors (as SQLite ALTERs and VACUUM may) renumbers its implicit rowids
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE doctors_copy AS SELECT * FROM doctors")
+        conn.exec_driver_sql("DROP TABLE doctors")
+        conn.exec_driver_sql("ALTER TABLE doctors_copy RENAME TO doctors")
+    assert [d["name"] for d in search(client, radius_km=20)["data"]["doctors"]] == ["Dr. Berea"]
+
+
+class TestValidation:
+    """Parameter checks"""
+
+    def test_lat_without_lng(self, client):
+        result = client.get("/api/doctors/search", params={"lat": DURBAN[0]}).json()
+        assert result["success"] is False
+
+    def test_distance_sort_needs_location(self, client):
+        result = client.get("/api/doctors/search", params={"sort": "distance"}).json()
+        assert result["success"] is False
+
+    def test_no_location_has_no_distance(self, client, located_doctors):
+        data = client.get("/api/doctors/search").json()["data"]["doctors"]
+        assert len(data) == 5
+        assert all(d["distanceKm"] is None for d in data)
@@ -0,0 +1,166 @@
+"""
+Tests for the Outbound HTTP Layer (against a local stub server)
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from app.adapters.yoco_adapter import YocoAdapter
+from app.utils.http_client import LatencyHistogram, OutboundHTTP, RetryPolicy
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    # Headers and body go out as separate writes; without this, Nagle plus
+    # delayed ACKs stall every keep-alive response by ~40 ms
+    disable_nagle_algorithm = True
+
+    def _reply(self, status, body=None, headers=None):
+        payload = json.dumps(body or {}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _handle(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            hits = server.hits[self.path]
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        if self.path.startswith("/flaky"):
+            # 503 twice, then OK
+            if hits <= 2:
+                return self._reply(503, {"error": "unavailable"})
+            return self._reply(200, {"ok": True, "hits": hits})
+        if self.path == "/throttled":
+            if hits == 1:
+                return self._reply(429, {}, {"Retry-After": "0"})
+            return self._reply(200, {"ok": True})
+        if self.path == "/slow":
+            time.sleep(0.5)
+            return self._reply(200, {})
+        if self.path == "/charges":
+            return self._reply(200, {"id": "ch_1", "status": "pending", "redirectUrl": "https://pay/ch_1"})
+        # Client address identifies the TCP connection
+        return self._reply(200, {"peer": list(self.client_address)})
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.hits = {}
+    server.lock = threading.Lock()
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def outbound():
+    outbound = OutboundHTTP(http2=False)
+    yield outbound
+    outbound.close()
+
+
+def client(outbound, **kwargs):
+    kwargs.setdefault("timeout", 2)
+    return outbound.client("stub", sleep=lambda s: None, **kwargs)
+
+
+def test_connections_are_reused(stub, outbound):
+    http = client(outbound)
+    peers = {tuple(http.get(f"{stub.url}/echo").json()["peer"]) for _ in range(5)}
+    assert len(peers) == 1
+
+
+def test_idempotent_retry_on_503(stub, outbound):
+    http = client(outbound)
+    response = http.get(f"{stub.url}/flaky")
+    assert response.status_code == 200
+    assert stub.hits["/flaky"] == 3
+    stats = outbound.stats()["stub"]
+    assert stats["retries"] == 2
+    assert stats["statuses"] == {"5xx": 2, "2xx": 1}
+
+
+def test_post_not_retried_on_status(stub, outbound):
+    response = client(outbound).post(f"{stub.url}/flaky-post", json={})
+    assert response.status_code == 503
+    assert stub.hits["/flaky-post"] == 1
+
+
+def test_gives_up_after_attempts(stub, outbound):
+    response = client(outbound, retry=RetryPolicy(attempts=2)).get(f"{stub.url}/flaky-twice")
+    assert response.status_code == 503
+    assert stub.hits["/flaky-twice"] == 2
+
+
+def test_retry_after_honoured(stub, outbound):
+    delays = []
+    http = outbound.client("stub", timeout=2, sleep=delays.append)
+    assert http.get(f"{stub.url}/throttled").status_code == 200
+    assert delays == [0.0]
+
+
+def test_post_retried_when_connection_refused(outbound):
+    delays = []
+    http = outbound.client("down", timeout=1, sleep=delays.append)
+    with pytest.raises(httpx.ConnectError):
+        http.post("http://127.0.0.1:9/never", json={})  # discard port: nothing listens
+    assert len(delays) == 2
+    assert outbound.stats()["down"]["errors"] == 3
+
+
+def test_timeout_per_adapter(stub, outbound):
+    http = client(outbound, timeout=0.1, retry=RetryPolicy(attempts=1))
+    with pytest.raises(httpx.ReadTimeout):
+        http.get(f"{stub.url}/slow")
+    assert client(outbound, timeout=2).get(f"{stub.url}/slow").status_code == 200
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(backoff_base=0.2, backoff_max=1.0)
+    delays = [policy.backoff(5) for _ in range(200)]
+    assert all(0 <= d <= 1.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram(buckets_ms=(10, 100))
+    for seconds in (0.005, 0.005, 0.05, 0.5):
+        histogram.observe(seconds)
+    assert histogram.snapshot()["buckets"] == {"10": 2, "100": 3, "+Inf": 4}
+    assert histogram.percentile(50) == 10
+    assert histogram.percentile(99) == float("inf")
+
+
+def test_adapter_uses_shared_layer(stub, outbound, monkeypatch):
+    monkeypatch.setenv("PAYMENT_MOCK_MODE", "false")
+    monkeypatch.setattr("app.adapters.yoco_adapter.get_outbound_http", lambda: outbound)
+    adapter = YocoAdapter()
+    adapter.base_url = stub.url
+
+    result = adapter.create_subscription("doc-1", "premium", 499.0)
+
+    assert result["success"] is True
+    assert result["data"]["charge_id"] == "ch_1"
+    assert outbound.stats()["yoco"]["requests"] == 1
@@ -0,0 +1,62 @@
+"""
+Tests for Worker Import Cost (lazy SDK imports)
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from app.utils.lazy_imports import lazy_import
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Generous for slow CI machines; app.main imports in ~0.4 s locally
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "2.0"))
+
+HEAVY_SDKS = [
+    "twilio", "sendgrid", "firebase_admin", "reportlab", "openai",
+    "googleapiclient", "requests", "redis",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+import app.services.notification_service, app.services.ai_service, app.services.payment_service
+import app.adapters.twilio_video_adapter, app.adapters.user_verification_adapter
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_SDKS,)
+
+
+@pytest.fixture(scope="module")
+def cold_import(tmp_path_factory):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=tmp_path_factory.mktemp("cwd"),  # medrate.db lands here
+        env={**os.environ, "PYTHONPATH": BACKEND_DIR},
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_sdks_not_imported_at_startup(cold_import):
+    assert cold_import["loaded"] == []
+
+
+def test_import_within_budget(cold_import):
+    assert cold_import["seconds"] < IMPORT_BUDGET_SECONDS
+
+
+def test_lazy_module_loads_on_first_use():
+    module = lazy_import("colorsys")
+    assert module.available and not module.loaded
+    assert module.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1)
+    assert module.loaded
+
+
+def test_missing_package_fails_on_use_not_import():
+    module = lazy_import("medrate_no_such_sdk.client", "medrate-no-such-sdk")
+    assert not module.available
+    with pytest.raises(ImportError, match="pip install medrate-no-such-sdk"):
+        module.Client()
@@ -0,0 +1,155 @@
+"""
+Tests for Prometheus Metrics
+"""
+import os
+import subprocess
+import sys
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app import main
+from app.middleware.metrics import MetricsMiddleware
+from app.utils.http_client import NO_RETRY, OutboundHTTP
+from app.utils.metrics import instrument_engine, render_metrics, track_outbound
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.fixture
+def engine(tmp_path, request):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'metrics.db'}", poolclass=QueuePool, pool_size=2, max_overflow=1
+    )
+    instrument_engine(engine, request.node.name)
+    yield engine
+    engine.dispose()
+
+
+def test_requests_recorded_by_route_template(engine):
+    app = FastAPI()
+
+    @app.get("/doctors/{doctor_id}")
+    def get_doctor(doctor_id: int):
+        with engine.connect() as conn:
+            for _ in range(doctor_id):
+                conn.execute(text("SELECT 1"))
+        return {"id": doctor_id}
+
+    app.add_middleware(MetricsMiddleware)
+    route = "/doctors/{doctor_id}"
+    before = {
+        "ok": sample("http_requests_total", method="GET", route=route, status="200"),
+        "missing": sample("http_requests_total", method="GET", route="unmatched", status="404"),
+        "requests": sample("db_queries_per_request_count", route=route),
+        "queries": sample("db_queries_per_request_sum", route=route),
+    }
+
+    client = TestClient(app)
+    assert client.get("/doctors/3").status_code == 200
+    assert client.get("/doctors/2").status_code == 200
+    assert client.get("/no/such/page").status_code == 404
+
+    assert sample("http_requests_total", method="GET", route=route, status="200") == before["ok"] + 2
+    assert sample("http_requests_total", method="GET", route="unmatched", status="404") == before["missing"] + 1
+    assert sample("http_request_duration_seconds_count", method="GET", route=route) >= 2
+    assert sample("db_queries_per_request_count", route=route) == before["requests"] + 2
+    assert sample("db_queries_per_request_sum", route=route) == before["queries"] + 5
+    assert sample("db_query_seconds_per_request_sum", route=route) > 0
+    assert sample("http_requests_in_progress", method="GET") == 0
+
+
+def test_queries_outside_requests_not_counted(engine):
+    before = REGISTRY.get_sample_value("db_queries_per_request_sum", {"route": "unmatched"}) or 0
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert sample("db_queries_per_request_sum", route="unmatched") == before
+
+
+def test_pool_gauges_and_checkout_time(engine, request):
+    name = request.node.name
+    with engine.connect():
+        with engine.connect():
+            with engine.connect():
+                assert sample("db_pool_checked_out", engine=name) == 3
+                assert sample("db_pool_overflow", engine=name) == 1
+            # Kept idle: three connections stay open until the idle queue is full
+            assert sample("db_pool_checked_out", engine=name) == 2
+            assert sample("db_pool_overflow", engine=name) == 1
+    assert sample("db_pool_checked_out", engine=name) == 0
+    assert sample("db_pool_overflow", engine=name) == 0
+    assert sample("db_pool_size", engine=name) == 2
+    assert sample("db_pool_checkout_seconds_count", engine=name) == 3
+
+    # dispose() builds a new pool; checkouts are still timed
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert sample("db_pool_checkout_seconds_count", engine=name) == 4
+
+
+def test_outbound_calls_by_provider_and_status():
+    def handler(request):
+        return httpx.Response(503 if request.url.path == "/down" else 200)
+
+    client = OutboundHTTP(transport=httpx.MockTransport(handler)).client("metrics_test", retry=NO_RETRY)
+    client.get("https://provider.test/ok")
+    client.get("https://provider.test/down")
+    assert sample("outbound_request_duration_seconds_count", provider="metrics_test", status="2xx") == 1
+    assert sample("outbound_request_duration_seconds_count", provider="metrics_test", status="5xx") == 1
+
+    class RestError(Exception):
+        status = 401
+
+    with pytest.raises(RestError):
+        with track_outbound("metrics_sdk"):
+            raise RestError()
+    with pytest.raises(TimeoutError):
+        with track_outbound("metrics_sdk"):
+            raise TimeoutError()
+    with track_outbound("metrics_sdk"):
+        pass
+    for status in ("2xx", "4xx", "error"):
+        assert sample("outbound_request_duration_seconds_count", provider="metrics_sdk", status=status) == 1
+
+
+WORKER = """
+from app.utils.metrics import HTTP_REQUESTS_IN_PROGRESS, record_outbound
+record_outbound("hpcsa", 0.1, 200)
+HTTP_REQUESTS_IN_PROGRESS.labels("GET").inc()
+"""
+
+
+def test_multiprocess_workers_merged(tmp_path):
+    env = {**os.environ, "PYTHONPATH": BACKEND_DIR, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    workers = [subprocess.Popen([sys.executable, "-c", WORKER], env=env, cwd=tmp_path) for _ in range(2)]
+    for worker in workers:
+        assert worker.wait(timeout=60) == 0
+
+    body = render_metrics(str(tmp_path))[0].decode()
+    assert 'outbound_request_duration_seconds_count{provider="hpcsa",status="2xx"} 2.0' in body
+    assert 'http_requests_in_progress{method="GET"} 2.0' in body
+
+    # gunicorn's child_exit hook: a dead worker's live gauges stop counting
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(workers[0].pid, str(tmp_path))
+    assert 'http_requests_in_progress{method="GET"} 1.0' in render_metrics(str(tmp_path))[0].decode()
+
+
+def test_metrics_endpoint():
+    client = TestClient(main.app, base_url="http://localhost")
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in response.text
+    assert 'db_pool_size{engine="primary"}' in response.text
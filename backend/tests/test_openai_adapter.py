@@ -0,0 +1,121 @@
+"""
+Tests for the Async OpenAI Adapter
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from app.adapters.openai_adapter import AsyncOpenAIAdapter
+from app.services import ai_service as ai_module
+from app.services.ai_service import AUTO_REPLY_FALLBACK, AIService, classification_cache
+
+
+class FakeCompletions:
+    """Records concurrency of chat.completions.create calls"""
+
+    def __init__(self, delay=0.0, content='{"sentiment": "positive", "sentiment_score": 0.9, "categories": []}'):
+        self.delay = delay
+        self.content = content
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+
+    async def create(self, model, messages, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def make_adapter(completions, monkeypatch, **kwargs):
+    monkeypatch.setenv("OPENAI_MOCK_MODE", "false")
+    adapter = AsyncOpenAIAdapter(api_key="test-key", **kwargs)
+    adapter._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return adapter
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded(monkeypatch):
+    completions = FakeCompletions(delay=0.02)
+    adapter = make_adapter(completions, monkeypatch, max_concurrency=2)
+
+    results = await asyncio.gather(*[
+        adapter.chat_completion("gpt-3.5-turbo", [{"role": "user", "content": str(i)}])
+        for i in range(6)
+    ])
+
+    assert len(results) == 6
+    assert completions.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_timeout(monkeypatch):
+    completions = FakeCompletions(delay=1.0)
+    adapter = make_adapter(completions, monkeypatch, timeout=0.05)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await adapter.chat_completion("gpt-3.5-turbo", [])
+    assert completions.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_cancellation_propagates(monkeypatch):
+    completions = FakeCompletions(delay=1.0)
+    service = AIService(openai_adapter=make_adapter(completions, monkeypatch))
+    service.mock_mode = False
+
+    task = asyncio.create_task(service.suggest_auto_reply_async("When are you open?", "Dentist"))
+    await asyncio.sleep(0.01)
+    task.cancel()
+
+    # Not swallowed by the mock fallback
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert completions.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_falls_back_to_mock(monkeypatch):
+    completions = FakeCompletions(delay=1.0)
+    service = AIService(openai_adapter=make_adapter(completions, monkeypatch, timeout=0.05))
+    service.mock_mode = False
+
+    warnings = []
+    monkeypatch.setattr(ai_module.logger, "warning", lambda msg, *args, **kwargs: warnings.append((msg, kwargs)))
+
+    result = await service.suggest_specialty_from_symptoms_async("mild headache")
+    assert result["specialties"][0]["name"] == "General Practitioner"
+    assert await service.suggest_auto_reply_async("When are you open?", "Dentist") == AUTO_REPLY_FALLBACK
+    assert warnings == [
+        ("Symptom analysis failed; using the mock result", {"exc_info": True}),
+        ("Auto-reply suggestion failed; using the fallback", {"exc_info": True}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_async_classification(monkeypatch):
+    classification_cache.clear()
+    monkeypatch.setattr("app.services.ai_service.get_redis_client", lambda: None)
+    completions = FakeCompletions()
+    service = AIService(openai_adapter=make_adapter(completions, monkeypatch))
+    service.mock_mode = False
+
+    assert (await service.classify_review_async("Lovely staff"))["sentiment"] == "positive"
+    assert (await service.classify_review_async("Lovely staff"))["sentiment_score"] == 0.9
+    assert completions.max_in_flight == 1
+    classification_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_mock_mode(monkeypatch):
+    monkeypatch.setenv("OPENAI_MOCK_MODE", "true")
+    service = AIService()
+    assert await service.suggest_auto_reply_async("Hi", "GP") == "Thank you for your inquiry. We will get back to you soon."
+    assert (await service.suggest_specialty_from_symptoms_async("chest pain"))["immediate_action"] == "emergency"
@@ -0,0 +1,186 @@
+"""
+Tests for Keyset (Cursor) Pagination
+"""
+import pytest
+from datetime import datetime, timedelta
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import CompileError
+from sqlalchemy.orm import sessionmaker
+from app.database import Base, get_read_db, get_db
+from app.models.enhanced_models import Doctor, Review, SubscriptionPlan, VerificationStatus
+from app.routes import doctors
+from app.services.review_service_enhanced import EnhancedReviewService
+from app.utils import pagination
+from app.utils.pagination import InvalidCursorError, count_cache, count_results, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def db_session(tmp_path):
+    """Create test database session (file shared with the async engine)"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(db_session, async_db_override):
+    """Test client for the doctors router"""
+    app = FastAPI()
+    app.include_router(doctors.router, prefix="/api/doctors")
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_read_db] = async_db_override(db_session.get_bind())
+    return TestClient(app)
+
+
+@pytest.fixture
+def many_doctors(db_session):
+    """25 doctors with duplicate ratings so the id tie-breaker matters"""
+    plans = [SubscriptionPlan.FREE, SubscriptionPlan.BASIC, SubscriptionPlan.PREMIUM]
+    for i in range(25):
+        db_session.add(Doctor(
+            user_id=f"user-{i}",
+            display_name=f"Dr. {i:02d}",
+            specialization="General Practitioner",
+            practice_city="Durban",
+            practice_province="KwaZulu-Natal",
+            verification_status=VerificationStatus.VERIFIED,
+            subscription_plan=plans[i % 3],
+            rating_avg=float(i % 4),
+            total_reviews=i % 2
+        ))
+    db_session.commit()
+
+
+def test_cursor_round_trip():
+    values = ["PREMIUM", 4.5, 12, datetime(2024, 5, 1, 8, 30), "abc"]
+    assert decode_cursor(encode_cursor(values)) == values
+
+
+def test_invalid_cursor():
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor!")
+
+
+class TestDoctorCursorPagination:
+    """Walking /api/doctors/search with cursors"""
+
+    def test_cursor_pages_match_offset_pages(self, client, many_doctors, assert_max_queries):
+        offset_ids = []
+        for page in range(1, 4):
+            data = client.get("/api/doctors/search", params={"page": page, "limit": 10}).json()["data"]
+            offset_ids += [d["id"] for d in data["doctors"]]
+
+        cursor_ids = []
+        cursor = ""
+        while cursor is not None:
+            with assert_max_queries(2):
+                data = client.get("/api/doctors/search", params={"cursor": cursor, "limit": 10}).json()["data"]
+            cursor_ids += [d["id"] for d in data["doctors"]]
+            cursor = data["nextCursor"]
+
+        assert len(cursor_ids) == 25
+        assert cursor_ids == offset_ids
+
+    def test_last_page_has_no_cursor(self, client, many_doctors):
+        data = client.get("/api/doctors/search", params={"limit": 25}).json()["data"]
+        assert data["nextCursor"] is None
+        assert data["pagination"]["total"] == 25
+
+    def test_bad_cursor(self, client, many_doctors):
+        result = client.get("/api/doctors/search", params={"cursor": "%%%"}).json()
+        assert result["success"] is False
+
+
+class TestCountModes:
+    """count=exact|estimate|none on /api/doctors/search"""
+
+    def test_none_skips_total(self, client, many_doctors, assert_max_queries):
+        with assert_max_queries(1):  # no COUNT query
+            pagination = client.get("/api/doctors/search", params={"limit": 10, "count": "none"}).json()["data"]["pagination"]
+        assert pagination["total"] is None
+        assert pagination["totalPages"] is None
+        assert pagination["hasMore"] is True
+
+        pagination = client.get("/api/doctors/search", params={"page": 3, "limit": 10, "count": "none"}).json()["data"]["pagination"]
+        assert pagination["hasMore"] is False
+
+    def test_estimate_uses_cached_count(self, client, db_session, many_doctors):
+        count_cache.clear()
+        params = {"count": "estimate", "specialization": "General"}
+        assert client.get("/api/doctors/search", params=params).json()["data"]["pagination"]["total"] == 25
+
+        db_session.add(Doctor(
+            user_id="user-late",
+            display_name="Dr. Late",
+            specialization="General Practitioner",
+            verification_status=VerificationStatus.VERIFIED
+        ))
+        db_session.commit()
+
+        # Same filter signature: served from the cache until the TTL expires
+        assert client.get("/api/doctors/search", params=params).json()["data"]["pagination"]["total"] == 25
+        # Exact count sees the new row
+        assert client.get("/api/doctors/search", params={"specialization": "General"}).json()["data"]["pagination"]["total"] == 26
+
+    def test_failed_planner_estimate_rolls_back_to_savepoint(self, db_session, many_doctors, monkeypatch):
+        count_cache.clear()
+
+        def failing_estimate(query):
+            # Work done before the failure is undone with the savepoint
+            query.session.add(Doctor(user_id="user-ghost", display_name="Dr. Ghost", specialization="General Practitioner"))
+            query.session.flush()
+            raise CompileError("cannot render bind value")
+
+        monkeypatch.setattr(db_session.get_bind().dialect, "name", "postgresql")
+        monkeypatch.setattr(pagination, "_planner_estimate", failing_estimate)
+        warnings = []
+        monkeypatch.setattr(pagination.logger, "warning", lambda message, **kwargs: warnings.append(message))
+        query = db_session.query(Doctor).filter(Doctor.specialization.ilike("%General%"))
+        assert count_results(query, "estimate") == 25
+        assert warnings == ["planner row estimate failed; using a cached count"]
+
+    def test_invalid_mode(self, client, many_doctors):
+        assert client.get("/api/doctors/search", params={"count": "maybe"}).status_code == 422
+
+
+class TestReviewCursorPagination:
+    """Cursor pagination for doctor reviews"""
+
+    @pytest.fixture
+    def reviews(self, db_session):
+        now = datetime.utcnow()
+        for i in range(7):
+            db_session.add(Review(
+                patient_id=f"patient-{i}",
+                doctor_id="doctor-1",
+                appointment_id=f"appointment-{i}",
+                overall_rating=(i % 5) + 1,
+                verified_visit=True,
+                is_flagged=False,
+                # Two reviews share each timestamp
+                created_at=now - timedelta(days=i // 2)
+            ))
+        db_session.commit()
+
+    @pytest.mark.parametrize("sort", ["recent", "rating_high", "rating_low"])
+    def test_walk_all_reviews(self, db_session, reviews, sort):
+        service = EnhancedReviewService(db_session)
+        expected = [r["id"] for r in service.get_doctor_reviews("doctor-1", limit=50, sort=sort)["data"]["reviews"]]
+
+        seen = []
+        cursor = ""
+        while cursor is not None:
+            data = service.get_doctor_reviews("doctor-1", limit=3, sort=sort, cursor=cursor)["data"]
+            seen += [r["id"] for r in data["reviews"]]
+            cursor = data["next_cursor"]
+
+        assert seen == expected
+        assert len(seen) == 7
@@ -0,0 +1,135 @@
+"""
+Tests for Password Hashing on the Bounded Thread Pool
+"""
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database import Base
+from app.models.enhanced_models import User
+from app.services import auth_service as auth_module
+from app.services.auth_service import AuthService
+from app.utils import passwords
+from app.utils.passwords import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+    hash_password,
+    hash_rounds,
+    needs_rehash,
+    verify_password
+)
+
+
+@pytest.fixture
+def db_session():
+    """Create test database session"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def hasher(monkeypatch):
+    """Cheap work factor so the tests stay fast"""
+    hasher = PasswordHasher(workers=2, max_queue=4, rounds=5)
+    monkeypatch.setattr(auth_module, "get_password_hasher", lambda: hasher)
+    return hasher
+
+
+def test_hash_and_verify():
+    hashed = hash_password("correct horse", rounds=4)
+    assert verify_password("correct horse", hashed)
+    assert not verify_password("wrong", hashed)
+    assert not verify_password("anything", "not-a-hash")
+    assert hash_rounds(hashed) == 4
+    assert needs_rehash(hashed, rounds=5)
+    assert not needs_rehash(hashed, rounds=4)
+
+
+def test_long_passwords_truncated_at_72_bytes():
+    hashed = hash_password("a" * 80, rounds=4)
+    assert verify_password("a" * 72, hashed)
+
+
+@pytest.mark.asyncio
+async def test_async_hashing_and_stats(hasher):
+    hashed = await hasher.hash("secret")
+    assert await hasher.verify("secret", hashed)
+    assert not await hasher.verify("nope", hashed)
+
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["running"] == 0
+    assert stats["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_is_bounded(monkeypatch):
+    hasher = PasswordHasher(workers=1, max_queue=1, rounds=4)
+    release = threading.Event()
+    monkeypatch.setattr(passwords, "verify_password", lambda *args: release.wait(5))
+
+    first = asyncio.ensure_future(hasher.verify("a", "b"))
+    second = asyncio.ensure_future(hasher.verify("a", "b"))
+    await asyncio.sleep(0.05)
+
+    stats = hasher.stats()
+    assert stats["running"] == 1
+    assert stats["queued"] == 1
+    with pytest.raises(PasswordHasherBusyError):
+        await hasher.verify("a", "b")
+    assert hasher.stats()["rejected"] == 1
+
+    release.set()
+    assert await first and await second
+    assert hasher.stats()["completed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_old_work_factor(db_session, hasher):
+    user = User(
+        email="thandi@example.com",
+        phone="+27820000000",
+        full_name="Thandi Mokoena",
+        password_hash=hash_password("secret", rounds=4),
+        verified=True,
+        id_number="9001015009087"
+    )
+    db_session.add(user)
+    db_session.commit()
+
+    service = AuthService(db_session)
+    assert not (await service.login_user_async("thandi@example.com", "wrong"))["success"]
+    assert hash_rounds(user.password_hash) == 4
+
+    result = await service.login_user_async("thandi@example.com", "secret")
+    assert result["success"]
+    db_session.refresh(user)
+    assert hash_rounds(user.password_hash) == 5
+    assert verify_password("secret", user.password_hash)
+
+    # Sync path verifies against the upgraded hash
+    assert service.login_user("thandi@example.com", "secret")["success"]
+
+
+@pytest.mark.asyncio
+async def test_register_busy(db_session, hasher, monkeypatch):
+    async def busy(password):
+        raise PasswordHasherBusyError("full")
+
+    monkeypatch.setattr(hasher, "hash", busy)
+    result = await AuthService(db_session).register_user_async(
+        "new@example.com", "+27821111111", "New User", "secret"
+    )
+    assert result["busy"]
+    assert db_session.query(User).count() == 0
@@ -0,0 +1,175 @@
+"""
+Tests for the Authenticated Principal Cache
+"""
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database import Base, get_db
+from app.middleware import auth
+from app.middleware.auth import get_admin_user, get_current_user, principal_cache
+from app.models.enhanced_models import User, UserRole
+from app.services.auth_service import AuthService
+
+
+@pytest.fixture
+def engine():
+    """Create in-memory test database shared across connections"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(engine):
+    """Create test database session"""
+    principal_cache.clear()
+    auth._invalidated_at.clear()
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+    principal_cache.clear()
+
+
+@pytest.fixture
+def user_queries(engine):
+    """Statements that read the users table"""
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            statements.append(statement)
+
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def client(db_session):
+    app = FastAPI()
+
+    @app.get("/admin")
+    def admin_only(admin=Depends(get_admin_user)):
+        return {"id": admin.id}
+
+    @app.get("/profile")
+    def profile(current_user=Depends(get_current_user)):
+        return {"full_name": current_user.full_name, "role": current_user.role.value}
+
+    app.dependency_overrides[get_db] = lambda: db_session
+    return TestClient(app)
+
+
+def make_user(db_session, role=UserRole.ADMIN):
+    user = User(
+        email="admin@example.com",
+        phone="+27820000001",
+        full_name="Sipho Ndlovu",
+        role=role,
+        verified=True
+    )
+    db_session.add(user)
+    db_session.commit()
+    token = AuthService(db_session)._generate_tokens(user)["access_token"]
+    return user, {"Authorization": f"Bearer {token}"}
+
+
+def test_principal_is_cached(client, db_session, user_queries):
+    user, headers = make_user(db_session)
+    user_queries.clear()
+
+    for _ in range(3):
+        response = client.get("/admin", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["id"] == str(user.id)
+
+    # One narrow lookup for the first request, none after
+    assert len(user_queries) == 1
+    assert "full_name" not in user_queries[0]
+
+
+def test_full_user_loads_lazily(client, db_session, user_queries):
+    _, headers = make_user(db_session)
+    db_session.expire_all()
+    user_queries.clear()
+    client.get("/admin", headers=headers)
+
+    response = client.get("/profile", headers=headers)
+    assert response.json() == {"full_name": "Sipho Ndlovu", "role": "admin"}
+    assert len(user_queries) == 2
+
+
+def test_role_change_invalidates(client, db_session):
+    user, headers = make_user(db_session)
+    assert client.get("/admin", headers=headers).status_code == 200
+
+    user.role = UserRole.PATIENT
+    db_session.commit()
+
+    assert client.get("/admin", headers=headers).status_code == 403
+
+
+def test_invalid_token(client):
+    response = client.get("/admin", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
+    assert len(principal_cache) == 0
+
+
+def test_ttl_capped_at_token_expiry(db_session, monkeypatch):
+    user, headers = make_user(db_session)
+    token = headers["Authorization"].split()[1]
+    monkeypatch.setattr(auth, "PRINCIPAL_CACHE_TTL", 10**9)
+
+    principal = auth.get_principal(token, db_session)
+    assert principal.role == UserRole.ADMIN
+    expires_at = principal_cache._entries[auth._token_key(token)][0]
+    assert expires_at - auth.time.monotonic() <= 24 * 3600
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the shared Redis tier"""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1).encode()
+
+
+def test_role_change_in_another_process_invalidates(client, db_session, monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(auth, "get_redis_client", lambda: fake)
+    user, headers = make_user(db_session)
+    assert client.get("/admin", headers=headers).status_code == 200
+
+    # Another worker demotes the user: only the shared version moves here
+    db_session.query(User).filter(User.id == user.id).update({"role": UserRole.PATIENT})
+    db_session.commit()
+    fake.incr(auth.PRINCIPAL_VERSION_PREFIX + str(user.id))
+
+    assert client.get("/admin", headers=headers).status_code == 403
+
+
+def test_invalidation_outlives_other_invalidations(client, db_session):
+    user, headers = make_user(db_session)
+    assert client.get("/admin", headers=headers).status_code == 200
+    user.role = UserRole.PATIENT
+    db_session.commit()
+
+    # Far more invalidations than the principal cache holds entries
+    for i in range(20000):
+        auth.invalidate_user_principals(f"other-{i}")
+
+    assert client.get("/admin", headers=headers).status_code == 403
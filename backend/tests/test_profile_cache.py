@@ -0,0 +1,223 @@
+"""
+Tests for the Doctor and Hospital Profile Cache
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.database import Base, get_db, get_read_db
+from app.models.enhanced_models import Doctor, Review, VerificationStatus
+from app.routes import doctors
+from app.services import profile_cache as profile_cache_module
+from app.services.profile_cache import ProfileCache, invalidate_profile_after_commit, profile_cache
+from app.services.rating_aggregate_service import RatingAggregateService
+
+DOCTOR_ID = "6f1c2a7e-3b4d-4c5e-8f90-1a2b3c4d5e6f"
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the shared Redis tier"""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value.encode() if isinstance(value, str) else value
+
+    def exists(self, key):
+        return int(key in self.store)
+
+    def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1).encode()
+
+    def pipeline(self):
+        redis, calls = self, []
+
+        class Pipeline:
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: calls.append((name, args, kwargs))
+
+            def execute(self):
+                for name, args, kwargs in calls:
+                    getattr(redis, name)(*args, **kwargs)
+
+        return Pipeline()
+
+
+@pytest.fixture(autouse=True)
+def local_only(monkeypatch):
+    monkeypatch.setattr(profile_cache_module, "get_redis_client", lambda: None)
+    profile_cache.clear()
+    yield
+    profile_cache.clear()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def doctor(db_session):
+    doctor = Doctor(
+        id=DOCTOR_ID,
+        user_id="user-1",
+        display_name="Dr. Mokoena",
+        specialization="Cardiologist",
+        practice_city="Durban",
+        practice_province="KwaZulu-Natal",
+        verification_status=VerificationStatus.VERIFIED
+    )
+    db_session.add(doctor)
+    db_session.commit()
+    return doctor
+
+
+@pytest.fixture
+def doctor_selects(engine):
+    """SELECTs against the doctors table"""
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM doctors" in statement:
+            statements.append(statement)
+
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def client(engine, db_session, async_db_override):
+    app = FastAPI()
+    app.include_router(doctors.router, prefix="/api/doctors")
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_read_db] = async_db_override(engine)
+    return TestClient(app)
+
+
+def test_invalidate_moves_to_new_version():
+    cache = ProfileCache(ttl=60, max_entries=10)
+    version, entry = cache.lookup("doctor", DOCTOR_ID)
+    assert entry is None
+    stored = cache.store("doctor", DOCTOR_ID, version, {"success": True, "data": {"name": "old"}})
+    assert cache.lookup("doctor", DOCTOR_ID.upper()) == (version, stored)
+
+    cache.invalidate("doctor", DOCTOR_ID)
+    # A request that looked up before the write now fills with the old row
+    cache.store("doctor", DOCTOR_ID, version, {"success": True, "data": {"name": "old"}})
+    new_version, entry = cache.lookup("doctor", DOCTOR_ID)
+    assert new_version != version
+    assert entry is None
+
+
+def test_fills_after_a_write_are_short_lived():
+    cache = ProfileCache(ttl=60, max_entries=10, settle_seconds=5)
+    cache.invalidate("hospital", "h1")
+    version, _ = cache.lookup("hospital", "h1")
+    cache.store("hospital", "h1", version, {"success": True})
+    expires_at, _ = cache._local._entries[cache._key("hospital", "h1", version)]
+    cache.store("hospital", "h2", 0, {"success": True})
+    assert cache._local._entries[cache._key("hospital", "h2", 0)][0] - expires_at > 50
+
+
+def test_redis_tier_shared_between_processes(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(profile_cache_module, "get_redis_client", lambda: fake)
+    worker_a, worker_b = ProfileCache(ttl=60, max_entries=10), ProfileCache(ttl=60, max_entries=10)
+
+    version, _ = worker_a.lookup("doctor", DOCTOR_ID)
+    stored = worker_a.store("doctor", DOCTOR_ID, version, {"success": True, "data": {"rating": 4.5}})
+    assert worker_b.lookup("doctor", DOCTOR_ID)[1] == stored
+
+    # A write handled by worker A hides worker B's local copy too
+    worker_a.invalidate("doctor", DOCTOR_ID)
+    assert worker_b.lookup("doctor", DOCTOR_ID)[1] is None
+
+
+def test_invalidation_waits_for_commit(db_session, doctor):
+    version, _ = profile_cache.lookup("doctor", doctor.id)
+    profile_cache.store("doctor", doctor.id, version, {"success": True})
+
+    invalidate_profile_after_commit(db_session, "doctor", doctor.id)
+    doctor.bio = "discarded"
+    db_session.rollback()
+    assert profile_cache.lookup("doctor", doctor.id)[1] is not None
+
+    invalidate_profile_after_commit(db_session, "doctor", doctor.id)
+    assert profile_cache.lookup("doctor", doctor.id)[1] is not None
+    db_session.commit()
+    assert profile_cache.lookup("doctor", doctor.id)[1] is None
+
+
+def test_profile_served_from_cache_with_etag(client, doctor, doctor_selects, assert_max_queries):
+    with assert_max_queries(2):
+        first = client.get(f"/api/doctors/{doctor.id}")
+    assert first.status_code == 200
+    assert first.json()["data"]["name"] == "Dr. Mokoena"
+    etag = first.headers["etag"]
+
+    with assert_max_queries(0):
+        second = client.get(f"/api/doctors/{doctor.id}")
+    assert second.json() == first.json()
+    assert second.headers["etag"] == etag
+    assert len(doctor_selects) == 1
+
+    not_modified = client.get(f"/api/doctors/{doctor.id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert len(doctor_selects) == 1
+
+
+def test_missing_doctor_not_cached(client):
+    response = client.get(f"/api/doctors/{DOCTOR_ID}")
+    assert response.json()["success"] is False
+    assert "etag" not in response.headers
+    assert len(profile_cache._local) == 0
+
+
+def test_promote_invalidates(client, doctor, assert_max_queries):
+    etag = client.get(f"/api/doctors/{doctor.id}").headers["etag"]
+
+    with assert_max_queries(3):
+        client.post(f"/api/doctors/{doctor.id}/promote", params={"plan": "premium"})
+
+    response = client.get(f"/api/doctors/{doctor.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["data"]["promoted"] is True
+    assert response.headers["etag"] != etag
+
+
+def test_new_review_invalidates(client, db_session, doctor):
+    assert client.get(f"/api/doctors/{doctor.id}").json()["data"]["totalReviews"] in (0, None)
+
+    review = Review(
+        patient_id="patient-1",
+        doctor_id=doctor.id,
+        appointment_id="appointment-1",
+        overall_rating=4,
+        verified_visit=True,
+        is_flagged=False
+    )
+    db_session.add(review)
+    db_session.flush()
+    RatingAggregateService(db_session).add_review(review)
+    db_session.commit()
+
+    data = client.get(f"/api/doctors/{doctor.id}").json()["data"]
+    assert data["totalReviews"] == 1
+    assert data["rating"] == 4.0
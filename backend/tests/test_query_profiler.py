@@ -0,0 +1,115 @@
+"""
+Tests for the Query Profiler
+"""
+import io
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.middleware.metrics import MetricsMiddleware
+from app.models.enhanced_models import Doctor
+from app.utils import structured_logging
+from app.utils.metrics import instrument_engine
+from app.utils.query_profiler import QueryProfile, profile_queries
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all([
+            Doctor(user_id=f"user-{i}", display_name=f"Dr. {i}", specialization="Cardiologist")
+            for i in range(3)
+        ])
+        db.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def debug_requests():
+    structured_logging.set_debug_requests(True)
+    yield
+    structured_logging.set_debug_requests(False)
+
+
+def test_lazy_relationship_shows_as_duplicates(engine):
+    with profile_queries() as profile:
+        with Session(engine) as db:
+            for doctor in db.query(Doctor).all():
+                doctor.reviews  # one SELECT per doctor
+    assert profile.queries == 4
+    assert profile.duplicate_count == 2
+    [(statement, count)] = profile.duplicates.items()
+    assert "FROM reviews" in statement and count == 3
+    assert profile.report().splitlines()[1].startswith("  3x SELECT reviews.id")
+
+    # Listeners are removed when the block ends
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert profile.queries == 4
+
+
+def test_untracked_profile_counts_only():
+    profile = QueryProfile()
+    profile.record("SELECT 1", 0.002)
+    profile.record("SELECT 1", 0.001)
+    assert (profile.queries, profile.duplicates) == (2, {})
+    assert profile.server_timing() == 'db;dur=3.00;desc="2 queries, 0 duplicate"'
+
+
+def test_assert_max_queries_reports_statements(engine, assert_max_queries):
+    with pytest.raises(AssertionError, match=r"at most 1 SQL statements, got 2 statements \(1 duplicate\)"):
+        with assert_max_queries(1):
+            with engine.connect() as conn:
+                for doctor_id in range(2):
+                    conn.execute(text("SELECT * FROM doctors WHERE id = :id"), {"id": doctor_id})
+
+
+def test_server_timing_header_in_debug_mode(engine, debug_requests):
+    instrument_engine(engine, "profiler_test")
+    app = FastAPI()
+
+    @app.get("/doctors")
+    def list_doctors():
+        with Session(engine) as db:
+            return [len(doctor.reviews) for doctor in db.query(Doctor).all()]
+
+    app.add_middleware(MetricsMiddleware)
+    response = TestClient(app).get("/doctors")
+    assert response.json() == [0, 0, 0]
+    assert response.headers["server-timing"].endswith('desc="4 queries, 2 duplicate"')
+
+    structured_logging.set_debug_requests(False)
+    assert "server-timing" not in TestClient(app).get("/doctors").headers
+
+
+def test_duplicate_report_logged_at_default_level(engine):
+    instrument_engine(engine, "profiler_log_test")
+    app = FastAPI()
+
+    @app.get("/doctors")
+    def list_doctors():
+        with Session(engine) as db:
+            return [len(doctor.reviews) for doctor in db.query(Doctor).all()]
+
+    app.add_middleware(MetricsMiddleware)
+    structured_logging.stop_logging()
+    stream = io.StringIO()
+    structured_logging.configure_logging(stream=stream, level="INFO")
+    structured_logging.set_debug_requests(True)
+    try:
+        TestClient(app).get("/doctors")
+    finally:
+        structured_logging.set_debug_requests(False)
+        structured_logging.stop_logging()
+
+    [entry] = [json.loads(line) for line in stream.getvalue().splitlines() if "duplicate SQL" in line]
+    assert entry["route"] == "/doctors"
+    assert "3x SELECT reviews" in entry["queries"]
@@ -0,0 +1,164 @@
+"""
+Tests for the Rate Limiter
+"""
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from app import main
+from app.middleware import rate_limit as rate_limit_module
+from app.middleware.rate_limit import (
+    MemoryBackend, Rate, RateLimiter, RedisBackend, client_identity, rate_limit
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """Records script calls; `reply` is what the Lua script would return"""
+
+    def __init__(self, reply=None, error=None):
+        self.reply, self.error, self.calls = reply, error, []
+
+    def register_script(self, source):
+        assert "redis.call('TIME')" in source
+
+        def script(keys, args):
+            self.calls.append((keys, args))
+            if self.error:
+                raise self.error
+            return self.reply
+        return script
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def backend(clock):
+    return MemoryBackend(clock=clock)
+
+
+def test_parse_rates():
+    assert Rate.parse("5/minute") == Rate(5, 60)
+    assert Rate.parse("1000/hours") == Rate(1000, 3600)
+    assert str(Rate(10, 1)) == "10/second"
+    for bad in ("five/minute", "5/fortnight", "0/minute", "5"):
+        with pytest.raises(ValueError):
+            Rate.parse(bad)
+    with pytest.raises(ValueError):
+        rate_limit("5/fortnight")
+
+
+def test_burst_then_steady_rate(backend, clock):
+    rate = Rate(5, 60)  # one every 12 s, up to 5 at once
+    remaining = [backend.hit("k", rate).remaining for _ in range(5)]
+    assert remaining == [4, 3, 2, 1, 0]
+
+    denied = backend.hit("k", rate)
+    assert not denied.allowed
+    assert denied.retry_after == pytest.approx(12)
+    assert denied.reset_after == pytest.approx(60)
+
+    clock.now += 12
+    assert backend.hit("k", rate).allowed
+    assert not backend.hit("k", rate).allowed
+
+    clock.now += 60
+    assert backend.hit("k", rate).remaining == 4
+    assert backend.hit("other", rate).remaining == 4
+
+
+def test_idle_keys_pruned(clock):
+    backend = MemoryBackend(max_keys=3, clock=clock)
+    rate = Rate(10, 10)
+    for key in "abc":
+        backend.hit(key, rate)
+    clock.now += 2  # a, b and c have refilled
+    backend.hit("d", rate)
+    assert set(backend._tat) == {"d"}
+
+
+def test_redis_backend():
+    fake = FakeRedis(reply=[0, 0, 11_500_000, 59_000_000])
+    decision = RedisBackend(fake).hit("ratelimit:auth:login:1.2.3.4", Rate(5, 60))
+    assert fake.calls == [(["ratelimit:auth:login:1.2.3.4"], [12_000_000, 60_000_000])]
+    assert not decision.allowed
+    assert decision.retry_after == 11.5
+
+
+def test_redis_backend_fails_open():
+    decision = RedisBackend(FakeRedis(error=ConnectionError("down"))).hit("k", Rate(5, 60))
+    assert decision.allowed
+
+
+def test_client_identity_behind_proxy():
+    request = Request({
+        "type": "http",
+        "headers": [(b"x-forwarded-for", b"6.6.6.6, 41.0.0.7, 10.0.0.2")],
+        "client": ("10.0.0.1", 5000),
+    })
+    assert client_identity(request) == "10.0.0.1"
+    assert client_identity(request, proxy_hops=2) == "41.0.0.7"  # the spoofable first entry is ignored
+
+
+def test_route_limited_before_dependencies(monkeypatch, clock):
+    monkeypatch.setattr(rate_limit_module, "_limiter", RateLimiter(MemoryBackend(clock=clock)))
+    opened = []
+
+    def get_session():
+        opened.append(True)
+        return "session"
+
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    @rate_limit("2/minute")
+    async def read_item(item_id: int, q: str = "x", db: str = Depends(get_session)):
+        return {"item_id": item_id, "q": q, "db": db}
+
+    client = TestClient(app)
+    first = client.get("/items/1", params={"q": "y"})
+    assert first.json() == {"item_id": 1, "q": "y", "db": "session"}
+    assert first.headers["x-ratelimit-remaining"] == "1"
+    assert client.get("/items/2").status_code == 200
+
+    limited = client.get("/items/3")
+    assert limited.status_code == 429
+    assert limited.headers["retry-after"] == "30"
+    assert limited.json()["detail"]["error"]["code"] == "RATE_LIMIT_EXCEEDED"
+    assert len(opened) == 2
+
+
+def test_wired_into_app_auth_routes(assert_max_queries):
+    client = TestClient(main.app, base_url="http://localhost")
+    with assert_max_queries(0):  # rejected before any handler or session
+        statuses = [client.post("/api/auth/login", json={}).status_code for _ in range(6)]
+    assert statuses == [422] * 5 + [429]
+
+    response = client.post("/api/auth/login", json={})
+    assert response.json()["error"]["code"] == "RATE_LIMIT_EXCEEDED"
+    assert int(response.headers["retry-after"]) > 0
+    # Separate budget per route
+    assert client.post("/api/auth/register", json={}).status_code == 422
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.setattr(rate_limit_module, "_limiter", RateLimiter(enabled=False))
+    app = FastAPI()
+
+    @app.get("/")
+    @rate_limit("1/minute")
+    def index():
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert [client.get("/").status_code for _ in range(3)] == [200] * 3
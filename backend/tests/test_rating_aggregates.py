@@ -0,0 +1,236 @@
+"""
+Tests for Incremental Doctor Rating Aggregates
+"""
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Query, sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database import Base
+from app.models.enhanced_models import Doctor, DoctorRatingAggregate, Review
+from app.services import rating_aggregate_service as aggregate_module
+from app.services.rating_aggregate_service import RatingAggregateService, rebucket_once
+
+
+@pytest.fixture
+def db_session():
+    """Create test database session"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def doctor(db_session):
+    doctor = Doctor(user_id="user-1", display_name="Dr. Dlamini", specialization="General Practitioner")
+    db_session.add(doctor)
+    db_session.commit()
+    return doctor
+
+
+@pytest.fixture
+def service(db_session):
+    return RatingAggregateService(db_session)
+
+
+def add_review(db_session, service, doctor, overall, days_old=0, flagged=False, **categories):
+    """Insert a review the way the review service does (aggregate in the same transaction)"""
+    review = Review(
+        patient_id=f"patient-{datetime.utcnow().timestamp()}",
+        doctor_id=doctor.id,
+        appointment_id=f"appointment-{overall}-{days_old}-{len(categories)}-{datetime.utcnow().timestamp()}",
+        overall_rating=overall,
+        verified_visit=True,
+        is_flagged=flagged,
+        created_at=datetime.utcnow() - timedelta(days=days_old),
+        **categories
+    )
+    db_session.add(review)
+    db_session.flush()
+    service.add_review(review)
+    db_session.commit()
+    return review
+
+
+def legacy_weighted_average(reviews):
+    """The previous full-scan algorithm"""
+    total, weight_sum = 0.0, 0.0
+    for review in reviews:
+        days_old = (datetime.utcnow() - review.created_at).days
+        weight = 1.0 if days_old < 30 else 0.8 if days_old < 90 else 0.6
+        total += review.overall_rating * weight
+        weight_sum += weight
+    return round(total / weight_sum, 2) if weight_sum else 0.0
+
+
+def test_add_review_updates_doctor(db_session, service, doctor):
+    add_review(db_session, service, doctor, 5, communication_rating=4)
+    add_review(db_session, service, doctor, 2, wait_time_rating=3)
+
+    assert doctor.rating_avg == 3.5
+    assert doctor.total_reviews == 2
+    averages = service.get_average_ratings(doctor.id)
+    assert averages["overall"] == 3.5
+    assert averages["communication"] == 4.0
+    assert averages["wait_time"] == 3.0
+    assert averages["professionalism"] == 0.0
+
+
+def test_flagged_reviews_are_ignored(db_session, service, doctor):
+    add_review(db_session, service, doctor, 5)
+    add_review(db_session, service, doctor, 1, flagged=True)
+    assert doctor.total_reviews == 1
+    assert doctor.rating_avg == 5.0
+
+
+def test_remove_review(db_session, service, doctor):
+    add_review(db_session, service, doctor, 5)
+    review = add_review(db_session, service, doctor, 1)
+
+    service.remove_review(review)
+    review.is_flagged = True
+    db_session.commit()
+
+    assert doctor.total_reviews == 1
+    assert service.get_average_ratings(doctor.id)["overall"] == 5.0
+
+
+def test_seeded_from_existing_reviews(db_session, service, doctor):
+    # Reviews written before aggregates existed
+    for rating, days_old in [(5, 1), (3, 45), (1, 200)]:
+        db_session.add(Review(
+            patient_id=f"patient-{rating}",
+            doctor_id=doctor.id,
+            appointment_id=f"appointment-{rating}",
+            overall_rating=rating,
+            verified_visit=True,
+            is_flagged=False,
+            created_at=datetime.utcnow() - timedelta(days=days_old)
+        ))
+    db_session.commit()
+    assert service.get_average_ratings(doctor.id)["overall"] == 3.0
+    assert db_session.query(DoctorRatingAggregate).count() == 0
+
+    add_review(db_session, service, doctor, 4, days_old=60)
+
+    reviews = db_session.query(Review).all()
+    aggregate = db_session.query(DoctorRatingAggregate).one()
+    assert aggregate.review_count == 4
+    assert (aggregate.recent_count, aggregate.mid_count, aggregate.old_count) == (1, 2, 1)
+    assert doctor.rating_avg == legacy_weighted_average(reviews)
+
+
+def test_rebucket_moves_aged_reviews(db_session, service, doctor):
+    add_review(db_session, service, doctor, 5, days_old=20)
+    add_review(db_session, service, doctor, 1, days_old=80)
+    aggregate = db_session.query(DoctorRatingAggregate).one()
+    assert (aggregate.recent_count, aggregate.mid_count, aggregate.old_count) == (1, 1, 0)
+
+    # 15 days later: the 20-day-old review is now 35 days old, the other 95
+    later = aggregate.buckets_as_of + timedelta(days=15)
+    assert service.rebucket(now=later) == 1
+    assert (aggregate.recent_count, aggregate.mid_count, aggregate.old_count) == (0, 1, 1)
+    assert (aggregate.mid_sum, aggregate.old_sum) == (5, 1)
+    assert doctor.rating_avg == round((5 * 0.8 + 1 * 0.6) / 1.4, 2)
+
+    # A long gap crosses both boundaries at once
+    assert service.rebucket(now=later + timedelta(days=100)) == 1
+    assert (aggregate.recent_count, aggregate.mid_count, aggregate.old_count) == (0, 0, 2)
+    assert aggregate.old_sum == 6
+
+
+def test_rebucket_locks_only_changed_aggregates(db_session, service, doctor, assert_max_queries):
+    others = [Doctor(user_id=f"user-{i}", display_name=f"Dr. {i}", specialization="Cardiologist") for i in range(2, 12)]
+    db_session.add_all(others)
+    db_session.commit()
+    add_review(db_session, service, doctor, 5, days_old=20)
+    for other in others:
+        add_review(db_session, service, other, 4, days_old=1)
+    # An earlier run leaves every aggregate at the same as_of
+    as_of = datetime.utcnow()
+    assert service.rebucket(now=as_of) == 0
+    later = as_of + timedelta(days=15)
+
+    locked = []
+    with_for_update = Query.with_for_update
+
+    def recording_with_for_update(query, *args, **kwargs):
+        locked.append(query.statement.compile().params)
+        return with_for_update(query, *args, **kwargs)
+
+    # Statement count does not grow with the number of unchanged doctors
+    with assert_max_queries(10), pytest.MonkeyPatch.context() as mp:
+        mp.setattr(Query, "with_for_update", recording_with_for_update)
+        assert service.rebucket(now=later) == 1
+    assert [list(params.values()) for params in locked] == [[[doctor.id], as_of]]
+
+    aggregates = db_session.query(DoctorRatingAggregate).all()
+    assert {a.buckets_as_of for a in aggregates} == {later}
+    assert {(a.recent_count, a.mid_count) for a in aggregates if a.doctor_id != doctor.id} == {(1, 0)}
+    assert doctor.rating_avg == 5.0
+    assert db_session.get(DoctorRatingAggregate, doctor.id).mid_count == 1
+
+
+def test_rebucket_once_runs_on_one_worker(db_session, service, doctor, monkeypatch):
+    class FakeRedis:
+        def __init__(self):
+            self.store = {}
+
+        def set(self, key, value, nx=False, ex=None):
+            if nx and key in self.store:
+                return None
+            self.store[key] = value
+            return True
+
+    add_review(db_session, service, doctor, 5, days_old=40)
+    fake = FakeRedis()
+    monkeypatch.setattr(aggregate_module, "get_redis_client", lambda: fake)
+    session_factory = sessionmaker(bind=db_session.get_bind())
+
+    assert rebucket_once(session_factory, 60) == 0
+    # Another worker in the same interval skips the run
+    assert rebucket_once(session_factory, 60) is None
+
+
+def test_rebuild_matches_incremental(db_session, service, doctor):
+    for rating, days_old in [(5, 1), (4, 31), (2, 100), (3, 10)]:
+        add_review(db_session, service, doctor, rating, days_old=days_old, professionalism_rating=rating)
+    incremental = service.get_average_ratings(doctor.id)
+    rating_avg = doctor.rating_avg
+
+    service.rebuild(doctor.id)
+    assert service.get_average_ratings(doctor.id) == incremental
+    assert doctor.rating_avg == rating_avg == legacy_weighted_average(db_session.query(Review).all())
+
+
+def test_single_query_averages(db_session, service, doctor):
+    other = Doctor(user_id="user-2", display_name="Dr. Pillay", specialization="Dermatologist")
+    db_session.add(other)
+    db_session.commit()
+    add_review(db_session, service, doctor, 5, communication_rating=4, wait_time_rating=2)
+    add_review(db_session, service, doctor, 4, communication_rating=3)
+    add_review(db_session, service, doctor, 1, flagged=True, communication_rating=1)
+    add_review(db_session, service, other, 2, professionalism_rating=5)
+
+    averages = service.average_ratings_from_reviews(doctor.id, include_counts=True)
+    assert averages["overall"] == 4.5
+    assert averages["communication"] == 3.5
+    assert averages["wait_time"] == 2.0
+    assert averages["diagnosis_accuracy"] == 0.0
+    assert averages["counts"] == {
+        "overall": 2, "communication": 2, "wait_time": 1, "diagnosis_accuracy": 0, "professionalism": 0
+    }
+    # Same dict as the aggregate-row path
+    assert service.average_ratings_from_reviews(doctor.id) == service.get_average_ratings(doctor.id)
+
+    by_doctor = service.average_ratings_by_doctor([doctor.id, other.id, "missing"])
+    assert set(by_doctor) == {doctor.id, other.id}
+    assert by_doctor[other.id]["professionalism"] == 5.0
+    assert service.average_ratings_from_reviews("missing")["overall"] == 0.0
@@ -0,0 +1,112 @@
+"""
+Tests for Read Replica Routing
+"""
+import pytest
+from fastapi import Depends, FastAPI, Request, Response
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from app.utils import replicas
+from app.utils.replicas import READ_YOUR_WRITES_COOKIE, ReplicaPool, record_write, replica_session
+
+
+def sqlite_engine(path):
+    return create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+
+
+@pytest.fixture
+def pool(tmp_path):
+    return ReplicaPool([
+        sqlite_engine(tmp_path / "replica-a.db"),
+        sqlite_engine(tmp_path / "replica-b.db"),
+        sqlite_engine(tmp_path / "missing" / "replica-c.db"),  # cannot connect
+    ])
+
+
+@pytest.fixture
+def primary(tmp_path):
+    return async_sessionmaker(sqlite_engine(tmp_path / "primary.db"))
+
+
+@pytest.fixture
+def client(pool, primary):
+    replicas._recent_writers.clear()
+    app = FastAPI()
+
+    async def get_read_db(request: Request):
+        async for db in replica_session(pool, primary, request):
+            yield db
+
+    @app.get("/read")
+    async def read(db=Depends(get_read_db)):
+        return {"replica": db.info["replica"]}
+
+    @app.post("/write")
+    async def write(request: Request, response: Response):
+        record_write(request, response)
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+@pytest.mark.asyncio
+async def test_health_checks(pool):
+    assert await pool.check_all() == [True, True, False]
+    assert [r.healthy for r in pool.replicas] == [True, True, False]
+    assert pool.replicas[2].failures == 1
+
+
+@pytest.mark.asyncio
+async def test_round_robin_skips_unhealthy(pool):
+    await pool.check_all()
+    picked = [pool.pick().name for _ in range(4)]
+    assert picked[0] != picked[1]
+    assert picked[:2] == picked[2:]
+    assert all("replica-c" not in name for name in picked)
+
+    for replica in pool.replicas:
+        replica.healthy = False
+    assert pool.pick() is None
+
+
+def test_reads_use_replicas(client, pool):
+    names = {client.get("/read").json()["replica"] for _ in range(3)}
+    assert len(names) == 3  # unchecked replicas are assumed healthy
+
+
+def test_falls_back_to_primary(client, pool):
+    for replica in pool.replicas:
+        replica.healthy = False
+    assert client.get("/read").json()["replica"] is None
+
+
+def test_no_replicas_means_primary(primary):
+    app = FastAPI()
+
+    async def get_read_db(request: Request):
+        async for db in replica_session(ReplicaPool(), primary, request):
+            yield db
+
+    @app.get("/read")
+    async def read(db=Depends(get_read_db)):
+        return {"replica": db.info["replica"]}
+
+    assert TestClient(app).get("/read").json()["replica"] is None
+
+
+def test_read_your_writes_cookie(client):
+    response = client.post("/write")
+    assert READ_YOUR_WRITES_COOKIE in response.cookies
+    assert client.get("/read").json()["replica"] is None
+
+    client.cookies.clear()
+    assert client.get("/read").json()["replica"] is not None
+
+
+def test_read_your_writes_bearer(client):
+    headers = {"Authorization": "Bearer token-1"}
+    client.post("/write", headers=headers)
+    client.cookies.clear()
+
+    assert client.get("/read", headers=headers).json()["replica"] is None
+    assert client.get("/read", headers={"Authorization": "Bearer token-2"}).json()["replica"] is not None
@@ -0,0 +1,172 @@
+"""
+Tests for Review Validity Checks
+"""
+import pytest
+from datetime import datetime, timedelta
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base, get_db
+from app.middleware.auth import get_admin_user
+from app.models.enhanced_models import Appointment, AppointmentStatus, Doctor, Review, User, doctor_search_rank
+from app.routes import admin
+from app.services.review_validity_service import ReviewValidityService
+
+
+@pytest.fixture
+def db_session(tmp_path):
+    """Create test database session"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def visit(db_session):
+    """A verified patient with a completed, checked-in appointment"""
+    patient = User(email="patient@example.com", phone="+27820000001", full_name="Patient", verified=True)
+    doctor = Doctor(user_id="doctor-user", display_name="Dr. Test", specialization="Cardiologist")
+    db_session.add_all([patient, doctor])
+    db_session.flush()
+    appointment = Appointment(
+        patient_id=patient.id,
+        doctor_id=doctor.id,
+        start_time=datetime.utcnow() - timedelta(days=2),
+        status=AppointmentStatus.COMPLETED,
+        checked_in=True
+    )
+    db_session.add(appointment)
+    db_session.commit()
+    return patient, doctor, appointment
+
+
+def validate(db_session, patient_id, doctor, appointment):
+    service = ReviewValidityService(db_session)
+    return service.validate_review_creation(patient_id, doctor.id, appointment.id, rating=5)
+
+
+def ids(*rows):
+    """Primary keys read up front, so expired instances do not reload inside a query budget"""
+    return [row.id for row in rows]
+
+
+def test_eligible_visit_checked_in_one_statement(db_session, visit, assert_max_queries):
+    patient_id, doctor_id, appointment_id = ids(*visit)
+    service = ReviewValidityService(db_session)
+    with assert_max_queries(1):
+        result = service.validate_review_creation(patient_id, doctor_id, appointment_id, rating=5)
+    assert result["valid"] is True
+
+
+def test_user_and_appointment_checks(db_session, visit):
+    patient, doctor, appointment = visit
+    assert validate(db_session, "no-such-user", doctor, appointment)["error"] == "User not found"
+
+    other = Doctor(user_id="other-user", display_name="Dr. Other", specialization="Dermatologist")
+    db_session.add(other)
+    db_session.commit()
+    result = validate(db_session, patient.id, other, appointment)
+    assert result["error"] == "Appointment not found or does not belong to user"
+
+    patient.verified = False
+    db_session.commit()
+    assert validate(db_session, patient.id, doctor, appointment)["error"] == "Only verified patients can leave reviews"
+
+
+@pytest.mark.parametrize("change, error", [
+    ({"status": AppointmentStatus.CONFIRMED}, "Review can only be created for completed appointments"),
+    ({"checked_in": False}, "Appointment must be checked in or confirmed by doctor"),
+    ({"start_time": datetime.utcnow() - timedelta(days=120)}, "Review must be submitted within 90 days of appointment"),
+])
+def test_appointment_checks(db_session, visit, change, error):
+    patient, doctor, appointment = visit
+    for field, value in change.items():
+        setattr(appointment, field, value)
+    db_session.commit()
+    result = validate(db_session, patient.id, doctor, appointment)
+    assert result["error"] == error
+    if "status" in change:
+        assert result["details"] == {"appointment_status": "confirmed"}
+
+
+def test_duplicate_review_and_daily_limit(db_session, visit, assert_max_queries):
+    patient, doctor, appointment = visit
+    service = ReviewValidityService(db_session)
+    created = service.create_review(patient.id, doctor.id, appointment.id, rating=4, comment="Thorough and kind.")
+    assert created["success"] is True
+    assert validate(db_session, patient.id, doctor, appointment)["error"] == "Review already exists for this appointment"
+
+    # Ten reviews of other visits in the last day
+    for i in range(10):
+        other = Appointment(
+            patient_id=patient.id, doctor_id=doctor.id, start_time=datetime.utcnow() - timedelta(days=1),
+            status=AppointmentStatus.COMPLETED, checked_in=True
+        )
+        db_session.add(other)
+        db_session.flush()
+        db_session.add(Review(patient_id=patient.id, doctor_id=doctor.id, appointment_id=other.id, overall_rating=5))
+    latest = Appointment(
+        patient_id=patient.id, doctor_id=doctor.id, start_time=datetime.utcnow() - timedelta(hours=3),
+        status=AppointmentStatus.COMPLETED, checked_in=True
+    )
+    db_session.add(latest)
+    db_session.commit()
+    patient_id, doctor_id, latest_id = ids(patient, doctor, latest)
+    with assert_max_queries(1):
+        result = service.validate_review_creation(patient_id, doctor_id, latest_id, rating=5)
+    assert result["error"] == "Rate limit exceeded. Maximum 10 reviews per day."
+
+
+def test_review_updates_doctor_rating_and_search_rank(db_session, visit):
+    patient, doctor, appointment = visit
+    service = ReviewValidityService(db_session)
+    created = service.create_review(patient.id, doctor.id, appointment.id, rating=4, comment="Thorough and kind.")
+    assert created["success"] is True
+
+    db_session.refresh(doctor)
+    assert (doctor.rating_avg, doctor.total_reviews) == (4.0, 1)
+    assert doctor.search_rank == doctor_search_rank(doctor.subscription_plan, 4.0, 1)
+
+    # A flagged review stops counting; flagging twice does not un-count it again
+    review_id = created["data"]["review"]["id"]
+    assert service.flag_review(review_id, "Reported by doctor")["success"] is True
+    assert service.flag_review(review_id, "Reported again")["success"] is True
+    db_session.refresh(doctor)
+    assert (doctor.rating_avg, doctor.total_reviews) == (0.0, 0)
+    assert doctor.search_rank == doctor_search_rank(doctor.subscription_plan, 0.0, 0)
+
+
+def test_deleted_review_stops_counting(db_session, visit):
+    patient, doctor, appointment = visit
+    service = ReviewValidityService(db_session)
+    review_id = service.create_review(patient.id, doctor.id, appointment.id, rating=2)["data"]["review"]["id"]
+
+    assert service.delete_review(review_id)["success"] is True
+    assert service.delete_review(review_id)["error"] == "Review not found"
+    db_session.refresh(doctor)
+    assert (doctor.rating_avg, doctor.total_reviews) == (0.0, 0)
+    assert doctor.search_rank == doctor_search_rank(doctor.subscription_plan, 0.0, 0)
+
+
+def test_admin_moderation_updates_rating(db_session, visit):
+    patient, doctor, appointment = visit
+    service = ReviewValidityService(db_session)
+    review_id = service.create_review(patient.id, doctor.id, appointment.id, rating=5)["data"]["review"]["id"]
+    app = FastAPI()
+    app.include_router(admin.router, prefix="/api/admin")
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_admin_user] = lambda: None
+    client = TestClient(app)
+
+    response = client.post(f"/api/admin/reviews/{review_id}/flag", json={"reason": "Not a real visit"})
+    assert response.status_code == 200
+    db_session.refresh(doctor)
+    assert (doctor.rating_avg, doctor.total_reviews) == (0.0, 0)
+
+    assert client.delete(f"/api/admin/reviews/{review_id}").status_code == 200
+    assert client.delete(f"/api/admin/reviews/{review_id}").status_code == 404
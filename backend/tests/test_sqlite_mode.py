@@ -0,0 +1,204 @@
+"""
+Tests for SQLite Production Mode (WAL, pragmas, single-writer gate)
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, text, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from app.database import Base, async_database_url
+from app.models.enhanced_models import Doctor
+from app.utils.sqlite_mode import SingleWriterGate, apply_sqlite_pragmas, serialize_writes
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'edge.db'}",
+        connect_args={"check_same_thread": False},
+        pool_size=5,
+        max_overflow=10
+    )
+    apply_sqlite_pragmas(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def gate():
+    return SingleWriterGate(timeout=5)
+
+
+@pytest.fixture
+def Session(engine, gate):
+    factory = sessionmaker(bind=engine, autoflush=False)
+    serialize_writes(factory, gate)
+    return factory
+
+
+@pytest.fixture
+def AsyncSession(engine, gate):
+    async_engine = create_async_engine(
+        async_database_url(engine.url.render_as_string(hide_password=False)),
+        connect_args={"check_same_thread": False},
+        poolclass=NullPool
+    )
+    apply_sqlite_pragmas(async_engine.sync_engine)
+    factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    serialize_writes(factory, gate)
+    return factory
+
+
+def test_pragmas(engine):
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 20000
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+
+
+def test_gate_is_fifo():
+    gate = SingleWriterGate(timeout=5)
+    gate.acquire()
+    order = []
+
+    def writer(i):
+        gate.acquire()
+        order.append(i)
+        gate.release()
+
+    threads = []
+    for i in range(5):
+        thread = threading.Thread(target=writer, args=(i,))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.02)  # queue in a known order
+    assert gate.stats()["waiting"] == 5
+    gate.release()
+    for thread in threads:
+        thread.join()
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_gate_timeout_does_not_stall_queue():
+    gate = SingleWriterGate(timeout=0.05)
+    gate.acquire()
+    with pytest.raises(OperationalError):
+        gate.acquire()
+    gate.release()
+    gate.acquire()  # the abandoned ticket is skipped
+    gate.release()
+    assert gate.stats()["waiting"] == 0
+
+
+def test_concurrent_read_then_write(Session, gate):
+    with Session() as db:
+        db.add(Doctor(id="doc-1", user_id="user-1", display_name="Dr. Botha", specialization="GP", total_reviews=0))
+        db.commit()
+
+    errors = []
+
+    def worker():
+        for _ in range(20):
+            try:
+                with Session() as db:
+                    doctor = db.query(Doctor).filter(Doctor.id == "doc-1").one()
+                    doctor.total_reviews = (doctor.total_reviews or 0) + 1
+                    db.commit()
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with Session() as db:
+        # Reads happen outside the gate, so increments can still race at
+        # the application level; the point is that no write failed
+        assert db.query(Doctor).one().total_reviews > 0
+    assert gate.stats()["writes"] == 1 + 8 * 20
+
+
+def test_gate_released_on_rollback_and_close(Session, gate):
+    db = Session()
+    db.add(Doctor(id="doc-2", user_id="user-2", display_name="Dr. Pillay", specialization="GP"))
+    db.flush()
+    assert gate.stats()["writes"] == 1
+    db.rollback()
+
+    db.execute(update(Doctor).values(total_reviews=1))
+    db.close()
+
+    with Session() as other:
+        other.add(Doctor(id="doc-3", user_id="user-3", display_name="Dr. Mokoena", specialization="GP"))
+        other.commit()  # would time out if the gate leaked
+    assert gate.stats() == {"waiting": 0, "max_waiting": 0, "writes": 3}
+
+
+@pytest.mark.asyncio
+async def test_sync_and_async_writers_share_the_gate(Session, AsyncSession, gate):
+    sync_holds_gate = threading.Event()
+
+    def sync_writer():
+        with Session() as db:
+            db.add(Doctor(id="doc-sync", user_id="user-sync", display_name="Dr. Naidoo", specialization="GP"))
+            db.flush()
+            sync_holds_gate.set()
+            time.sleep(0.2)
+            db.commit()
+
+    async def async_writer(doctor_id, hold=0.0):
+        async with AsyncSession() as db:
+            db.add(Doctor(id=doctor_id, user_id=f"user-{doctor_id}", display_name="Dr. Khumalo", specialization="GP"))
+            await db.flush()
+            await asyncio.sleep(hold)
+            await db.commit()
+
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    beating = asyncio.create_task(heartbeat())
+    thread = threading.Thread(target=sync_writer)
+    thread.start()
+    await asyncio.get_running_loop().run_in_executor(None, sync_holds_gate.wait)
+
+    # Queued behind the sync writer, and two async writers on the same loop
+    await asyncio.wait_for(asyncio.gather(async_writer("doc-async-1", hold=0.1), async_writer("doc-async-2")), 5)
+    thread.join()
+    beating.cancel()
+
+    # The loop kept running while the async writers waited
+    assert ticks >= 10
+    assert gate.stats()["writes"] == 3
+    with Session() as db:
+        assert db.query(Doctor).count() == 3
+
+
+@pytest.mark.asyncio
+async def test_sync_session_on_the_loop_fails_fast(Session, AsyncSession, gate):
+    async with AsyncSession() as holder:
+        holder.add(Doctor(id="doc-held", user_id="user-held", display_name="Dr. Venter", specialization="GP"))
+        await holder.flush()
+
+        started = time.monotonic()
+        with Session() as db:
+            db.add(Doctor(id="doc-blocked", user_id="user-blocked", display_name="Dr. Smit", specialization="GP"))
+            with pytest.raises(OperationalError):
+                db.flush()
+        assert time.monotonic() - started < gate.timeout
+        await holder.commit()
+    assert gate.stats()["waiting"] == 0
@@ -0,0 +1,173 @@
+"""
+Tests for Startup: Migrations and Readiness Probe
+"""
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from app import main
+from app.database import Base
+from app.migrate import alembic_config, current_revision, migrate
+from app.models.enhanced_models import Doctor, DoctorRatingAggregate, Review, SubscriptionPlan, doctor_search_rank
+from app.services.search_index import apply_doctor_text_search
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'migrate.db'}"
+
+
+def test_upgrade_creates_schema_and_indexes(db_url):
+    assert migrate(db_url) == "0005"
+
+    engine = create_engine(db_url)
+    tables = set(inspect(engine).get_table_names())
+    assert {"users", "doctors", "reviews", "appointments"} <= tables
+    assert {"doctors_fts", "doctors_geo", "alembic_version"} <= tables
+    engine.dispose()
+
+    assert migrate(db_url) == "0005"  # no-op when already at head
+
+
+def test_migrations_match_models(db_url):
+    migrate(db_url)
+    engine = create_engine(db_url)
+    with engine.connect() as conn:
+        diff = compare_metadata(MigrationContext.configure(conn), Base.metadata)
+    engine.dispose()
+    # The FTS/R*Tree tables are managed by migration 0002, not the models
+    unmanaged = ("doctors_fts", "doctors_geo")
+    assert [d for d in diff if not (d[0] == "remove_table" and d[1].name.startswith(unmanaged))] == []
+
+
+def test_autogenerate_is_empty_after_migrate(db_url):
+    migrate(db_url)
+    engine = create_engine(db_url)
+    config = alembic_config()
+    with engine.connect() as conn:
+        config.attributes["connection"] = conn
+        # Raises AutogenerateDiffsDetected on any difference, index tables included
+        command.check(config)
+    engine.dispose()
+
+
+def test_legacy_create_all_database_is_stamped(db_url):
+    engine = create_engine(db_url)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add(Doctor(id="doc-1", user_id="user-1", display_name="Dr. Naidoo", specialization="Cardiology"))
+        db.commit()
+
+    assert migrate(db_url) == "0005"
+
+    with Session() as db:
+        # Rows that predate the index are searchable
+        query, _ = apply_doctor_text_search(db.query(Doctor), db, "cardiology")
+        assert [d.id for d in query.all()] == ["doc-1"]
+    engine.dispose()
+
+
+def test_legacy_database_gets_rating_aggregates(db_url):
+    # create_all before rating aggregates existed
+    engine = create_engine(db_url)
+    Base.metadata.create_all(engine, tables=[
+        table for table in Base.metadata.sorted_tables if table.name != "doctor_rating_aggregates"
+    ])
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add(Doctor(id="doc-1", user_id="user-1", display_name="Dr. Naidoo", specialization="Cardiology"))
+        db.add_all([
+            Review(patient_id=f"patient-{i}", doctor_id="doc-1", appointment_id=f"appointment-{i}",
+                   overall_rating=rating, verified_visit=True)
+            for i, rating in enumerate([5, 4])
+        ])
+        db.commit()
+
+    assert migrate(db_url) == "0005"
+
+    assert inspect(engine).has_table("doctor_rating_aggregates")
+    with Session() as db:
+        aggregate = db.query(DoctorRatingAggregate).one()
+        assert (aggregate.doctor_id, aggregate.review_count, aggregate.overall_sum) == ("doc-1", 2, 9)
+        assert db.get(Doctor, "doc-1").rating_avg == 4.5
+    engine.dispose()
+
+
+def test_search_rank_backfilled(db_url):
+    assert migrate(db_url, "0002") == "0002"
+    engine = create_engine(db_url)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO doctors (id, user_id, display_name, specialization, subscription_plan, rating_avg, total_reviews) "
+            "VALUES ('doc-1', 'user-1', 'Dr. Naidoo', 'Cardiology', 'PREMIUM', 4.25, 12)"
+        ))
+
+    assert migrate(db_url) == "0005"
+    with engine.connect() as conn:
+        rank = conn.execute(text("SELECT search_rank FROM doctors")).scalar()
+    assert rank == doctor_search_rank(SubscriptionPlan.PREMIUM, 4.25, 12)
+    engine.dispose()
+
+
+def test_search_index_kept_in_sync_after_search_rank_downgrade(db_url):
+    migrate(db_url)
+    engine = create_engine(db_url)
+    config = alembic_config()
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        # Dropping search_rank rebuilds doctors on SQLite
+        command.downgrade(config, "0002")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO doctors (id, user_id, display_name, specialization) "
+            "VALUES ('doc-1', 'user-1', 'Dr. Naidoo', 'Cardiology')"
+        ))
+    with sessionmaker(bind=engine)() as db:
+        query, _ = apply_doctor_text_search(db.query(Doctor.id), db, "naidoo")
+        assert [row.id for row in query.all()] == ["doc-1"]
+    engine.dispose()
+
+
+def test_downgrade_removes_indexes(db_url):
+    migrate(db_url)
+    engine = create_engine(db_url)
+    config = alembic_config()
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.downgrade(config, "0001")
+        assert current_revision(conn) == "0001"
+    tables = set(inspect(engine).get_table_names())
+    assert "doctors" in tables
+    assert not {"doctors_fts", "doctors_geo"} & tables
+    engine.dispose()
+
+
+def test_importing_app_does_no_ddl():
+    with open(main.__file__) as f:
+        assert "create_all" not in f.read()
+
+
+def test_ready(monkeypatch, tmp_path, assert_max_queries):
+    # NullPool: TestClient runs each request on a fresh event loop
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ready.db'}", poolclass=NullPool)
+    monkeypatch.setattr(main, "async_engine", engine)
+    with assert_max_queries(1):
+        response = TestClient(main.app, base_url="http://localhost").get("/ready")
+    assert response.status_code == 200
+    assert response.json()["checks"]["database"] == "ok"
+
+
+def test_not_ready_when_database_unreachable(monkeypatch):
+    async def unreachable():
+        raise ConnectionRefusedError("connection refused")
+
+    monkeypatch.setattr(main, "_ping_primary", unreachable)
+    response = TestClient(main.app, base_url="http://localhost").get("/ready")
+    assert response.status_code == 503
+    assert response.json()["checks"]["database"] == "ConnectionRefusedError"
@@ -0,0 +1,109 @@
+"""
+Tests for Structured (Queue-Backed JSON) Logging
+"""
+import io
+import json
+import logging
+
+import pytest
+from app.utils import structured_logging
+from app.utils.structured_logging import configure_logging, request_id_var, stop_logging
+
+
+@pytest.fixture
+def log_stream():
+    """Fresh listener writing to an in-memory stream"""
+    stop_logging()
+    stream = io.StringIO()
+    configure_logging(stream=stream, level="DEBUG")
+    yield stream
+    stop_logging()
+
+
+@pytest.fixture
+def info_log_stream():
+    """Listener at the default INFO level"""
+    stop_logging()
+    stream = io.StringIO()
+    configure_logging(stream=stream, level="INFO")
+    yield stream
+    structured_logging.set_debug_requests(False)
+    stop_logging()
+
+
+def read_lines(stream):
+    stop_logging()  # drains the queue
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_lines_with_request_id(log_stream):
+    logger = logging.getLogger("app.routes.test")
+    token = request_id_var.set("req-123")
+    try:
+        logger.info("request completed", extra={"status": 200, "duration_ms": 1.5})
+    finally:
+        request_id_var.reset(token)
+    logger.warning("no request %s", "context")
+
+    first, second = read_lines(log_stream)
+    assert first["message"] == "request completed"
+    assert first["logger"] == "app.routes.test"
+    assert first["request_id"] == "req-123"
+    assert first["status"] == 200
+    assert second["message"] == "no request context"
+    assert second["level"] == "WARNING"
+    assert "request_id" not in second
+
+
+def test_exceptions_are_rendered(log_stream):
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("src.services.test").exception("failed")
+
+    (entry,) = read_lines(log_stream)
+    assert entry["level"] == "ERROR"
+    assert "ValueError: boom" in entry["exc_info"]
+
+
+def test_configure_is_idempotent(log_stream):
+    listener = configure_logging()
+    assert configure_logging() is listener
+    assert len(logging.getLogger("app").handlers) == 1
+
+
+def test_success_sampling(monkeypatch):
+    monkeypatch.setattr(structured_logging, "SUCCESS_SAMPLE_RATE", 0.0)
+    assert not any(structured_logging.sample_success() for _ in range(100))
+    monkeypatch.setattr(structured_logging, "SUCCESS_SAMPLE_RATE", 1.0)
+    assert all(structured_logging.sample_success() for _ in range(100))
+
+
+def test_debug_flag_toggle():
+    structured_logging.set_debug_requests(True)
+    assert structured_logging.debug_requests_enabled()
+    structured_logging.set_debug_requests(False)
+    assert not structured_logging.debug_requests_enabled()
+
+
+def test_debug_requests_lower_the_level(info_log_stream):
+    logger = logging.getLogger("app.routes.test")
+    logger.debug("hidden")
+    structured_logging.set_debug_requests(True)
+    logger.debug("request dump")
+    structured_logging.set_debug_requests(False)
+    logger.debug("hidden again")
+
+    assert [entry["message"] for entry in read_lines(info_log_stream)] == ["request dump"]
+
+
+def test_debug_requests_keep_the_error_lines(info_log_stream):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    structured_logging.set_debug_requests(True)
+    assert TestClient(app, base_url="http://localhost").get("/no-such-route").status_code == 404
+
+    messages = [(entry["level"], entry["message"]) for entry in read_lines(info_log_stream) if entry["logger"] == "app.main"]
+    assert ("DEBUG", "request finished") in messages
+    assert ("WARNING", "request rejected") in messages